@@ -187,7 +187,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "upoutodo.authentication.E2EBearerTokenAuthentication",
-        "rest_framework_jwt.authentication.JSONWebTokenAuthentication",
+        "upoutodo.authentication.CachedJSONWebTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ),
@@ -251,6 +251,40 @@ JWT_AUTH = {
     "JWT_AUTH_HEADER_PREFIX": "Bearer",
 }
 
+JWKS_URL = os.getenv(
+    "JWKS_URL", "https://dev-tbs5lvhtbsscsnn5.us.auth0.com/.well-known/jwks.json"
+)
+# Seconds to keep the identity provider's public keys before refetching them.
+JWKS_CACHE_TTL = int(os.getenv("JWKS_CACHE_TTL", "3600"))
+# Verified tokens to remember until they expire; 0 disables the cache.
+JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "1024"))
+# Users resolved from the token subject, and how many seconds to trust them.
+# Only this process's writes invalidate the cache, so a user deactivated
+# through another worker stays signed in for at most the TTL.
+JWT_USER_CACHE_SIZE = int(os.getenv("JWT_USER_CACHE_SIZE", "1024"))
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", "5"))
+# Serialized /api/users/me/ payloads, and how many seconds to trust them. The
+# cache is per process and only this process's writes invalidate it, so keep
+# the TTL short enough that other workers' changes show up promptly.
+USER_ME_CACHE_SIZE = int(os.getenv("USER_ME_CACHE_SIZE", "1024"))
+USER_ME_CACHE_TTL = int(os.getenv("USER_ME_CACHE_TTL", "5"))
+# Distinct recurrence rules to keep parsed for calculate_next_due_date().
+RRULE_CACHE_SIZE = int(os.getenv("RRULE_CACHE_SIZE", "256"))
+# Expanded recurring-task windows for /api/tasks/occurrences/, and how many
+# seconds to keep them; edited tasks are never served from the cache.
+OCCURRENCE_CACHE_SIZE = int(os.getenv("OCCURRENCE_CACHE_SIZE", "4096"))
+OCCURRENCE_CACHE_TTL = int(os.getenv("OCCURRENCE_CACHE_TTL", "3600"))
+# Days ahead, and most due dates per task, kept in the Occurrence table.
+OCCURRENCE_HORIZON_DAYS = int(os.getenv("OCCURRENCE_HORIZON_DAYS", "35"))
+OCCURRENCE_HORIZON_COUNT = int(os.getenv("OCCURRENCE_HORIZON_COUNT", "100"))
+
+# Days to keep deleted-task records for /api/tasks/changes/; older cursors
+# have to refetch everything.
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+# Seconds /api/tasks/changes/ stays behind the clock, so a write whose
+# transaction commits after it took its timestamp is still picked up.
+TASK_CHANGES_SETTLE_SECONDS = int(os.getenv("TASK_CHANGES_SETTLE_SECONDS", "5"))
+
 TAGGIT_CASE_INSENSITIVE = True
 
 BREVO_API_KEY = os.getenv("BREVO_API_KEY")
@@ -1,9 +1,81 @@
+import copy
 import os
+import time
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+
+from upoutodo.caching import ExpiringLRUCache
+
+# Users resolved from a token's ``sub`` claim. Entries are dropped whenever the
+# user or their profile is saved (see upoutodo.signals), but only in this
+# process: a user deactivated or edited through another worker is served from
+# here for up to JWT_USER_CACHE_TTL, a few seconds.
+resolved_user_cache = ExpiringLRUCache(maxsize=settings.JWT_USER_CACHE_SIZE)
+
+
+def invalidate_resolved_user(user_id):
+    resolved_user_cache.discard_if(lambda user: user.pk == user_id)
+
+
+def copy_user(user):
+    """Return a copy of a cached user that a request may change freely.
+
+    Model copies get their own field cache, so copying the user and its
+    profile is enough to keep the cached pair untouched.
+    """
+    copied = copy.copy(user)
+    profile = getattr(user, "profile", None)
+    if profile is not None:
+        copied.profile = copy.copy(profile)
+    return copied
+
+
+def get_user_queryset():
+    return get_user_model().objects.select_related("profile")
+
+
+class CachedJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """JWT authentication that resolves the ``sub`` claim to a user once.
+
+    The first request for a subject provisions unknown users through the
+    username handler and loads the user with its profile. Later requests get a
+    copy of the cached user, and repeated authentication of the same request
+    reuses the first result.
+    """
+
+    def authenticate(self, request):
+        http_request = getattr(request, "_request", request)
+        if not hasattr(http_request, "_jwt_authentication"):
+            http_request._jwt_authentication = super().authenticate(request)
+        return http_request._jwt_authentication
+
+    def authenticate_credentials(self, payload):
+        subject = payload.get("sub")
+        user = resolved_user_cache.get(subject) if subject else None
+        if user is None:
+            user = self.load_user(payload)
+            resolved_user_cache.set(
+                subject, user, time.time() + settings.JWT_USER_CACHE_TTL
+            )
+        return copy_user(user)
+
+    def load_user(self, payload):
+        username = self.jwt_get_username_from_payload(payload)
+        if not username:
+            raise AuthenticationFailed("Invalid payload.")
+
+        User = get_user_model()
+        user = get_user_queryset().filter(**{User.USERNAME_FIELD: username}).first()
+        if user is None:
+            raise AuthenticationFailed("Invalid token.")
+        if not user.is_active:
+            raise AuthenticationFailed("User account is disabled.")
+
+        return user
 
 
 class E2EBearerTokenAuthentication(BaseAuthentication):
@@ -57,8 +129,7 @@ def e2e_auth_enabled():
 
 
 def find_e2e_user(identifier):
-    User = get_user_model()
     return (
-        User.objects.filter(email=identifier).first()
-        or User.objects.filter(username=identifier).first()
+        get_user_queryset().filter(email=identifier).first()
+        or get_user_queryset().filter(username=identifier).first()
     )
@@ -1,6 +1,7 @@
-from datetime import datetime, time
+from datetime import timedelta
 
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django_filters.rest_framework import (
     BooleanFilter,
     CharFilter,
@@ -9,10 +10,13 @@ from django_filters.rest_framework import (
 )
 
 from upoutodo.models import Task
+from upoutodo.services.search import search_tasks
+from upoutodo.utils import day_start
 
 
 class TaskFilter(FilterSet):
     tag = CharFilter(method="filter_tag")
+    search = CharFilter(method="filter_search")
     today = BooleanFilter(method="filter_today")
     inbox = BooleanFilter(method="filter_inbox")
     upcoming = BooleanFilter(method="filter_upcoming")
@@ -21,7 +25,15 @@ class TaskFilter(FilterSet):
 
     class Meta:
         model = Task
-        fields = ["today", "inbox", "upcoming", "start_date", "end_date", "tag"]
+        fields = [
+            "today",
+            "inbox",
+            "upcoming",
+            "start_date",
+            "end_date",
+            "tag",
+            "search",
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -32,26 +44,27 @@ class TaskFilter(FilterSet):
         self.upcoming = None
         self.tag = None
 
+    @cached_property
+    def tomorrow_start(self):
+        # Computed once per request and compared against due_date directly,
+        # so the due_date indexes stay usable.
+        return day_start(timezone.localdate() + timedelta(days=1))
+
     def filter_start_date(self, queryset, name, value):
         """Filter tasks with due_date >= start of the given date."""
         if value:
-            # Convert date to start of day in UTC
-            start_datetime = timezone.make_aware(datetime.combine(value, time.min))
-            return queryset.filter(due_date__gte=start_datetime)
+            return queryset.filter(due_date__gte=day_start(value))
         return queryset
 
     def filter_end_date(self, queryset, name, value):
-        """Filter tasks with due_date <= end of the given date."""
+        """Filter tasks with due_date before the start of the next day."""
         if value:
-            # Convert date to end of day in UTC (23:59:59.999999)
-            end_datetime = timezone.make_aware(datetime.combine(value, time.max))
-            return queryset.filter(due_date__lte=end_datetime)
+            return queryset.filter(due_date__lt=day_start(value + timedelta(days=1)))
         return queryset
 
     def filter_today(self, queryset, _, value):
         if value:
-            today = timezone.localdate()
-            return queryset.filter(due_date__date__lte=today)
+            return queryset.filter(due_date__lt=self.tomorrow_start)
         return queryset
 
     def filter_inbox(self, queryset, _, value):
@@ -61,8 +74,7 @@ class TaskFilter(FilterSet):
 
     def filter_upcoming(self, queryset, _, value):
         if value:
-            today = timezone.localdate()
-            return queryset.filter(due_date__date__gt=today)
+            return queryset.filter(due_date__gte=self.tomorrow_start)
         return queryset
 
     def filter_tag(self, queryset, _, value):
@@ -70,6 +82,12 @@ class TaskFilter(FilterSet):
             return queryset.filter(tags__slug=value)
         return queryset
 
+    def filter_search(self, queryset, _, value):
+        """Full-text match on title and description; annotates ``search_rank``."""
+        if value:
+            return search_tasks(queryset, self.request.user, value)
+        return queryset
+
 
 class CommentFilter(FilterSet):
     task = CharFilter(method="filter_task")
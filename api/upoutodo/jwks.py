@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+import time
+
+import jwt
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSUnavailableError(Exception):
+    """Raised when no signing keys are cached and the JWKS endpoint is down."""
+
+
+class JWKSKeyStore:
+    """In-process cache of the identity provider's public keys, keyed by ``kid``.
+
+    Keys are refetched when the TTL runs out or when a token names a ``kid``
+    we have not seen. Only one thread fetches at a time; the others wait for
+    that fetch and reuse its result. If the endpoint cannot be reached the
+    previously fetched keys keep being served.
+    """
+
+    def __init__(self, url, ttl, timeout=10, min_refresh_interval=30):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._fetched_at = None
+        self._attempted_at = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_key(self, kid):
+        """Return the public key for ``kid``, or ``None`` if it is unknown."""
+        key = self._keys.get(kid)
+        if key is not None and not self._is_expired():
+            return key
+        if self._keys and not self._may_refresh():
+            return key
+
+        self._refresh()
+        return self._keys.get(kid)
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._attempted_at = None
+
+    def _is_expired(self):
+        return self._fetched_at is None or (
+            time.monotonic() - self._fetched_at >= self.ttl
+        )
+
+    def _may_refresh(self):
+        # Neither unknown kids nor an outage may trigger a fetch per request.
+        return self._attempted_at is None or (
+            time.monotonic() - self._attempted_at >= self.min_refresh_interval
+        )
+
+    def _refresh(self):
+        generation = self._generation
+        with self._lock:
+            # Another thread refreshed while we were waiting for the lock.
+            if self._generation != generation:
+                return
+
+            self._attempted_at = time.monotonic()
+            try:
+                keys = self._fetch()
+            except (requests.RequestException, ValueError) as e:
+                if not self._keys:
+                    logger.error(f"Failed to fetch JWKS from {self.url}: {e}")
+                    raise JWKSUnavailableError(f"Cannot fetch public keys: {e}")
+                logger.warning(
+                    f"Failed to refresh JWKS from {self.url}, "
+                    f"serving {len(self._keys)} cached keys: {e}"
+                )
+            else:
+                self._keys = keys
+                self._fetched_at = time.monotonic()
+            finally:
+                self._generation += 1
+
+    def _fetch(self):
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            kid = jwk.get("kid")
+            try:
+                keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
+            except Exception as e:
+                logger.error(f"Failed to create public key from JWK {kid}: {e}")
+        return keys
+
+
+_key_store = None
+_key_store_lock = threading.Lock()
+
+
+def get_key_store():
+    """Return the process-wide key store, built from settings on first use."""
+    global _key_store
+    if _key_store is None:
+        with _key_store_lock:
+            if _key_store is None:
+                _key_store = JWKSKeyStore(
+                    url=settings.JWKS_URL, ttl=settings.JWKS_CACHE_TTL
+                )
+    return _key_store
+
+
+def reset_key_store():
+    global _key_store
+    with _key_store_lock:
+        _key_store = None
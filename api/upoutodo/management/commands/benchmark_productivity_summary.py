@@ -0,0 +1,143 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Avg, DurationField, ExpressionWrapper, F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from upoutodo.management.commands.benchmark_task_queries import (
+    INSERT_BATCH_SIZE,
+    Rollback,
+    backdated_created_at,
+)
+from upoutodo.models import Project, Task
+from upoutodo.utils import day_range
+from upoutodo.views.productivity import UserProductivityView
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = "benchmark-productivity-user"
+
+
+def separate_count_summary(qs):
+    """The summary as it was computed before: one query per figure."""
+    now = timezone.now()
+    today_start, tomorrow_start = day_range(timezone.localdate())
+    seven_days_ago = now - timedelta(days=7)
+    pending = qs.filter(completion_date__isnull=True)
+    return {
+        "total": qs.count(),
+        "completed": qs.filter(completion_date__isnull=False).count(),
+        "pending": pending.count(),
+        "overdue": pending.filter(due_date__lt=now).count(),
+        "due_today": pending.filter(
+            due_date__gte=today_start, due_date__lt=tomorrow_start
+        ).count(),
+        "completed_this_week": qs.filter(completion_date__gte=seven_days_ago).count(),
+        "created_this_week": qs.filter(created_at__gte=seven_days_ago).count(),
+        "avg_completion_time": qs.filter(completion_date__isnull=False)
+        .annotate(
+            duration=ExpressionWrapper(
+                F("completion_date") - F("created_at"), output_field=DurationField()
+            )
+        )
+        .aggregate(avg=Avg("duration"))["avg"],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed one user's tasks inside a rolled-back transaction and compare the "
+        "query count and latency of the productivity summary with separate "
+        "COUNT queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=100_000,
+            help="Number of tasks to seed. Default: 100000",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per variant; the median is reported. Default: 5",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed. Default: 0"
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                user = self.seed(options["tasks"])
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+                self.report(user, options["repeat"])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        now = timezone.now()
+        user = User.objects.create(username=BENCHMARK_USERNAME)
+        section = Project.get_user_inbox(user).default_section
+        remaining = count
+        while remaining > 0:
+            batch = []
+            for _ in range(min(remaining, INSERT_BATCH_SIZE)):
+                created_at = now - timedelta(minutes=random.randrange(365 * 24 * 60))
+                batch.append(
+                    Task(
+                        section=section,
+                        owner=user,
+                        title="Benchmark task",
+                        created_at=created_at,
+                        due_date=(
+                            now + timedelta(days=random.randrange(-60, 60))
+                            if random.random() < 0.6
+                            else None
+                        ),
+                        completion_date=(
+                            created_at + timedelta(hours=random.randrange(1, 240))
+                            if random.random() < 0.7
+                            else None
+                        ),
+                    )
+                )
+            with backdated_created_at():
+                Task.objects.bulk_create(batch)
+            remaining -= len(batch)
+        self.stdout.write(f"Seeded {count} tasks")
+        return user
+
+    def report(self, user, repeat):
+        request = APIRequestFactory().get("/api/productivity")
+        request.user = user
+        view = UserProductivityView()
+        variants = {
+            "separate COUNT queries": lambda: separate_count_summary(
+                view.get_user_tasks(request)
+            ),
+            "single aggregate": lambda: view.summary(request),
+        }
+        for label, run in variants.items():
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    run()
+                    timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f"queries {len(queries)}")
+            self.stdout.write(f"median {statistics.median(timings):.2f} ms")
@@ -0,0 +1,66 @@
+import random
+import time
+from datetime import timedelta
+
+from dateutil.rrule import rrulestr
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from upoutodo.utils import _rrule_template, calculate_next_due_date
+
+# The handful of rules the recurrence picker produces.
+BENCHMARK_RULES = (
+    "FREQ=DAILY",
+    "FREQ=WEEKLY",
+    "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE",
+    "FREQ=MONTHLY",
+    "FREQ=MONTHLY;BYMONTHDAY=-1",
+    "FREQ=YEARLY",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time calculate_next_due_date() over common recurrence rules, with and "
+        "without the parsed-rule cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100_000,
+            help="Next-date computations per run. Default: 100000",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed. Default: 0"
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        now = timezone.now().replace(microsecond=0)
+        cases = [
+            (
+                random.choice(BENCHMARK_RULES),
+                now + timedelta(minutes=random.randrange(-525_600, 525_600)),
+            )
+            for _ in range(options["iterations"])
+        ]
+
+        start = time.perf_counter()
+        for rule, dtstart in cases:
+            rrulestr(rule, dtstart=dtstart).after(dtstart, inc=False)
+        uncached = time.perf_counter() - start
+
+        _rrule_template.cache_clear()
+        start = time.perf_counter()
+        for rule, dtstart in cases:
+            calculate_next_due_date(rule, dtstart)
+        cached = time.perf_counter() - start
+
+        info = _rrule_template.cache_info()
+        self.stdout.write(f"Computed {len(cases)} next due dates")
+        self.stdout.write(f"rrulestr per call: {uncached:.2f} s")
+        self.stdout.write(f"cached templates: {cached:.2f} s")
+        self.stdout.write(f"Cache hits {info.hits}, misses {info.misses}")
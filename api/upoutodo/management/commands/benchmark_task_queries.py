@@ -0,0 +1,202 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from upoutodo.models import Project, ProjectSection, Task
+from upoutodo.services.search import search_tasks
+from upoutodo.utils import day_range
+
+User = get_user_model()
+
+BENCHMARK_USERNAME_PREFIX = "benchmark-user-"
+INSERT_BATCH_SIZE = 5000
+PAGE_SIZE = 100
+TITLE_WORDS = (
+    "review submit draft report thesis module exam call email meeting budget "
+    "grade reading lecture proposal forum quiz plan update research"
+).split()
+
+
+@contextmanager
+def backdated_created_at():
+    """Let ``bulk_create`` keep the given ``Task.created_at`` values."""
+    field = Task._meta.get_field("created_at")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded benchmark data."""
+
+
+def benchmark_queries(user, section, now):
+    """Querysets matching the hot task read paths, keyed by label."""
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+    week_ago = now - timedelta(days=7)
+    day = timezone.localdate(now) - timedelta(days=3)
+    day_start, day_end = day_range(day)
+    user_tasks = Task.objects.filter(owner=user)
+    return {
+        "section list (default ordering)": Task.objects.filter(section=section),
+        "section open tasks by due date": Task.objects.filter(
+            section=section, completion_date__isnull=True
+        ).order_by("due_date"),
+        "user tasks due today": user_tasks.filter(
+            completion_date__isnull=True, due_date__lt=tomorrow
+        ),
+        "user tasks completed this week": user_tasks.filter(
+            completion_date__gte=week_ago
+        ),
+        "tasks created this week": Task.objects.filter(created_at__gte=week_ago),
+        "tasks completed this week": Task.objects.filter(completion_date__gte=week_ago),
+        # Date casts hide the column from its index; the half-open ranges
+        # from day_range() do not.
+        "tasks created on a day (__date)": Task.objects.filter(created_at__date=day),
+        "tasks created on a day (range)": Task.objects.filter(
+            created_at__gte=day_start, created_at__lt=day_end
+        ),
+        "user tasks due on a day (__date)": user_tasks.filter(
+            completion_date__isnull=True, due_date__date=day
+        ),
+        "user tasks due on a day (range)": user_tasks.filter(
+            completion_date__isnull=True,
+            due_date__gte=day_start,
+            due_date__lt=day_end,
+        ),
+        "user task search": search_tasks(user_tasks, user, "thes prop").order_by(
+            "-search_rank"
+        ),
+        "user task search (icontains)": user_tasks.filter(
+            title__icontains="thes"
+        ).filter(title__icontains="prop"),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic tasks inside a rolled-back transaction and print EXPLAIN "
+        "plans and timings for the hot task queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=1_000_000,
+            help="Number of tasks to seed. Default: 1000000",
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=100,
+            help="Number of users the tasks are spread across. Default: 100",
+        )
+        parser.add_argument(
+            "--sections",
+            type=int,
+            default=10,
+            help="Sections per user. Default: 10",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per query; the median is reported. Default: 5",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed. Default: 0"
+        )
+        parser.add_argument(
+            "--drop-indexes",
+            action="store_true",
+            help="Drop the Task indexes first to get a baseline.",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                sections = self.seed(options)
+                with connection.cursor() as cursor:
+                    if options["drop_indexes"]:
+                        for index in Task._meta.indexes:
+                            cursor.execute(
+                                f"DROP INDEX {connection.ops.quote_name(index.name)}"
+                            )
+                    cursor.execute("ANALYZE")
+                self.report(sections, options["repeat"])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def seed(self, options):
+        now = timezone.now()
+        sections = []
+        for i in range(options["users"]):
+            user = User.objects.create(username=f"{BENCHMARK_USERNAME_PREFIX}{i}")
+            project = Project.objects.create(
+                title="Benchmark", created_by=user, updated_by=user
+            )
+            sections += ProjectSection.objects.bulk_create(
+                ProjectSection(project=project, title=f"Section {j}", order=j)
+                for j in range(options["sections"])
+            )
+
+        remaining = options["tasks"]
+        while remaining > 0:
+            batch = []
+            for _ in range(min(remaining, INSERT_BATCH_SIZE)):
+                created_at = now - timedelta(minutes=random.randrange(365 * 24 * 60))
+                completed = random.random() < 0.7
+                due = random.random() < 0.6
+                batch.append(
+                    Task(
+                        section=(section := random.choice(sections)),
+                        owner_id=section.project.created_by_id,
+                        title=" ".join(random.sample(TITLE_WORDS, 3)),
+                        order=random.randrange(1, 1_000_000),
+                        created_at=created_at,
+                        due_date=(
+                            now + timedelta(days=random.randrange(-60, 60))
+                            if due
+                            else None
+                        ),
+                        completion_date=(
+                            created_at + timedelta(hours=random.randrange(1, 240))
+                            if completed
+                            else None
+                        ),
+                    )
+                )
+            with backdated_created_at():
+                Task.objects.bulk_create(batch)
+            remaining -= len(batch)
+            self.stdout.write(f"Seeded {options['tasks'] - remaining} tasks")
+
+        return sections
+
+    def report(self, sections, repeat):
+        section = sections[0]
+        user = section.project.created_by
+        for label, queryset in benchmark_queries(user, section, timezone.now()).items():
+            page = queryset[:PAGE_SIZE]
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(page.all())
+                timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f"median {statistics.median(timings):.2f} ms")
+            self.stdout.write(page.explain())
+            self.stdout.write("")
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from upoutodo.services.occurrences import extend_occurrence_horizon
+from upoutodo.services.tasks import QUERY_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the materialized upcoming occurrences of every open recurring "
+        f"task forward to the next {settings.OCCURRENCE_HORIZON_DAYS} days. "
+        "Run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=QUERY_CHUNK_SIZE,
+            help=f"Tasks rewritten per transaction. Default: {QUERY_CHUNK_SIZE}",
+        )
+
+    def handle(self, *args, **options):
+        synced, stale = extend_occurrence_horizon(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {synced} recurring tasks; deleted {stale} past occurrences."
+            )
+        )
@@ -0,0 +1,85 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from upoutodo.models import ProjectSection
+from upoutodo.services.imports import IMPORT_FORMATS, detect_format, import_tasks
+from upoutodo.services.tasks import QUERY_CHUNK_SIZE
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import a user's tasks from a CSV, NDJSON or ICS file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--username", required=True, help="User who will own the tasks."
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(IMPORT_FORMATS),
+            help="File format. Default: guessed from the file extension.",
+        )
+        parser.add_argument(
+            "--section",
+            type=int,
+            help="Section for rows that do not name one. Default: the Inbox.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=QUERY_CHUNK_SIZE,
+            help=f"Rows validated and inserted together. Default: {QUERY_CHUNK_SIZE}",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist as exc:
+            raise CommandError(f"No user named {options['username']!r}.") from exc
+
+        import_format = options["format"] or detect_format(options["path"])
+        if import_format is None:
+            raise CommandError("Cannot tell the file format; pass --format.")
+
+        section = None
+        if options["section"] is not None:
+            try:
+                section = ProjectSection.objects.get(
+                    pk=options["section"], project__created_by=user
+                )
+            except ProjectSection.DoesNotExist as exc:
+                raise CommandError(
+                    f"User {user.username!r} has no section {options['section']}."
+                ) from exc
+
+        try:
+            file = open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc)) from exc
+
+        with file:
+            for progress in import_tasks(
+                user,
+                file,
+                import_format,
+                section=section,
+                batch_size=options["batch_size"],
+            ):
+                for error in progress.errors:
+                    self.stderr.write(
+                        f"Row {error['row']}: {json.dumps(error['errors'])}"
+                    )
+                self.stdout.write(
+                    f"Processed {progress.processed} rows: "
+                    f"{progress.created} imported, {progress.failed} failed."
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {progress.created} of {progress.processed} tasks."
+            )
+        )
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from upoutodo.models import TaskTombstone
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Delete deleted-task records older than TASK_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_TOMBSTONE_RETENTION_DAYS,
+            help="Keep records newer than this many days. "
+            f"Default: {settings.TASK_TOMBSTONE_RETENTION_DAYS}",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        stale = TaskTombstone.objects.filter(deleted_at__lt=cutoff).order_by()
+        deleted = 0
+        while ids := list(stale.values_list("id", flat=True)[:BATCH_SIZE]):
+            deleted += TaskTombstone.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} task tombstones."))
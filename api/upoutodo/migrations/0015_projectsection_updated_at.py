@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0014_tasktombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectsection",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0015_projectsection_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["section", "order"], name="task_section_order_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["section", "completion_date", "due_date"],
+                name="task_sect_completion_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completion_date__isnull", True)),
+                fields=["section", "due_date"],
+                name="task_open_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["created_at"], name="task_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completion_date__isnull", False)),
+                fields=["completion_date"],
+                name="task_completion_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_task_owner(apps, schema_editor):
+    """Copy each task's project owner onto it, one primary key range at a time."""
+    Task = apps.get_model("upoutodo", "Task")
+    ProjectSection = apps.get_model("upoutodo", "ProjectSection")
+
+    owner = ProjectSection.objects.filter(pk=OuterRef("section_id")).values(
+        "project__created_by"
+    )[:1]
+    bounds = Task.objects.aggregate(low=models.Min("pk"), high=models.Max("pk"))
+    if bounds["low"] is None:
+        return
+    for start in range(bounds["low"], bounds["high"] + 1, BACKFILL_BATCH_SIZE):
+        Task.objects.filter(
+            pk__gte=start, pk__lt=start + BACKFILL_BATCH_SIZE, owner__isnull=True
+        ).update(owner=Subquery(owner))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0016_task_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(backfill_task_owner, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Separate from 0017 so PostgreSQL does not alter the table while the
+# backfill's deferred foreign key checks are still pending.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0017_task_owner"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "updated_at"], name="task_owner_updated_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0018_alter_task_owner"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "completion_date", "due_date"],
+                name="task_owner_completion_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Full-text index over task titles and descriptions, read by
+# upoutodo.services.search.
+#
+# SQLite: an external-content FTS5 table kept in sync by triggers, which also
+# cover bulk_create, queryset updates and cascaded deletes. owner_id is
+# indexed so a lookup can be limited to one user's rows. SQLite drops triggers
+# when a migration rebuilds upoutodo_task, so such a migration has to run
+# create_sqlite_triggers again.
+#
+# PostgreSQL: a generated tsvector column with a GIN index.
+
+from django.db import migrations
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER upoutodo_task_fts_insert AFTER INSERT ON upoutodo_task BEGIN
+        INSERT INTO upoutodo_task_fts (rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER upoutodo_task_fts_delete AFTER DELETE ON upoutodo_task BEGIN
+        INSERT INTO upoutodo_task_fts
+            (upoutodo_task_fts, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+    END
+    """,
+    """
+    CREATE TRIGGER upoutodo_task_fts_update
+    AFTER UPDATE OF title, description, owner_id ON upoutodo_task BEGIN
+        INSERT INTO upoutodo_task_fts
+            (upoutodo_task_fts, rowid, title, description, owner_id)
+        VALUES ('delete', old.id, old.title, old.description, old.owner_id);
+        INSERT INTO upoutodo_task_fts (rowid, title, description, owner_id)
+        VALUES (new.id, new.title, new.description, new.owner_id);
+    END
+    """,
+]
+
+
+def create_sqlite_triggers(cursor):
+    for trigger in SQLITE_TRIGGERS:
+        cursor.execute(trigger)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == "sqlite":
+            cursor.execute(
+                "CREATE VIRTUAL TABLE upoutodo_task_fts USING fts5("
+                "title, description, owner_id, "
+                "content='upoutodo_task', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            cursor.execute(
+                "INSERT INTO upoutodo_task_fts (upoutodo_task_fts) VALUES ('rebuild')"
+            )
+            create_sqlite_triggers(cursor)
+        elif vendor == "postgresql":
+            cursor.execute(
+                "ALTER TABLE upoutodo_task ADD COLUMN search_vector tsvector "
+                "GENERATED ALWAYS AS ("
+                "setweight(to_tsvector('simple', title), 'A') || "
+                "setweight(to_tsvector('simple', description), 'B')"
+                ") STORED"
+            )
+            cursor.execute(
+                "CREATE INDEX task_search_vector_idx ON upoutodo_task "
+                "USING GIN (search_vector)"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == "sqlite":
+            for name in ("insert", "delete", "update"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS upoutodo_task_fts_{name}")
+            cursor.execute("DROP TABLE IF EXISTS upoutodo_task_fts")
+        elif vendor == "postgresql":
+            cursor.execute("ALTER TABLE upoutodo_task DROP COLUMN search_vector")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0019_task_owner_completion_due_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
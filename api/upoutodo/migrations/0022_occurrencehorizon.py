@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:05
+
+import logging
+from datetime import datetime, time, timedelta
+from itertools import islice, takewhile
+
+from dateutil.rrule import rrulestr
+from django.db import migrations, models
+from django.utils import timezone
+
+BACKFILL_BATCH_SIZE = 1000
+# The OCCURRENCE_HORIZON_DAYS and OCCURRENCE_HORIZON_COUNT defaults when this
+# migration was written; extend_occurrence_horizon applies current settings.
+HORIZON_DAYS = 35
+HORIZON_COUNT = 100
+
+logger = logging.getLogger(__name__)
+
+
+def _due_dates(task, start, end):
+    anchor = task.due_date or task.dtstart
+    try:
+        rule = rrulestr(task.rrule, dtstart=anchor)
+        return list(
+            islice(
+                takewhile(
+                    lambda due: due < end, rule.xafter(max(start, anchor), inc=True)
+                ),
+                HORIZON_COUNT,
+            )
+        )
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Cannot expand RRULE '{task.rrule}' of task {task.pk}: {e}")
+        return []
+
+
+def backfill_occurrences(apps, schema_editor):
+    """Fill the horizon for every open recurring task, then record it."""
+    Task = apps.get_model("upoutodo", "Task")
+    Occurrence = apps.get_model("upoutodo", "Occurrence")
+    OccurrenceHorizon = apps.get_model("upoutodo", "OccurrenceHorizon")
+
+    start = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+    end = start + timedelta(days=HORIZON_DAYS)
+    tasks = (
+        Task.objects.exclude(rrule="")
+        .filter(dtstart__isnull=False, completion_date__isnull=True)
+        .only("id", "owner_id", "rrule", "dtstart", "due_date")
+        .order_by("pk")
+    )
+    # Rows saved since 0021 were written for whatever day that was.
+    Occurrence.objects.all().delete()
+    last_pk = 0
+    while batch := list(tasks.filter(pk__gt=last_pk)[:BACKFILL_BATCH_SIZE]):
+        Occurrence.objects.bulk_create(
+            [
+                Occurrence(task_id=task.pk, owner_id=task.owner_id, due_date=due_date)
+                for task in batch
+                for due_date in _due_dates(task, start, end)
+            ],
+            batch_size=BACKFILL_BATCH_SIZE,
+        )
+        last_pk = batch[-1].pk
+    OccurrenceHorizon.objects.update_or_create(
+        pk=1, defaults={"start": start, "end": end}
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0021_occurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OccurrenceHorizon",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(backfill_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+# The OCCURRENCE_HORIZON_COUNT default 0022 backfilled with.
+HORIZON_COUNT = 100
+
+
+def flag_truncated_occurrences(apps, schema_editor):
+    """Flag the last row of every task that 0022 stopped at the cap."""
+    Occurrence = apps.get_model("upoutodo", "Occurrence")
+
+    capped = (
+        Occurrence.objects.values("task_id")
+        .annotate(rows=models.Count("id"), last=models.Max("due_date"))
+        .filter(rows__gte=HORIZON_COUNT)
+        .values_list("task_id", "last")
+    )
+    for task_id, last in capped.iterator():
+        Occurrence.objects.filter(task_id=task_id, due_date=last).update(truncated=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0022_occurrencehorizon"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="occurrence",
+            name="truncated",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="occurrence",
+            index=models.Index(
+                condition=models.Q(("truncated", True)),
+                fields=["owner", "due_date"],
+                name="occurrence_truncated_idx",
+            ),
+        ),
+        migrations.RunPython(flag_truncated_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:20
+
+from django.db import migrations
+from django.utils import timezone
+
+RESPACE_BATCH_SIZE = 500
+# services.ordering.ORDER_GAP when this migration was written.
+ORDER_GAP = 1024
+
+# Model, the field each list is grouped by, and the model's ordering.
+ORDERED_LISTS = [
+    ("Task", "section_id", ["order", "-due_date", "priority", "completion_date"]),
+    ("ProjectSection", "project_id", ["order"]),
+    ("Project", "created_by_id", ["order", "created_at"]),
+]
+
+
+def respace(model, group_field, ordering):
+    now = timezone.now()
+    rows = (
+        model.objects.order_by(group_field, *ordering, "pk")
+        .only("pk", "order", group_field)
+        .iterator(chunk_size=RESPACE_BATCH_SIZE)
+    )
+    group, position, changed = None, 0, []
+    for row in rows:
+        if getattr(row, group_field) != group:
+            group, position = getattr(row, group_field), 0
+        position += 1
+        if row.order != position * ORDER_GAP:
+            row.order = position * ORDER_GAP
+            row.updated_at = now
+            changed.append(row)
+        if len(changed) >= RESPACE_BATCH_SIZE:
+            model.objects.bulk_update(changed, ["order", "updated_at"])
+            changed = []
+    model.objects.bulk_update(changed, ["order", "updated_at"])
+
+
+def respace_orders(apps, schema_editor):
+    """Spread the dense 1, 2, 3... orders out by ``ORDER_GAP``."""
+    for model_name, group_field, ordering in ORDERED_LISTS:
+        respace(apps.get_model("upoutodo", model_name), group_field, ordering)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("upoutodo", "0023_occurrence_truncated"),
+    ]
+
+    operations = [
+        migrations.RunPython(respace_orders, migrations.RunPython.noop),
+    ]
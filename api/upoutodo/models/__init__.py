@@ -1,7 +1,9 @@
 from .notification import Notification  # noqa: F401
+from .occurrence import Occurrence, OccurrenceHorizon  # noqa: F401
 from .planner import EnergyCheckIn, PlanItem, TodayPlan, TodayPlanFeedback  # noqa: F401
 from .project import Project  # noqa: F401
 from .project_section import ProjectSection  # noqa: F401
 from .tag import Tag, TaggedItem  # noqa: F401
 from .task import Task  # noqa: F401
+from .task_tombstone import TaskTombstone  # noqa: F401
 from .user_profile import UserProfile  # noqa: F401
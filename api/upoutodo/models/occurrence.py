@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from .task import Task
+
+User = get_user_model()
+
+
+class Occurrence(models.Model):
+    """An upcoming due date of an open recurring task.
+
+    Rows are derived from the task's ``rrule`` and due date and rewritten by
+    ``upoutodo.services.occurrences.sync_occurrences``; never edit them
+    directly.
+    """
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="+")
+    # Copy of task.owner so a user's window is one index range scan.
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    due_date = models.DateTimeField()
+    # Set on the last row of a task that hit OCCURRENCE_HORIZON_COUNT: its
+    # later due dates were not stored.
+    truncated = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["due_date", "id"]
+        indexes = [
+            models.Index(fields=["owner", "due_date"], name="occurrence_owner_due_idx"),
+            models.Index(
+                fields=["owner", "due_date"],
+                condition=models.Q(truncated=True),
+                name="occurrence_truncated_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "due_date"], name="occurrence_task_due_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id} due {self.due_date}"
+
+
+class OccurrenceHorizon(models.Model):
+    """The ``[start, end)`` window every open recurring task has rows for.
+
+    A single row, moved forward by
+    ``upoutodo.services.occurrences.extend_occurrence_horizon`` once the
+    whole table has been filled for the new window. Reads outside it expand
+    the rules instead.
+    """
+
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    def __str__(self):
+        return f"Occurrences from {self.start} to {self.end}"
@@ -10,6 +10,23 @@ class ProjectSection(models.Model):
     title = models.CharField(max_length=100)
     is_default = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["order"]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the project as loaded so a save can tell the section moved.
+        instance._loaded_project_id = instance.__dict__.get("project_id")
+        return instance
+
+    @property
+    def project_changed(self):
+        """Whether ``project`` differs from the one loaded or last saved."""
+        return self.project_id != getattr(self, "_loaded_project_id", None)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_project_id = self.project_id
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class TaskTombstone(models.Model):
+    """Marks a deleted task so sync clients can drop it from their copy."""
+
+    task_id = models.BigIntegerField()
+    # No database constraint: tombstones written while a user is being deleted
+    # outlive the user row until they are pruned.
+    owner = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["deleted_at", "id"]
+        indexes = [models.Index(fields=["owner", "deleted_at"])]
+
+    @classmethod
+    def record(cls, tasks):
+        """Write tombstones for every task in the ``tasks`` queryset."""
+        cls.objects.bulk_create(
+            [
+                cls(task_id=task_id, owner_id=owner_id)
+                for task_id, owner_id in tasks.values_list("pk", "owner_id")
+            ],
+            batch_size=500,
+        )
+
+    def __str__(self):
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
@@ -0,0 +1,167 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskKeysetPagination(BasePagination):
+    """Keyset pagination over the task list's ``(order, -due_date, id)`` ordering.
+
+    Each page is fetched with a ``WHERE`` on the last row seen instead of an
+    ``OFFSET``, and no ``COUNT(*)`` is run, so a deep page costs the same as
+    the first one. Tasks without a due date sort last within an ``order``
+    value on every database backend.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = [
+            F("order").asc(),
+            F("due_date").desc(nulls_last=True),
+            F("id").asc(),
+        ]
+        if reverse:
+            ordering = [expression.copy() for expression in ordering]
+            for expression in ordering:
+                expression.reverse_ordering()
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(position, reverse))
+
+        results = list(queryset[: self.page_size + 1])
+        page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            page.reverse()
+
+        # Walking backwards, the page we came from always follows this one.
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self.get_position(page[-1]) if page and has_next else None
+        self.previous_position = (
+            self.get_position(page[0]) if page and has_previous else None
+        )
+        return page
+
+    def position_filter(self, position, reverse):
+        """Match the rows strictly after ``position`` (before, if ``reverse``)."""
+        order, due_date, pk = position
+        if due_date is None:
+            # Null due dates sort last, so only ids can follow within the group.
+            later_due = Q(pk__in=[])
+            earlier_due = Q(due_date__isnull=False)
+            same_due = Q(due_date__isnull=True)
+        else:
+            later_due = Q(due_date__lt=due_date) | Q(due_date__isnull=True)
+            earlier_due = Q(due_date__gt=due_date)
+            same_due = Q(due_date=due_date)
+
+        if reverse:
+            return (
+                Q(order__lt=order)
+                | Q(order=order) & earlier_due
+                | Q(order=order) & same_due & Q(pk__lt=pk)
+            )
+        return (
+            Q(order__gt=order)
+            | Q(order=order) & later_due
+            | Q(order=order) & same_due & Q(pk__gt=pk)
+        )
+
+    def get_position(self, task):
+        return (task.order, task.due_date, task.pk)
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode()))
+            due_date = parse_datetime(data["d"]) if data["d"] else None
+            return (int(data["o"]), due_date, int(data["i"])), bool(data["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        order, due_date, pk = position
+        data = {
+            "o": order,
+            "d": due_date.isoformat() if due_date else None,
+            "i": pk,
+            "r": reverse,
+        }
+        encoded = urlsafe_b64encode(json.dumps(data).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,80 @@
+import csv
+import json
+from io import StringIO
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingRenderer(BaseRenderer):
+    """Renderer that can also encode rows as they are produced.
+
+    ``stream`` turns an iterable of dicts into byte chunks for a
+    ``StreamingHttpResponse``, a few hundred rows per chunk unless the caller
+    passes a smaller ``rows_per_chunk``; ``render`` covers ordinary
+    responses, such as errors, negotiated to the same format.
+    Subclasses implement ``encode``, which yields one string per row.
+    """
+
+    charset = "utf-8"
+    rows_per_chunk = 500
+
+    def encode(self, rows, fieldnames):
+        raise NotImplementedError
+
+    def stream(self, rows, fieldnames, rows_per_chunk=None):
+        rows_per_chunk = rows_per_chunk or self.rows_per_chunk
+        pending = []
+        for line in self.encode(rows, fieldnames):
+            pending.append(line)
+            if len(pending) >= rows_per_chunk:
+                yield "".join(pending).encode(self.charset)
+                pending = []
+        if pending:
+            yield "".join(pending).encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fieldnames = list(rows[0]) if rows else []
+        return b"".join(self.stream(rows, fieldnames))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Newline-delimited JSON, one object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def encode(self, rows, fieldnames):
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    """CSV with a header row. List values are joined with commas."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def encode(self, rows, fieldnames):
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames, extrasaction="ignore")
+
+        def take():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return value
+
+        writer.writeheader()
+        yield take()
+        for row in rows:
+            writer.writerow(
+                {
+                    key: ",".join(value) if isinstance(value, list) else value
+                    for key, value in row.items()
+                }
+            )
+            yield take()
@@ -3,6 +3,6 @@ from .notification import NotificationSerializer  # noqa F401
 from .project import ProjectDetailSerializer, ProjectSerializer  # noqa F401
 from .project_section import ProjectSectionSerializer  # noqa F401
 from .tag import TagDetailSerializer, TagSerializer  # noqa F401
-from .task import TaskSerializer  # noqa F401
+from .task import TaskChangesSerializer, TaskSerializer  # noqa F401
 from .planner import EnergyCheckInSerializer, PlanItemSerializer, TodayPlanSerializer  # noqa F401
 from .user import UserSerializer  # noqa F401
@@ -25,9 +25,7 @@ class CommentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Authentication is required.")
 
         try:
-            task_exists = Task.objects.filter(
-                pk=value, section__project__created_by=request.user
-            ).exists()
+            task_exists = Task.objects.filter(pk=value, owner=request.user).exists()
         except (TypeError, ValueError):
             task_exists = False
 
@@ -3,7 +3,7 @@ from rest_framework import serializers
 
 from upoutodo.models import Project, ProjectSection
 
-from .task import TaskSerializer
+from .task import TaskSerializer, parse_sparse_fields
 
 
 class ProjectSectionSerializer(serializers.HyperlinkedModelSerializer):
@@ -54,7 +54,31 @@ class ProjectSectionSerializer(serializers.HyperlinkedModelSerializer):
         )
         return data
 
+    def get_task_context(self):
+        """Context for the nested tasks, honouring ``?task_fields=``/``?task_omit=``.
+
+        Parsed once and shared by every section of the response.
+        """
+        if "task_context" not in self.context:
+            request = self.context.get("request")
+            sparse_fields = None
+            if request is not None:
+                sparse_fields = parse_sparse_fields(
+                    request.query_params,
+                    TaskSerializer.sparse_field_names(),
+                    fields_param="task_fields",
+                    omit_param="task_omit",
+                )
+            self.context["task_context"] = {
+                "request": request,
+                "sparse_fields": sparse_fields,
+            }
+        return self.context["task_context"]
+
     @extend_schema_field(TaskSerializer(many=True))
     def get_tasks(self, obj):
+        # ProjectViewSet.retrieve prefetches the tasks with their list data.
         tasks = obj.tasks.all()
-        return TaskSerializer(tasks, many=True, read_only=True).data
+        return TaskSerializer(
+            tasks, many=True, read_only=True, context=self.get_task_context()
+        ).data
@@ -23,9 +23,7 @@ class TagDetailSerializer(serializers.ModelSerializer):
     @extend_schema_field(TaskSerializer(many=True))
     def get_tasks(self, obj):
         return TaskSerializer(
-            Task.objects.filter(
-                tags__slug=obj.slug, section__project__created_by=obj.created_by
-            ),
+            Task.objects.filter(tags__slug=obj.slug, owner=obj.created_by),
             many=True,
         ).data
 
@@ -7,18 +7,97 @@ from taggit.serializers import TaggitSerializer, TagListSerializerField
 from upoutodo.models import Project, ProjectSection, Tag, Task
 
 
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves against objects the view already loaded.
+
+    Bulk endpoints put a ``{pk: object}`` map of the user's objects in the
+    serializer context under ``preloaded_key``; without one the field falls
+    back to querying its queryset.
+    """
+
+    def __init__(self, preloaded_key, **kwargs):
+        self.preloaded_key = preloaded_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get(self.preloaded_key)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+def parse_sparse_fields(
+    query_params, available, fields_param="fields", omit_param="omit"
+):
+    """Return the names in ``available`` selected by ``?fields=`` and ``?omit=``.
+
+    Both take comma-separated field names; ``fields`` keeps only those,
+    ``omit`` drops them. ``id`` is always kept. Returns ``None`` when neither
+    parameter is given, meaning every field.
+    """
+    requested = {}
+    for param in (fields_param, omit_param):
+        names = {
+            name.strip()
+            for name in query_params.get(param, "").split(",")
+            if name.strip()
+        }
+        unknown = names - set(available)
+        if unknown:
+            raise serializers.ValidationError(
+                {param: f"Unknown fields: {', '.join(sorted(unknown))}."}
+            )
+        if names:
+            requested[param] = names
+    if not requested:
+        return None
+    selected = requested.get(fields_param, set(available))
+    return (selected - requested.get(omit_param, set())) | {"id"}
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    """Validate many task payloads with a single child serializer.
+
+    The child's fields are built once rather than once per task. For bulk
+    updates each payload is matched to its task through
+    ``context["preloaded_tasks"]``.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            self.child.instance = self.context["preloaded_tasks"][data["id"]]
+            self.child.initial_data = data
+        return self.child.run_validation(data)
+
+
 class TaskSerializer(TaggitSerializer, serializers.ModelSerializer):
-    section = serializers.PrimaryKeyRelatedField(queryset=ProjectSection.objects.all())
+    section = PreloadedPrimaryKeyRelatedField(
+        "preloaded_sections", queryset=ProjectSection.objects.all()
+    )
     project = serializers.PrimaryKeyRelatedField(
         source="section.project", read_only=True
     )
-    above_task = serializers.PrimaryKeyRelatedField(
-        queryset=Task.objects.all(), required=False, write_only=True
+    above_task = PreloadedPrimaryKeyRelatedField(
+        "preloaded_tasks",
+        queryset=Task.objects.all(),
+        required=False,
+        write_only=True,
     )
-    below_task = serializers.PrimaryKeyRelatedField(
-        queryset=Task.objects.all(), required=False, write_only=True
+    below_task = PreloadedPrimaryKeyRelatedField(
+        "preloaded_tasks",
+        queryset=Task.objects.all(),
+        required=False,
+        write_only=True,
     )
-    source_section = serializers.PrimaryKeyRelatedField(
+    source_section = PreloadedPrimaryKeyRelatedField(
+        "preloaded_sections",
         queryset=ProjectSection.objects.all(),
         write_only=True,
         required=False,
@@ -43,16 +122,28 @@ class TaskSerializer(TaggitSerializer, serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return
+        # Related fields resolve against the caller's ownership maps when the
+        # context has them.
+        if (
+            request
+            and request.user.is_authenticated
+            and "preloaded_sections" not in self.context
+        ):
+            owned_sections = ProjectSection.objects.filter(
+                project__created_by=request.user
+            )
+            owned_tasks = Task.objects.filter(owner=request.user)
 
-        owned_sections = ProjectSection.objects.filter(project__created_by=request.user)
-        owned_tasks = Task.objects.filter(section__project__created_by=request.user)
+            self.fields["section"].queryset = owned_sections
+            self.fields["above_task"].queryset = owned_tasks
+            self.fields["below_task"].queryset = owned_tasks
+            self.fields["source_section"].queryset = owned_sections
 
-        self.fields["section"].queryset = owned_sections
-        self.fields["above_task"].queryset = owned_tasks
-        self.fields["below_task"].queryset = owned_tasks
-        self.fields["source_section"].queryset = owned_sections
+        sparse_fields = self.context.get("sparse_fields")
+        if sparse_fields is not None:
+            for name, field in list(self.fields.items()):
+                if name not in sparse_fields and not field.write_only:
+                    del self.fields[name]
 
     class Meta:
         model = Task
@@ -79,9 +170,18 @@ class TaskSerializer(TaggitSerializer, serializers.ModelSerializer):
         ]
 
         read_only_fields = ["due_date"]
+        list_serializer_class = TaskListSerializer
+
+    @classmethod
+    def sparse_field_names(cls):
+        """Names a sparse fieldset can choose from."""
+        return [name for name, field in cls().fields.items() if not field.write_only]
 
     @extend_schema_field(OpenApiTypes.INT)
     def get_comments_count(self, obj):
+        # Annotated by Task.objects.with_list_data() on list querysets.
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
         content_type = ContentType.objects.get_for_model(obj)
         return Comment.objects.filter(
             content_type=content_type, object_pk=obj.pk
@@ -182,3 +282,10 @@ class TaskSerializer(TaggitSerializer, serializers.ModelSerializer):
             instance._create_next_occurrence()
 
         return instance
+
+
+class TaskChangesSerializer(serializers.Serializer):
+    tasks = TaskSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
@@ -31,6 +31,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "title", "sections", "is_default"]
 
     title = serializers.CharField()
+    # The task project pickers choose a section from here.
     sections = ProjectSectionSerializer(many=True)
 
 
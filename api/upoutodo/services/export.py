@@ -0,0 +1,90 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from upoutodo.models import Project, TaggedItem, Task
+from upoutodo.services.tasks import QUERY_CHUNK_SIZE
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "priority",
+    "due_date",
+    "completion_date",
+    "dtstart",
+    "rrule",
+    "anchor_mode",
+    "order",
+    "section",
+    "section_title",
+    "project",
+    "project_title",
+    "tags",
+    "created_at",
+    "updated_at",
+]
+
+# Export field -> task column; tags are read separately.
+EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "priority": "priority",
+    "due_date": "due_date",
+    "completion_date": "completion_date",
+    "dtstart": "dtstart",
+    "rrule": "rrule",
+    "anchor_mode": "anchor_mode",
+    "order": "order",
+    "section": "section_id",
+    "section_title": "section__title",
+    "project": "section__project_id",
+    "project_title": "section__project__title",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+DATETIME_FIELDS = {"due_date", "completion_date", "dtstart", "created_at", "updated_at"}
+
+
+def iter_task_export_rows(queryset, chunk_size=QUERY_CHUNK_SIZE):
+    """Yield one dict per task in ``queryset``, ready for an export renderer.
+
+    Rows are read as plain values with the section and project titles joined
+    in, through a server-side cursor where the database has one, and the tags
+    of each chunk of rows are fetched with a single query. Memory use depends
+    on ``chunk_size``, not on the number of tasks. Values match what
+    ``TaskSerializer`` returns for the same fields.
+    """
+    datetime_field = serializers.DateTimeField()
+    content_type = ContentType.objects.get_for_model(Task)
+    rows = (
+        dict(zip(EXPORT_COLUMNS, values))
+        for values in queryset.values_list(*EXPORT_COLUMNS.values()).iterator(
+            chunk_size=chunk_size
+        )
+    )
+
+    while chunk := list(islice(rows, chunk_size)):
+        tags_by_task = defaultdict(list)
+        for task_id, name in (
+            TaggedItem.objects.filter(
+                content_type=content_type, object_id__in=[row["id"] for row in chunk]
+            )
+            .order_by("tag__name")
+            .values_list("object_id", "tag__name")
+        ):
+            tags_by_task[task_id].append(name)
+
+        for row in chunk:
+            for field in DATETIME_FIELDS:
+                row[field] = datetime_field.to_representation(row[field])
+            if row["section_title"] == Project.DEFAULT_PROJECT_SECTION_TITLE:
+                row["section_title"] = None
+            row["rrule"] = row["rrule"] or None
+            row["anchor_mode"] = row["anchor_mode"] or None
+            row["tags"] = tags_by_task[row["id"]]
+            yield {field: row[field] for field in EXPORT_FIELDS}
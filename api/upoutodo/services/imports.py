@@ -0,0 +1,266 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from itertools import islice
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from upoutodo.models import Project, ProjectSection, Task
+from upoutodo.serializers import TaskSerializer
+from upoutodo.services.tasks import QUERY_CHUNK_SIZE, bulk_create_tasks
+from upoutodo.utils import day_start
+
+IMPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "ndjson": ("ndjson", "jsonl", "application/x-ndjson", "application/jsonl"),
+    "ics": ("ics", "ical", "text/calendar"),
+}
+
+# How the UI stores a one-off due date: a single daily occurrence.
+SINGLE_OCCURRENCE_RRULE = "FREQ=DAILY;COUNT=1"
+
+# iCalendar PRIORITY runs from 1 (highest) to 9 (lowest); 0 means undefined.
+ICS_PRIORITIES = {
+    **dict.fromkeys("1234", Task.Priority.HIGH),
+    "5": Task.Priority.MEDIUM,
+    **dict.fromkeys("6789", Task.Priority.LOW),
+}
+
+
+class ImportFormatError(Exception):
+    """Raised when an upload is not in a format we can import."""
+
+
+@dataclass
+class ImportProgress:
+    processed: int = 0
+    created: int = 0
+    failed: int = 0
+    # Errors of the latest batch only, as ``{"row": number, "errors": {...}}``.
+    errors: list[dict] = field(default_factory=list)
+
+
+def detect_format(name="", content_type=""):
+    """Return the import format for a file name or media type, or ``None``."""
+    extension = name.rpartition(".")[2].lower() if "." in name else ""
+    media_type = content_type.partition(";")[0].strip().lower()
+    for import_format, aliases in IMPORT_FORMATS.items():
+        if extension in aliases or media_type in aliases:
+            return import_format
+    return None
+
+
+def iter_import_rows(lines, import_format):
+    """Yield ``(row_number, data)`` for each task in an upload.
+
+    ``lines`` is any iterable of encoded lines, such as an open file or an
+    ``UploadedFile``, and is read one line at a time. ``data`` is a dict of
+    ``TaskSerializer`` input, or an error message when the row could not be
+    parsed. Rows are numbered from 1 in the order the tasks appear.
+    """
+    text = codecs.iterdecode(lines, "utf-8-sig")
+    if import_format == "csv":
+        return _parse_csv(text)
+    if import_format == "ndjson":
+        return _parse_ndjson(text)
+    if import_format == "ics":
+        return _parse_ics(text)
+    raise ImportFormatError(f"Unsupported import format: {import_format}.")
+
+
+def _parse_csv(lines):
+    # Matches the export: blank cells are unset and tags are comma-joined.
+    for number, row in enumerate(csv.DictReader(lines), start=1):
+        data = {key: value for key, value in row.items() if key and value != ""}
+        if "tags" in data:
+            data["tags"] = [name.strip() for name in data["tags"].split(",")]
+        yield number, data
+
+
+def _parse_ndjson(lines):
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}."
+            continue
+        if not isinstance(data, dict):
+            yield number, "Expected a JSON object."
+            continue
+        yield number, {key: value for key, value in data.items() if value is not None}
+
+
+def _unfold_ics(lines):
+    """Join RFC 5545 folded lines back into one content line each."""
+    pending = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def _unescape_ics(value):
+    return (
+        value.replace("\\n", "\n")
+        .replace("\\N", "\n")
+        .replace("\\,", ",")
+        .replace("\\;", ";")
+        .replace("\\\\", "\\")
+    )
+
+
+def _parse_ics_datetime(value, params):
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return day_start(datetime.strptime(value, "%Y%m%d").date())
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(
+            tzinfo=dt_timezone.utc
+        )
+    parsed = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    try:
+        zone = ZoneInfo(params["TZID"]) if "TZID" in params else None
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = None
+    return timezone.make_aware(parsed, zone)
+
+
+def _parse_ics_component(properties):
+    data = {}
+    for name, params, value in properties:
+        if name == "SUMMARY":
+            data["title"] = _unescape_ics(value)
+        elif name == "DESCRIPTION":
+            data["description"] = _unescape_ics(value)
+        elif name == "CATEGORIES":
+            data.setdefault("tags", []).extend(
+                _unescape_ics(tag).strip() for tag in value.split(",")
+            )
+        elif name == "PRIORITY":
+            data["priority"] = ICS_PRIORITIES.get(value.strip(), Task.Priority.NONE)
+        elif name == "RRULE":
+            data["rrule"] = value
+        elif name == "DTSTART":
+            data["dtstart"] = _parse_ics_datetime(value, params)
+        elif name == "DUE":
+            data["due_date"] = _parse_ics_datetime(value, params)
+        elif name == "COMPLETED":
+            data["completion_date"] = _parse_ics_datetime(value, params)
+    # An event's start is when it is due.
+    if "due_date" not in data and "rrule" not in data and "dtstart" in data:
+        data["due_date"] = data.pop("dtstart")
+    return data
+
+
+def _parse_ics(lines):
+    """Read VTODO and VEVENT components; other components are skipped."""
+    number = 0
+    properties = None
+    for line in _unfold_ics(lines):
+        name_and_params, _, value = line.partition(":")
+        name, *raw_params = name_and_params.split(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() in ("VTODO", "VEVENT"):
+            properties = []
+        elif name == "END" and value.upper() in ("VTODO", "VEVENT"):
+            if properties is None:
+                continue
+            number += 1
+            try:
+                yield number, _parse_ics_component(properties)
+            except ValueError as e:
+                yield number, f"Invalid date: {e}."
+            properties = None
+        elif properties is not None:
+            params = dict(
+                param.partition("=")[::2] for param in raw_params if "=" in param
+            )
+            properties.append((name, {k.upper(): v for k, v in params.items()}, value))
+
+
+def _task_data(data, default_section):
+    """Fill in what an imported row may leave out before validation."""
+    data = dict(data)
+    data.setdefault("section", default_section.pk)
+    due_date = data.pop("due_date", None)
+    if due_date and not data.get("rrule") and not data.get("dtstart"):
+        data["dtstart"] = due_date
+        data["rrule"] = SINGLE_OCCURRENCE_RRULE
+    return data
+
+
+def import_tasks(user, lines, import_format, section=None, batch_size=QUERY_CHUNK_SIZE):
+    """Validate and insert the tasks of an upload, yielding progress per batch.
+
+    Rows are parsed one at a time with ``iter_import_rows`` and validated with
+    ``TaskSerializer`` and ``Task.clean()``; rows without a section go to
+    ``section`` or the user's Inbox. Every ``batch_size`` rows the valid ones
+    are inserted with ``bulk_create_tasks`` in a transaction of their own and
+    an ``ImportProgress`` is yielded, carrying that batch's row errors, so
+    memory use does not grow with the size of the upload. At least one
+    progress is yielded, even for an empty upload.
+    """
+    rows = iter_import_rows(lines, import_format)
+    default_section = section or Project.get_user_inbox(user).default_section
+    serializer = TaskSerializer(
+        context={
+            "preloaded_sections": ProjectSection.objects.filter(
+                project__created_by=user
+            ).in_bulk(),
+            "preloaded_tasks": {},
+        }
+    )
+    progress = None
+
+    while (chunk := list(islice(rows, batch_size))) or progress is None:
+        valid = []
+        errors = []
+        for number, data in chunk:
+            validated, row_errors = _validate_row(serializer, data, default_section)
+            if row_errors:
+                errors.append({"row": number, "errors": row_errors})
+            else:
+                valid.append(validated)
+        if valid:
+            with transaction.atomic():
+                bulk_create_tasks(user, valid)
+
+        progress = ImportProgress(
+            processed=(progress.processed if progress else 0) + len(chunk),
+            created=(progress.created if progress else 0) + len(valid),
+            failed=(progress.failed if progress else 0) + len(errors),
+            errors=errors,
+        )
+        yield progress
+
+
+def _validate_row(serializer, data, default_section):
+    """Return ``(validated_data, None)`` for a good row, ``(None, errors)`` if not."""
+    if isinstance(data, str):
+        return None, {"non_field_errors": [data]}
+    try:
+        validated = serializer.run_validation(_task_data(data, default_section))
+    except serializers.ValidationError as e:
+        return None, serializers.as_serializer_error(e)
+    task_fields = {key: value for key, value in validated.items() if key != "tags"}
+    try:
+        Task(**task_fields).clean()
+    except DjangoValidationError as e:
+        return None, e.message_dict
+    return validated, None
@@ -0,0 +1,218 @@
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+from itertools import islice, takewhile
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from upoutodo.caching import ExpiringLRUCache
+from upoutodo.models import Occurrence, OccurrenceHorizon, Task
+from upoutodo.services.tasks import QUERY_CHUNK_SIZE, chunked
+from upoutodo.utils import day_start, parse_rrule
+
+logger = logging.getLogger(__name__)
+
+OCCURRENCE_FIELDS = ["task", "title", "due_date"]
+DEFAULT_OCCURRENCE_LIMIT = 100
+MAX_OCCURRENCE_LIMIT = 1000
+MAX_WINDOW_DAYS = 366
+
+# Due dates of one task within one window, keyed by
+# ``(task_id, updated_at, start, end, limit)``. Any edit bumps ``updated_at``,
+# so stale expansions are never read; the TTL only bounds their lifetime.
+occurrence_cache = ExpiringLRUCache(maxsize=settings.OCCURRENCE_CACHE_SIZE)
+
+
+def expand_occurrences(task, start, end, limit=DEFAULT_OCCURRENCE_LIMIT):
+    """Return up to ``limit`` due dates of ``task`` in ``[start, end)``.
+
+    The rule is anchored at the task's current due date, the way
+    ``Task._create_next_occurrence`` computes each successor from it, and
+    walked lazily from the window start, so a cap stops the expansion early.
+    Tasks with an invalid rule have no occurrences.
+    """
+    key = (task.pk, task.updated_at, start, end, limit)
+    occurrences = occurrence_cache.get(key)
+    if occurrences is None:
+        occurrences = _expand(task, start, end, limit)
+        occurrence_cache.set(
+            key, occurrences, time.time() + settings.OCCURRENCE_CACHE_TTL
+        )
+    return occurrences
+
+
+def _expand(task, start, end, limit):
+    anchor = task.due_date or task.dtstart
+    try:
+        rule = parse_rrule(task.rrule, anchor)
+        return tuple(
+            islice(
+                takewhile(
+                    lambda due: due < end, rule.xafter(max(start, anchor), inc=True)
+                ),
+                limit,
+            )
+        )
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Cannot expand RRULE '{task.rrule}' of task {task.pk}: {e}")
+        return ()
+
+
+def iter_occurrence_rows(queryset, start, end, limit=DEFAULT_OCCURRENCE_LIMIT):
+    """Yield one row per occurrence of the recurring tasks in ``queryset``.
+
+    Only the columns the expansion needs are read, through
+    ``QuerySet.iterator()``, so rows can be streamed without holding every
+    task in memory. Occurrences come task by task, in date order.
+    """
+    datetime_field = serializers.DateTimeField()
+    tasks = (
+        queryset.exclude(rrule="")
+        .filter(dtstart__isnull=False)
+        .only("id", "title", "rrule", "dtstart", "due_date", "updated_at")
+    )
+    for task in tasks.iterator(chunk_size=QUERY_CHUNK_SIZE):
+        for due_date in expand_occurrences(task, start, end, limit):
+            yield {
+                "task": task.pk,
+                "title": task.title,
+                "due_date": datetime_field.to_representation(due_date),
+            }
+
+
+def occurrence_horizon(today=None):
+    """Return the ``[start, end)`` the ``Occurrence`` table is filled for today."""
+    start = day_start(today or timezone.localdate())
+    return start, start + timedelta(days=settings.OCCURRENCE_HORIZON_DAYS)
+
+
+def materialized_horizon():
+    """Return the ``[start, end)`` recorded in ``OccurrenceHorizon``, if any."""
+    horizon = OccurrenceHorizon.objects.first()
+    return (horizon.start, horizon.end) if horizon else None
+
+
+def is_materialized(start, end, limit):
+    """Whether the ``Occurrence`` table can answer a window on its own.
+
+    Only windows inside the recorded horizon qualify: past its end, for
+    instance when ``extend_occurrence_horizon`` has not run today, rows may
+    be missing.
+    """
+    horizon = materialized_horizon()
+    return (
+        horizon is not None
+        and horizon[0] <= start
+        and end <= horizon[1]
+        and limit <= settings.OCCURRENCE_HORIZON_COUNT
+    )
+
+
+def _sync_window():
+    # Keep writing rows from the recorded start, which readers rely on, and
+    # up to today's end, which the next extension will record.
+    start, end = occurrence_horizon()
+    horizon = materialized_horizon()
+    if horizon is None:
+        return start, end
+    return min(start, horizon[0]), max(end, horizon[1])
+
+
+def sync_occurrences(tasks, window=None):
+    """Rewrite the ``Occurrence`` rows of ``tasks``.
+
+    Open recurring tasks get their due dates within ``window``, by default
+    the recorded horizon stretched to today's, at most
+    ``OCCURRENCE_HORIZON_COUNT`` each, the last of which is then flagged
+    ``truncated``; every other task loses its rows. Costs one delete and one
+    insert per chunk of tasks.
+    """
+    start, end = window or _sync_window()
+    cap = settings.OCCURRENCE_HORIZON_COUNT
+    for chunk in chunked(tasks):
+        Occurrence.objects.filter(task_id__in=[task.pk for task in chunk]).delete()
+        occurrences = []
+        for task in chunk:
+            if not task.rrule or not task.dtstart or task.completion_date:
+                continue
+            due_dates = _expand(task, start, end, cap)
+            occurrences.extend(
+                Occurrence(
+                    task_id=task.pk,
+                    owner_id=task.owner_id,
+                    due_date=due_date,
+                    truncated=len(due_dates) == cap and n == cap - 1,
+                )
+                for n, due_date in enumerate(due_dates)
+            )
+        Occurrence.objects.bulk_create(occurrences, batch_size=QUERY_CHUNK_SIZE)
+
+
+def truncated_task_ids(owner, end):
+    """Return the ids of ``owner``'s tasks whose rows may stop before ``end``.
+
+    These tasks hit ``OCCURRENCE_HORIZON_COUNT`` before their last stored
+    due date; windows reaching past it have to expand their rules.
+    """
+    return Occurrence.objects.filter(
+        owner=owner, truncated=True, due_date__lt=end
+    ).values("task_id")
+
+
+def extend_occurrence_horizon(batch_size=QUERY_CHUNK_SIZE):
+    """Fill the ``Occurrence`` table for today's horizon and record it.
+
+    Every open recurring task is rewritten in keyset batches of
+    ``batch_size``, each in a transaction of its own. Only then does
+    ``OccurrenceHorizon`` move forward and are the rows before its new start
+    deleted, so reads never trust a window that is still being filled.
+    Returns the number of tasks synced and of rows deleted.
+    """
+    horizon = occurrence_horizon()
+    window = _sync_window()
+    tasks = (
+        Task.objects.exclude(rrule="")
+        .filter(dtstart__isnull=False, completion_date__isnull=True)
+        .only("id", "owner_id", "rrule", "dtstart", "due_date", "completion_date")
+        .order_by("pk")
+    )
+    synced = 0
+    last_pk = 0
+    while batch := list(tasks.filter(pk__gt=last_pk)[:batch_size]):
+        with transaction.atomic():
+            sync_occurrences(batch, window)
+        synced += len(batch)
+        last_pk = batch[-1].pk
+
+    with transaction.atomic():
+        OccurrenceHorizon.objects.update_or_create(
+            pk=1, defaults={"start": horizon[0], "end": window[1]}
+        )
+        # Rows of tasks that stopped recurring are removed when they are
+        # saved; this only catches what is left from earlier days. Truncated
+        # rows stay, as they mark where a task's stored dates stop.
+        deleted, _ = Occurrence.objects.filter(
+            due_date__lt=horizon[0], truncated=False
+        ).delete()
+    return synced, deleted
+
+
+def iter_materialized_occurrence_rows(occurrences, limit=DEFAULT_OCCURRENCE_LIMIT):
+    """Yield the rows of ``iter_occurrence_rows`` from ``Occurrence`` rows."""
+    datetime_field = serializers.DateTimeField()
+    yielded = Counter()
+    rows = occurrences.order_by("task_id", "due_date").values_list(
+        "task_id", "task__title", "due_date"
+    )
+    for task_id, title, due_date in rows.iterator(chunk_size=QUERY_CHUNK_SIZE):
+        yielded[task_id] += 1
+        if yielded[task_id] <= limit:
+            yield {
+                "task": task_id,
+                "title": title,
+                "due_date": datetime_field.to_representation(due_date),
+            }
@@ -0,0 +1,136 @@
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+# Spacing between neighbours after a rebalance. About ten inserts can land
+# between two rows before they run out of room.
+ORDER_GAP = 1024
+# Largest value a PositiveIntegerField holds on every supported backend.
+MAX_ORDER = 2**31 - 1
+REBALANCE_BATCH_SIZE = 500
+
+
+def order_between(lower, upper):
+    """Return an integer strictly between ``lower`` and ``upper``, or ``None``.
+
+    A ``None`` bound stands for the start or the end of the list.
+    """
+    lower = 0 if lower is None else lower
+    if upper is None:
+        order = lower + ORDER_GAP
+        return order if order <= MAX_ORDER else None
+    if upper - lower > 1:
+        return (lower + upper) // 2
+    return None
+
+
+def allocate_order(siblings, order=None, exclude=None):
+    """Return an ``order`` value that places a row at position ``order``.
+
+    ``order`` keeps the meaning the API has always given it: the row goes
+    before every sibling whose order is ``>= order``, or last when ``order``
+    is ``None``. Only the placed row needs writing as long as its neighbours
+    are spaced apart. When they are not, the siblings are respaced first and
+    the row takes the middle of the new gap.
+    ``exclude`` is the primary key of a row being moved within ``siblings``.
+    """
+    others = siblings.exclude(pk=exclude) if exclude is not None else siblings
+    if order is None:
+        lower = others.aggregate(lower=Max("order"))["lower"]
+        upper = None
+    else:
+        bounds = others.aggregate(
+            lower=Max("order", filter=Q(order__lt=order)),
+            upper=Min("order", filter=Q(order__gte=order)),
+        )
+        lower, upper = bounds["lower"], bounds["upper"]
+
+    new_order = order_between(lower, upper)
+    if new_order is not None:
+        return new_order
+
+    if upper is None:
+        # Ran out of numbers at the end of the list, so respace it right away.
+        return rebalance(others) + ORDER_GAP
+
+    before = others.filter(order__lt=order).count()
+    rebalance(others)
+    return before * ORDER_GAP + ORDER_GAP // 2
+
+
+def order_at_position(siblings, position, exclude=None):
+    """Return the ``order`` to pass to ``allocate_order`` for a 1-based position.
+
+    Drag and drop sends where a row was dropped as ``order: index + 1``. That
+    is the order of the sibling now at ``position``, counted without the
+    moved row, so the row lands just before it; ``None``, placing the row
+    last, when ``position`` is past the end.
+    """
+    others = siblings.exclude(pk=exclude) if exclude is not None else siblings
+    start = max(position, 1) - 1
+    orders = list(
+        others.order_by(*siblings.model._meta.ordering, "pk").values_list(
+            "order", flat=True
+        )[start : start + 1]
+    )
+    return orders[0] if orders else None
+
+
+def reorder(rows, positions):
+    """Rearrange ``rows`` to follow ``positions`` by trading their orders.
+
+    ``positions`` maps each row's pk to its 1-based position in the list a
+    client sends after a drag and drop. The rows swap the order values they
+    already hold, so siblings left out of the list, such as a default
+    section, keep their place. Returns the rows whose order changed, with
+    ``updated_at`` bumped where the model has one.
+    """
+    slots = sorted(row.order for row in rows)
+    touched = touched_fields(type(rows[0])) if rows else {}
+    changed = []
+    for row, order in zip(
+        sorted(rows, key=lambda row: (positions[row.pk], row.pk)), slots
+    ):
+        if row.order != order:
+            row.order = order
+            for field, value in touched.items():
+                setattr(row, field, value)
+            changed.append(row)
+    return changed
+
+
+def touched_fields(model):
+    """Return the ``updated_at`` bump for models that have one.
+
+    Queryset updates skip ``auto_now``, and sync clients must still see the
+    rewritten order values.
+    """
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        return {"updated_at": timezone.now()}
+    return {}
+
+
+def rebalance(queryset):
+    """Respace ``queryset`` to multiples of ``ORDER_GAP``, keeping its ordering.
+
+    Rows already at their spaced value are not written. Returns the highest
+    order assigned, or 0 for an empty queryset.
+    """
+    model = queryset.model
+    ordering = [*model._meta.ordering, "pk"]
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update().order_by(*ordering).only("pk", "order")
+        )
+        touched = touched_fields(model)
+        changed = []
+        for position, row in enumerate(rows, start=1):
+            if row.order != position * ORDER_GAP:
+                row.order = position * ORDER_GAP
+                for field, value in touched.items():
+                    setattr(row, field, value)
+                changed.append(row)
+        model.objects.bulk_update(
+            changed, ["order", *touched], batch_size=REBALANCE_BATCH_SIZE
+        )
+    return len(rows) * ORDER_GAP
@@ -397,7 +397,7 @@ def rank_task_suggestions(user, check_in, plan, target_date):
     now = timezone.now()
     candidates = (
         Task.objects.filter(
-            section__project__created_by=user,
+            owner=user,
             completion_date__isnull=True,
         )
         .select_related("section__project")
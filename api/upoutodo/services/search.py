@@ -0,0 +1,83 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Kept in sync by the triggers and generated column from migration 0020.
+SQLITE_SEARCH_TABLE = "upoutodo_task_fts"
+# bm25() weights for the FTS columns: title, description, owner_id.
+SQLITE_COLUMN_WEIGHTS = (10.0, 1.0, 0.0)
+POSTGRES_SEARCH_CONFIG = "simple"
+
+SEARCH_TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(text):
+    """Split user input into words; anything else is dropped, never parsed."""
+    return SEARCH_TERM_RE.findall(text or "")
+
+
+def search_tasks(queryset, user, text):
+    """Narrow ``queryset`` to the user's tasks matching every word of ``text``.
+
+    Each word matches as a prefix of a word in the title or description.
+    Tasks are annotated with ``search_rank``, higher for better matches, with
+    title hits weighted above description hits. SQLite uses the FTS5 table and
+    PostgreSQL the GIN-indexed ``search_vector`` column; other backends fall
+    back to unranked ``icontains``. Input without any words leaves the
+    queryset unfiltered.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0))
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, user, terms)
+    if vendor == "postgresql":
+        return _search_postgres(queryset, terms)
+
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset.annotate(search_rank=Value(0.0))
+
+
+def _search_sqlite(queryset, user, terms):
+    # The owner_id column is indexed too, so the full-text lookup itself only
+    # walks the user's rows. The FTS table has to be joined rather than used
+    # in a subquery: bm25() only works in the query that does the MATCH, and a
+    # correlated subquery would redo the MATCH for every row.
+    words = " ".join(f'"{term}"*' for term in terms)
+    match = f"owner_id : {int(user.pk)} AND {{title description}} : ({words})"
+    weights = ", ".join(str(weight) for weight in SQLITE_COLUMN_WEIGHTS)
+    return queryset.extra(
+        tables=[SQLITE_SEARCH_TABLE],
+        where=[
+            f'{SQLITE_SEARCH_TABLE}.rowid = "upoutodo_task"."id"',
+            f"{SQLITE_SEARCH_TABLE} MATCH %s",
+        ],
+        params=[match],
+        select={"search_rank": f"-bm25({SQLITE_SEARCH_TABLE}, {weights})"},
+    )
+
+
+def _search_postgres(queryset, terms):
+    query = " & ".join(f"{term}:*" for term in terms)
+    return queryset.filter(
+        RawSQL(
+            f'"upoutodo_task"."search_vector" @@ '
+            f"to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)",
+            [query],
+            output_field=BooleanField(),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f'ts_rank("upoutodo_task"."search_vector", '
+            f"to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s))",
+            [query],
+            output_field=FloatField(),
+        )
+    )
@@ -0,0 +1,93 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from upoutodo.models import Task, TaskTombstone
+
+CHANGES_PAGE_SIZE = 1000
+
+
+class InvalidSyncCursor(Exception):
+    """Raised when a ``since`` cursor cannot be decoded."""
+
+
+class ExpiredSyncCursor(Exception):
+    """Raised when a cursor is older than the tombstones we keep."""
+
+
+@dataclass(frozen=True)
+class TaskChanges:
+    tasks: list[Task]
+    deleted_ids: list[int]
+    cursor: str
+    has_more: bool
+
+
+def encode_cursor(updated_at, task_id=None):
+    data = {"t": updated_at.isoformat(), "i": task_id}
+    return urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return ``(updated_at, task_id)``; ``task_id`` is ``None`` at a page end."""
+    try:
+        data = json.loads(urlsafe_b64decode(cursor.encode()))
+        updated_at = parse_datetime(data["t"])
+        task_id = data["i"]
+        if updated_at is None or (task_id is not None and not isinstance(task_id, int)):
+            raise ValueError(cursor)
+        return updated_at, task_id
+    except (TypeError, ValueError, KeyError) as e:
+        raise InvalidSyncCursor(str(e))
+
+
+def get_task_changes(user, tasks, since=None, limit=CHANGES_PAGE_SIZE):
+    """Return the tasks changed and the task ids deleted after ``since``.
+
+    ``tasks`` is the user's task queryset. Without a cursor every task is
+    returned, so a client can seed its copy and then keep it current with the
+    returned cursor. Tasks are walked in ``(updated_at, id)`` order up to a
+    fixed point in time; when more than ``limit`` changed, the cursor points
+    into the middle of that walk and ``has_more`` is set.
+
+    ``updated_at`` is taken before a transaction commits, so that point lags
+    the clock by ``TASK_CHANGES_SETTLE_SECONDS``: a slow transaction can
+    still commit behind a cursor that has moved past its timestamp.
+    """
+    until = timezone.now() - timedelta(seconds=settings.TASK_CHANGES_SETTLE_SECONDS)
+    since_at = None
+    if since:
+        since_at, since_id = decode_cursor(since)
+        retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+        if since_at < until - retention:
+            raise ExpiredSyncCursor(since)
+        after = Q(updated_at__gt=since_at)
+        if since_id is not None:
+            after |= Q(updated_at=since_at, pk__gt=since_id)
+        tasks = tasks.filter(after)
+
+    changed = list(
+        tasks.filter(updated_at__lte=until).order_by("updated_at", "pk")[: limit + 1]
+    )
+    has_more = len(changed) > limit
+    changed = changed[:limit]
+    if has_more:
+        until = changed[-1].updated_at
+        cursor = encode_cursor(until, changed[-1].pk)
+    else:
+        cursor = encode_cursor(until)
+
+    deleted_ids = []
+    if since_at is not None:
+        deleted_ids = list(
+            TaskTombstone.objects.filter(
+                owner=user, deleted_at__gt=since_at, deleted_at__lte=until
+            ).values_list("task_id", flat=True)
+        )
+    return TaskChanges(changed, deleted_ids, cursor, has_more)
@@ -0,0 +1,261 @@
+from collections import Counter, defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max
+from django.utils import timezone
+
+from upoutodo.models import Tag, TaggedItem, Task
+from upoutodo.services.ordering import MAX_ORDER, ORDER_GAP, rebalance
+from upoutodo.utils import calculate_next_due_date
+
+# Stay below SQLite's 999 bound parameters per statement.
+QUERY_CHUNK_SIZE = 500
+
+
+def chunked(items, size=QUERY_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def resolve_tags(user, names):
+    """Return ``{name: Tag}`` for the user's tags, creating any that are missing."""
+    tags = {}
+    for chunk in chunked(set(names)):
+        tags.update(
+            (tag.name, tag)
+            for tag in Tag.objects.filter(created_by=user, name__in=chunk)
+        )
+    for name in set(names) - tags.keys():
+        tags[name], _ = Tag.objects.get_or_create(name=name, created_by=user)
+    return tags
+
+
+def set_task_tags(user, tag_names_by_task):
+    """Replace the tags of many tasks, like ``task.tags.set()`` in bulk.
+
+    ``tag_names_by_task`` maps saved tasks to the tag names they should end up
+    with. Missing tagged items are added with one bulk insert and stale ones
+    removed with one delete per chunk of tasks.
+    """
+    if not tag_names_by_task:
+        return
+
+    content_type = ContentType.objects.get_for_model(Task)
+    tags = resolve_tags(
+        user, [name for names in tag_names_by_task.values() for name in names]
+    )
+    wanted_by_task = {
+        task.pk: {tags[name].pk for name in names}
+        for task, names in tag_names_by_task.items()
+    }
+
+    stale_ids = []
+    current_by_task = defaultdict(set)
+    for chunk in chunked(wanted_by_task):
+        for item_id, task_id, tag_id in TaggedItem.objects.filter(
+            content_type=content_type, object_id__in=chunk
+        ).values_list("id", "object_id", "tag_id"):
+            current_by_task[task_id].add(tag_id)
+            if tag_id not in wanted_by_task[task_id]:
+                stale_ids.append(item_id)
+
+    for chunk in chunked(stale_ids):
+        TaggedItem.objects.filter(id__in=chunk).delete()
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(content_type=content_type, object_id=task_id, tag_id=tag_id)
+            for task_id, wanted in wanted_by_task.items()
+            for tag_id in wanted - current_by_task[task_id]
+        ],
+        batch_size=QUERY_CHUNK_SIZE,
+    )
+
+
+def bulk_create_tasks(user, items):
+    """Insert tasks from validated serializer data, appended to their projects.
+
+    Order values for every project come from one grouped ``Max("order")``
+    query and are handed out ``ORDER_GAP`` apart in list order. Rows are
+    inserted with ``bulk_create``, tags attached with ``set_task_tags`` and
+    upcoming occurrences written with ``sync_occurrences``. Callers are
+    expected to hold a transaction. Returns the created tasks.
+    """
+    counts = Counter(data["section"].project_id for data in items)
+    max_orders = dict(
+        Task.objects.filter(section__project_id__in=counts)
+        .order_by()
+        .values("section__project_id")
+        .annotate(max_order=Max("order"))
+        .values_list("section__project_id", "max_order")
+    )
+    for project_id, count in counts.items():
+        if max_orders.get(project_id, 0) + count * ORDER_GAP > MAX_ORDER:
+            max_orders[project_id] = rebalance(
+                Task.objects.filter(section__project_id=project_id)
+            )
+
+    tasks = []
+    tag_names = []
+    for data in items:
+        data = dict(data)
+        data.pop("order", None)
+        tag_names.append(data.pop("tags", None))
+        project_id = data["section"].project_id
+        max_orders[project_id] = max_orders.get(project_id, 0) + ORDER_GAP
+        tasks.append(Task(**data, owner=user, order=max_orders[project_id]))
+
+    Task.objects.bulk_create(tasks, batch_size=QUERY_CHUNK_SIZE)
+    set_task_tags(user, {task: names for task, names in zip(tasks, tag_names) if names})
+    sync_occurrences([task for task in tasks if task.rrule])
+    return tasks
+
+
+def bulk_update_tasks(user, changes):
+    """Apply validated serializer data to many tasks with set-based writes.
+
+    ``changes`` is a list of ``(task, validated_data)`` pairs. Tasks are
+    grouped by the set of fields they change; tasks that also share the new
+    values are written with one ``UPDATE ... WHERE id IN``, the rest with
+    ``bulk_update``. Tags go through ``set_task_tags`` and upcoming
+    occurrences through ``sync_occurrences``. Recurring tasks that become
+    complete get their next occurrence, as in ``TaskSerializer.update``.
+    Callers are expected to hold a transaction.
+    """
+    now = timezone.now()
+    tasks_by_values = defaultdict(list)
+    tag_names_by_task = {}
+    tags_only = []
+    completed_recurring = []
+
+    for task, validated_data in changes:
+        validated_data = dict(validated_data)
+        tag_names = validated_data.pop("tags", None)
+        if tag_names is not None:
+            tag_names_by_task[task] = tag_names
+
+        if "section" in validated_data:
+            # Sections were validated against the user's own.
+            validated_data["owner_id"] = user.pk
+
+        was_completed = task.is_completed
+        for field, value in validated_data.items():
+            setattr(task, field, value)
+        if validated_data.get("completion_date") and not was_completed:
+            if task.rrule and task.rrule.strip() and task.dtstart:
+                completed_recurring.append(task)
+
+        if validated_data or tag_names is not None:
+            task.updated_at = now
+        if validated_data:
+            tasks_by_values[tuple(sorted(validated_data.items()))].append(task)
+        elif tag_names is not None:
+            # Sync and conditional GETs only see changes that bump updated_at.
+            tags_only.append(task)
+
+    tasks_by_fields = defaultdict(list)
+    for values, tasks in tasks_by_values.items():
+        if len(tasks) == 1:
+            tasks_by_fields[frozenset(dict(values))].extend(tasks)
+            continue
+        for chunk in chunked(task.pk for task in tasks):
+            Task.objects.filter(pk__in=chunk).update(updated_at=now, **dict(values))
+
+    for fields, tasks in tasks_by_fields.items():
+        Task.objects.bulk_update(
+            tasks, sorted(fields | {"updated_at"}), batch_size=QUERY_CHUNK_SIZE
+        )
+    for chunk in chunked(task.pk for task in tags_only):
+        Task.objects.filter(pk__in=chunk).update(updated_at=now)
+    set_task_tags(user, tag_names_by_task)
+    sync_occurrences([task for task, _ in changes if task.occurrences_changed])
+
+    create_next_occurrences(completed_recurring, now=now)
+
+
+def complete_tasks(user, tasks, completion_date=None):
+    """Mark many open tasks complete and create their successors in bulk.
+
+    Completion is written with one ``UPDATE`` per chunk of tasks; recurring
+    tasks then get their next occurrence from ``create_next_occurrences``.
+    Tasks that are already complete are left alone. Callers are expected to
+    hold a transaction. Returns the successors that were created.
+    """
+    now = timezone.now()
+    completion_date = completion_date or now
+    tasks = [task for task in tasks if not task.is_completed]
+    for chunk in chunked(task.pk for task in tasks):
+        Task.objects.filter(pk__in=chunk).update(
+            completion_date=completion_date, updated_at=now
+        )
+    for task in tasks:
+        task.completion_date = completion_date
+        task.updated_at = now
+
+    recurring = [task for task in tasks if task.rrule.strip() and task.dtstart]
+    sync_occurrences(recurring)
+    return create_next_occurrences(recurring, now=now)
+
+
+def create_next_occurrences(tasks, now=None):
+    """Create the next occurrence of many completed recurring tasks at once.
+
+    Does what ``Task._create_next_occurrence`` does for each task, anchoring
+    on the completion time or the schedule per ``anchor_mode``, but inserts
+    the successors with one ``bulk_create`` and copies their tags with one
+    read and one bulk insert into ``TaggedItem``. Tasks whose rule has no
+    further occurrence get no successor. Callers are expected to hold a
+    transaction. Returns the created tasks.
+    """
+    now = now or timezone.now()
+    pairs = []
+    for task in tasks:
+        if task.anchor_mode == Task.AnchorMode.COMPLETED:
+            reference_date = now
+        else:
+            reference_date = task.due_date or task.dtstart
+        next_due = calculate_next_due_date(task.rrule, reference_date)
+        if next_due:
+            successor = Task(
+                title=task.title,
+                description=task.description,
+                section_id=task.section_id,
+                owner_id=task.owner_id,
+                due_date=next_due,
+                priority=task.priority,
+                rrule=task.rrule,
+                dtstart=task.dtstart,
+                anchor_mode=task.anchor_mode,
+            )
+            pairs.append((task, successor))
+    if not pairs:
+        return []
+
+    successors = Task.objects.bulk_create(
+        [successor for _, successor in pairs], batch_size=QUERY_CHUNK_SIZE
+    )
+    successor_ids = {task.pk: successor.pk for task, successor in pairs}
+    content_type = ContentType.objects.get_for_model(Task)
+    tagged_items = []
+    for chunk in chunked(successor_ids):
+        tagged_items += [
+            TaggedItem(
+                content_type=content_type,
+                object_id=successor_ids[task_id],
+                tag_id=tag_id,
+            )
+            for task_id, tag_id in TaggedItem.objects.filter(
+                content_type=content_type, object_id__in=chunk
+            ).values_list("object_id", "tag_id")
+        ]
+    TaggedItem.objects.bulk_create(tagged_items, batch_size=QUERY_CHUNK_SIZE)
+    sync_occurrences(successors)
+    return successors
+
+
+def sync_occurrences(tasks):
+    # services.occurrences imports this module for its chunking helpers.
+    from upoutodo.services.occurrences import sync_occurrences
+
+    if tasks:
+        sync_occurrences(tasks)
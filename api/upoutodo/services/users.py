@@ -0,0 +1,53 @@
+import copy
+import time
+
+from django.conf import settings
+from django.db.models import Prefetch, prefetch_related_objects
+
+from upoutodo.caching import ExpiringLRUCache
+from upoutodo.models import Project
+from upoutodo.serializers import UserSerializer
+
+# Serialized /api/users/me/ payloads by user id. Signals drop an entry when the
+# user, their profile or one of their projects or sections changes (see
+# upoutodo.signals), but only in this process: other workers keep serving
+# theirs for up to USER_ME_CACHE_TTL, a few seconds.
+me_payload_cache = ExpiringLRUCache(maxsize=settings.USER_ME_CACHE_SIZE)
+
+
+def get_me_payload(user):
+    """Return ``UserSerializer(user).data``, from the cache when possible.
+
+    Each project lists its sections, which the task project pickers read from
+    this payload. On a miss the projects and their sections are prefetched
+    with two queries before serializing.
+    """
+    payload = me_payload_cache.get(user.pk)
+    if payload is None:
+        # Prefetch onto a copy, so a request.user kept around by the caller
+        # never serves these projects once they are out of date.
+        user = copy.copy(user)
+        user._prefetched_objects_cache = {}
+        prefetch_related_objects(
+            [user],
+            Prefetch(
+                "created_projects",
+                queryset=Project.objects.prefetch_related("sections"),
+            ),
+        )
+        payload = UserSerializer(user).data
+        me_payload_cache.set(user.pk, payload, time.time() + settings.USER_ME_CACHE_TTL)
+    return payload
+
+
+def invalidate_me_payload(user_id):
+    me_payload_cache.delete(user_id)
+
+
+def invalidate_me_payloads_with_project(project_id):
+    """Drop the cached payloads that list the project, without a query."""
+    me_payload_cache.discard_if(
+        lambda payload: any(
+            project["id"] == project_id for project in payload["projects"]
+        )
+    )
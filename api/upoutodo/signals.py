@@ -1,10 +1,26 @@
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 from django_comments.models import Comment
 
-from upoutodo.models import Notification, Project, ProjectSection, Task, UserProfile
+from upoutodo.authentication import invalidate_resolved_user
+from upoutodo.models import (
+    Notification,
+    Occurrence,
+    Project,
+    ProjectSection,
+    Tag,
+    Task,
+    TaskTombstone,
+    UserProfile,
+)
+from upoutodo.services.occurrences import sync_occurrences
+from upoutodo.services.users import (
+    invalidate_me_payload,
+    invalidate_me_payloads_with_project,
+)
 
 
 @receiver(post_save, sender=User)
@@ -36,6 +52,45 @@ def send_welcome_notification(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Make is_active and other account changes apply to the next request."""
+    invalidate_resolved_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile_user(sender, instance, **kwargs):
+    invalidate_resolved_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_me(sender, instance, update_fields=None, **kwargs):
+    # /users/me/ writes last_login itself, which is not part of its payload.
+    if update_fields != {"last_login"}:
+        invalidate_me_payload(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile_me(sender, instance, **kwargs):
+    invalidate_me_payload(instance.user_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_cached_project_me(sender, instance, **kwargs):
+    invalidate_me_payload(instance.created_by_id)
+
+
+@receiver(post_save, sender=ProjectSection)
+@receiver(post_delete, sender=ProjectSection)
+def invalidate_cached_section_me(sender, instance, **kwargs):
+    invalidate_me_payloads_with_project(instance.project_id)
+
+
 @receiver(post_save, sender=Project)
 def setup_default_project_section(sender, instance, created, **kwargs):
     if created:
@@ -46,6 +101,51 @@ def setup_default_project_section(sender, instance, created, **kwargs):
         )
 
 
+@receiver(pre_delete, sender=ProjectSection)
+def record_cascaded_task_deletions(sender, instance, **kwargs):
+    # Tasks go with their section, whether it is deleted on its own or along
+    # with its project or user.
+    TaskTombstone.record(instance.tasks.all())
+
+
+@receiver(post_save, sender=ProjectSection)
+def sync_moved_section_task_owner(sender, instance, created, **kwargs):
+    # Task.owner mirrors the project owner, so a section moved to another
+    # project takes its tasks' owner along. Renames and reorders do not.
+    if not created and instance.project_changed:
+        owner_id = instance.project.created_by_id
+        instance.tasks.exclude(owner_id=owner_id).update(
+            owner_id=owner_id, updated_at=timezone.now()
+        )
+        Occurrence.objects.filter(task__section=instance).exclude(
+            owner_id=owner_id
+        ).update(owner_id=owner_id)
+
+
+@receiver(post_save, sender=Task)
+def sync_task_occurrences(sender, instance, **kwargs):
+    # Creating, rescheduling, completing or moving a recurring task changes
+    # its upcoming occurrences; successors made on completion are new tasks.
+    if instance.occurrences_changed:
+        sync_occurrences([instance])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_commented_task(sender, instance, **kwargs):
+    # comments_count is part of the task payload, so ETags and the change
+    # feed have to see new and removed comments.
+    if instance.content_type_id == ContentType.objects.get_for_model(Task).id:
+        Task.objects.filter(pk=instance.object_pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def touch_tagged_tasks(sender, instance, **kwargs):
+    # Tag names are part of the task payload too.
+    Task.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
 @receiver(post_save, sender=Comment)
 def notify_task_owner_on_comment(sender, instance, created, **kwargs):
     """Notify the task owner when a new comment is posted on their task."""
@@ -57,13 +157,11 @@ def notify_task_owner_on_comment(sender, instance, created, **kwargs):
         return
 
     try:
-        task = Task.objects.select_related("section__project").get(
-            pk=instance.object_pk
-        )
+        task = Task.objects.select_related("owner").get(pk=instance.object_pk)
     except Task.DoesNotExist:
         return
 
-    task_owner = task.section.project.created_by
+    task_owner = task.owner
     if task_owner == instance.user:
         return
 
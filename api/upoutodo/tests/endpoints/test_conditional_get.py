@@ -0,0 +1,165 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_comments.models import Comment
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Tag
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def project(user):
+    return ProjectFactory(created_by=user, updated_by=user)
+
+
+@pytest.fixture
+def section(project):
+    return project.sections.first()
+
+
+@pytest.fixture
+def task(section):
+    return TaskFactory(section=section)
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def get_etag(client, url):
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"].startswith('W/"')
+    return response["ETag"]
+
+
+def is_not_modified(client, url, etag):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.django_db
+def test_task_list_not_modified_skips_serialization(auth_client, task):
+    url = reverse("task-list")
+    etag = get_etag(auth_client, url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert not response.content
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_task_list_etag_tracks_changes(auth_client, section, task):
+    url = reverse("task-list")
+
+    etag = get_etag(auth_client, url)
+    task.title = "Renamed"
+    task.save()
+    assert not is_not_modified(auth_client, url, etag)
+
+    etag = get_etag(auth_client, url)
+    TaskFactory(section=section)
+    assert not is_not_modified(auth_client, url, etag)
+
+    etag = get_etag(auth_client, url)
+    task.delete()
+    assert not is_not_modified(auth_client, url, etag)
+
+
+@pytest.mark.django_db
+def test_task_list_etag_tracks_comments_tags_and_sections(
+    auth_client, user, section, task
+):
+    url = reverse("task-list")
+    tag = Tag.objects.create(name="home", created_by=user)
+    task.tags.add(tag)
+
+    etag = get_etag(auth_client, url)
+    Comment.objects.create(
+        content_type=ContentType.objects.get_for_model(task),
+        object_pk=task.pk,
+        comment="A comment",
+        site_id=1,
+    )
+    assert not is_not_modified(auth_client, url, etag)
+
+    etag = get_etag(auth_client, url)
+    tag.name = "work"
+    tag.save()
+    assert not is_not_modified(auth_client, url, etag)
+
+    etag = get_etag(auth_client, url)
+    section.title = "Renamed section"
+    section.save()
+    assert not is_not_modified(auth_client, url, etag)
+
+
+@pytest.mark.django_db
+def test_task_list_etag_depends_on_query(auth_client, task):
+    url = reverse("task-list")
+
+    etag = get_etag(auth_client, url)
+
+    assert not is_not_modified(auth_client, f"{url}?ordering=-order", etag)
+
+
+@pytest.mark.django_db
+def test_task_retrieve_not_modified(auth_client, task):
+    url = reverse("task-detail", args=[task.id])
+    etag = get_etag(auth_client, url)
+
+    assert is_not_modified(auth_client, url, etag)
+    assert auth_client.get(url, HTTP_IF_NONE_MATCH="*").status_code == 304
+
+
+@pytest.mark.django_db
+def test_project_detail_etag_tracks_nested_tasks(auth_client, project, task):
+    url = reverse("project-detail", args=[project.id])
+    etag = get_etag(auth_client, url)
+    assert is_not_modified(auth_client, url, etag)
+
+    task.title = "Renamed"
+    task.save()
+
+    assert not is_not_modified(auth_client, url, etag)
+
+
+@pytest.mark.django_db
+def test_planner_today_not_modified(auth_client, task):
+    url = reverse("planner-today")
+    etag = get_etag(auth_client, url)
+    assert is_not_modified(auth_client, url, etag)
+
+    task.priority = "HIGH"
+    task.save()
+
+    assert not is_not_modified(auth_client, url, etag)
+
+
+@pytest.mark.django_db
+def test_writes_do_not_get_etags(auth_client, section):
+    response = auth_client.post(
+        reverse("task-list"), {"title": "New", "section": section.id}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "ETag" not in response
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from upoutodo.models import Task
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+from upoutodo.utils import day_range
+from upoutodo.views.productivity import UserProductivityView
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def section(user):
+    return ProjectFactory(created_by=user, updated_by=user).default_section
+
+
+def summary_request(user):
+    request = APIRequestFactory().get(reverse("user-productivity"))
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+def test_summary_counts_tasks_in_one_query(user, section):
+    now = timezone.now()
+    TaskFactory(section=section, due_date=now - timedelta(days=2))
+    _, tomorrow_start = day_range(timezone.localdate())
+    TaskFactory(section=section, due_date=tomorrow_start - timedelta(seconds=1))
+    TaskFactory(section=section)
+    done = TaskFactory(section=section, completion_date=now)
+    Task.objects.filter(pk=done.pk).update(created_at=now - timedelta(days=2))
+    TaskFactory(section=ProjectFactory().default_section)
+
+    with CaptureQueriesContext(connection) as queries:
+        summary = UserProductivityView().summary(summary_request(user))
+
+    assert len(queries) == 1
+    assert summary == {
+        "total": 4,
+        "completed": 1,
+        "pending": 3,
+        "overdue": 1,
+        "due_today": 1,
+        "completed_this_week": 1,
+        "created_this_week": 4,
+        "completion_rate": 25.0,
+        "avg_completion_days": 2.0,
+    }
+
+
+@pytest.mark.django_db
+def test_summary_without_tasks(user):
+    summary = UserProductivityView().summary(summary_request(user))
+
+    assert summary["total"] == 0
+    assert summary["completion_rate"] == 0
+    assert summary["avg_completion_days"] is None
+
+
+@pytest.mark.django_db
+def test_productivity_endpoint(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("user-productivity"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {
+        "summary",
+        "weekly_trends",
+        "priority_distribution",
+        "streak",
+    }
@@ -1,11 +1,20 @@
 import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django_comments.models import Comment
 from faker import Faker
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from upoutodo.models import Project
-from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+from upoutodo.models import Project, Tag, Task
+from upoutodo.tests.factories import (
+    ProjectFactory,
+    ProjectSectionFactory,
+    TaskFactory,
+    UserFactory,
+)
 
 fake = Faker()
 
@@ -88,6 +97,63 @@ def test_project_retrieve(auth_client, project):
     assert response.data["id"] == project.id
 
 
+def add_sections_with_tasks(project, sections, tasks_per_section):
+    content_type = ContentType.objects.get_for_model(Task)
+    for _ in range(sections):
+        section = ProjectSectionFactory(project=project)
+        for _ in range(tasks_per_section):
+            task = TaskFactory(section=section)
+            task.tags.add(
+                Tag.objects.create(
+                    name=fake.unique.word(), created_by=project.created_by
+                )
+            )
+            Comment.objects.create(
+                content_type=content_type,
+                object_pk=task.pk,
+                comment="A comment",
+                site_id=1,
+            )
+
+
+@pytest.mark.django_db
+def test_project_retrieve_query_count_is_constant(auth_client, project):
+    url = reverse("project-detail", args=[project.id])
+    add_sections_with_tasks(project, sections=1, tasks_per_section=1)
+    with CaptureQueriesContext(connection) as small_project:
+        auth_client.get(url, format="json")
+
+    add_sections_with_tasks(project, sections=5, tasks_per_section=10)
+    with CaptureQueriesContext(connection) as large_project:
+        response = auth_client.get(url, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    tasks = [task for section in response.data["sections"] for task in section["tasks"]]
+    assert len(tasks) == 51
+    assert all(task["comments_count"] == 1 and task["tags"] for task in tasks)
+    assert len(large_project.captured_queries) == len(small_project.captured_queries)
+    # ETag aggregate, project, sections, tasks, tags.
+    assert len(large_project.captured_queries) == 5
+
+
+@pytest.mark.django_db
+def test_project_retrieve_task_sparse_fields(auth_client, project):
+    add_sections_with_tasks(project, sections=1, tasks_per_section=2)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get(
+            reverse("project-detail", args=[project.id]),
+            {"task_fields": "title,order"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    task = response.data["sections"][-1]["tasks"][0]
+    assert set(task) == {"id", "title", "order"}
+    sql = " ".join(query["sql"] for query in queries)
+    assert "django_comments" not in sql
+    assert "upoutodo_taggeditem" not in sql
+
+
 @pytest.mark.django_db
 def test_project_update(auth_client, project, user):
     updated_title = fake.sentence()
@@ -125,3 +191,26 @@ def test_project_update_disallow_inbox_update(auth_client, user):
     response = auth_client.patch(url, format="json")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.data[0] == "Only 'view' can be updated in the default project."
+
+
+@pytest.mark.django_db
+def test_project_bulk_update_reorders_by_position(auth_client, user):
+    projects = [
+        ProjectFactory(created_by=user, updated_by=user, title=f"P{i}", order=i + 1)
+        for i in range(4)
+    ]
+    moved = [projects[3], projects[0], projects[1], projects[2]]
+
+    response = auth_client.put(
+        reverse("project-bulk-update"),
+        [{"id": project.id, "order": i + 1} for i, project in enumerate(moved)],
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    titles = list(
+        Project.objects.filter(created_by=user, is_default=False).values_list(
+            "title", flat=True
+        )
+    )
+    assert titles == ["P3", "P0", "P1", "P2"]
@@ -5,6 +5,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from upoutodo.models import ProjectSection
+from upoutodo.services.ordering import ORDER_GAP
 from upoutodo.tests.factories import (
     ProjectFactory,
     ProjectSectionFactory,
@@ -207,6 +208,28 @@ def test_project_section_allow_move_only_to_own_project(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+@pytest.mark.django_db
+def test_project_section_bulk_update_reorders_by_position(
+    auth_client, project_without_sections
+):
+    project = project_without_sections
+    sections = [
+        ProjectSectionFactory(project=project, title=f"S{i}", order=(i + 1) * ORDER_GAP)
+        for i in range(4)
+    ]
+    moved = [sections[1], sections[2], sections[0], sections[3]]
+
+    response = auth_client.put(
+        reverse("projectsection-bulk-update"),
+        [{"id": section.id, "order": i + 1} for i, section in enumerate(moved)],
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    titles = list(project.sections.values_list("title", flat=True))
+    assert titles == [project.default_section.title, "S1", "S2", "S0", "S3"]
+
+
 @pytest.mark.django_db
 def test_project_section_destroy(auth_client, project_with_section):
     project, section = project_with_section
@@ -1,9 +1,15 @@
 import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django_comments.models import Comment
 from faker import Faker
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from upoutodo.models import Tag, Task
+from upoutodo.services.ordering import ORDER_GAP
 from upoutodo.tests.factories import (
     ProjectFactory,
     ProjectSectionFactory,
@@ -258,3 +264,264 @@ def test_task_destroy(auth_client, task):
 
     with pytest.raises(task.DoesNotExist):
         task.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_task_bulk_create(auth_client, section):
+    existing = TaskFactory(section=section, order=5)
+    url = reverse("task-bulk-create")
+
+    response = auth_client.post(
+        url,
+        [
+            {"title": "First", "section": section.id, "tags": ["home"]},
+            {"title": "Second", "section": section.id, "priority": "HIGH"},
+        ],
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    first, second = (Task.objects.get(id=id) for id in response.data["ids"])
+    assert (first.title, second.title) == ("First", "Second")
+    assert existing.order < first.order < second.order
+    assert list(first.tags.names()) == ["home"]
+    assert second.priority == Task.Priority.HIGH
+
+
+@pytest.mark.django_db
+def test_task_bulk_create_rejects_foreign_section_without_creating(
+    auth_client, section
+):
+    other_user = UserFactory()
+    other_project = ProjectFactory(created_by=other_user, updated_by=other_user)
+    url = reverse("task-bulk-create")
+
+    response = auth_client.post(
+        url,
+        [
+            {"title": "Mine", "section": section.id},
+            {"title": "Theirs", "section": other_project.sections.first().id},
+        ],
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "section" in response.data[1]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_task_bulk_create_rejects_relative_placement(auth_client, task):
+    url = reverse("task-bulk-create")
+
+    response = auth_client.post(
+        url,
+        [{"title": "New", "section": task.section.id, "above_task": task.id}],
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Task.objects.count() == 1
+
+
+def task_order_updates(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('UPDATE "upoutodo_task"')
+        and '"order"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_task_create_above_task_writes_one_row(auth_client, section):
+    tasks = Task.objects.bulk_create(
+        Task(
+            section=section,
+            owner=section.project.created_by,
+            title=f"Task {i}",
+            order=(i + 1) * ORDER_GAP,
+        )
+        for i in range(200)
+    )
+    anchor = tasks[100]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.post(
+            reverse("task-list"),
+            {"title": "Inserted", "section": section.id, "above_task": anchor.id},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert task_order_updates(queries) == []
+    titles = list(Task.objects.filter(section=section).values_list("title", flat=True))
+    assert titles.index("Inserted") == titles.index(anchor.title) - 1
+
+
+@pytest.mark.django_db
+def test_task_move_below_task_writes_one_row(auth_client, section):
+    tasks = Task.objects.bulk_create(
+        Task(
+            section=section,
+            owner=section.project.created_by,
+            title=f"Task {i}",
+            order=(i + 1) * ORDER_GAP,
+        )
+        for i in range(200)
+    )
+    moved, anchor = tasks[0], tasks[150]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.patch(
+            reverse("task-detail", args=[moved.id]),
+            {"below_task": anchor.id},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(task_order_updates(queries)) == 1
+    titles = list(Task.objects.filter(section=section).values_list("title", flat=True))
+    assert titles.index(moved.title) == titles.index(anchor.title) + 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("spacing", [1, ORDER_GAP])
+def test_task_drag_and_drop_moves_to_position(auth_client, section, spacing):
+    tasks = [
+        TaskFactory(section=section, title=f"T{i}", order=(i + 1) * spacing)
+        for i in range(4)
+    ]
+
+    response = auth_client.patch(
+        reverse("task-detail", args=[tasks[0].id]),
+        {"order": 3, "section": section.id},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    titles = list(Task.objects.filter(section=section).values_list("title", flat=True))
+    assert titles == ["T1", "T2", "T0", "T3"]
+
+
+@pytest.mark.django_db
+def test_task_drag_and_drop_to_another_section(auth_client, section):
+    other_section = ProjectSectionFactory(project=section.project)
+    moved = TaskFactory(section=section, title="Moved")
+    for i in range(3):
+        TaskFactory(section=other_section, title=f"T{i}", order=(i + 1) * ORDER_GAP)
+
+    response = auth_client.patch(
+        reverse("task-detail", args=[moved.id]),
+        {"order": 2, "section": other_section.id},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    titles = list(
+        Task.objects.filter(section=other_section).values_list("title", flat=True)
+    )
+    assert titles == ["T0", "Moved", "T1", "T2"]
+
+
+@pytest.mark.django_db
+def test_task_destroy_leaves_siblings_untouched(auth_client, section):
+    tasks = [TaskFactory(section=section, order=order) for order in (1, 2, 3)]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.delete(reverse("task-detail", args=[tasks[0].id]))
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert task_order_updates(queries) == []
+
+
+def create_tagged_tasks_with_comments(user, section, count):
+    content_type = ContentType.objects.get_for_model(Task)
+    for i in range(count):
+        task = TaskFactory(section=section)
+        task.tags.add(Tag.objects.create(name=f"tag-{section.id}-{i}", created_by=user))
+        Comment.objects.create(
+            content_type=content_type,
+            object_pk=task.pk,
+            comment="A comment",
+            site_id=1,
+        )
+
+
+@pytest.mark.django_db
+def test_task_list_query_count_is_constant(auth_client, user, projects):
+    url = reverse("task-list")
+    create_tagged_tasks_with_comments(user, projects[0].sections.first(), 2)
+    with CaptureQueriesContext(connection) as small_page:
+        auth_client.get(url, format="json")
+
+    create_tagged_tasks_with_comments(user, projects[1].sections.first(), 20)
+    with CaptureQueriesContext(connection) as large_page:
+        response = auth_client.get(url, format="json")
+
+    assert response.data["count"] == 22
+    assert len(large_page.captured_queries) == len(small_page.captured_queries)
+    # ETag aggregate, count, page, tags prefetch.
+    assert len(large_page.captured_queries) == 4
+
+
+@pytest.mark.django_db
+def test_task_list_sparse_fields(auth_client, user, section):
+    create_tagged_tasks_with_comments(user, section, 2)
+    url = reverse("task-list")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get(url, {"fields": "title,order,section"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data["results"][0]) == {"id", "title", "order", "section"}
+    sql = " ".join(query["sql"] for query in queries)
+    assert "django_comments" not in sql
+    assert "upoutodo_taggeditem" not in sql
+    assert "upoutodo_project" not in sql
+    # ETag aggregate, count, page.
+    assert len(queries) == 3
+
+
+@pytest.mark.django_db
+def test_task_retrieve_omit_fields(auth_client, task):
+    response = auth_client.get(
+        reverse("task-detail", args=[task.id]), {"omit": "description,tags"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "description" not in response.data
+    assert "tags" not in response.data
+    assert response.data["title"] == task.title
+
+
+@pytest.mark.django_db
+def test_task_list_unknown_sparse_field(auth_client, task):
+    response = auth_client.get(reverse("task-list"), {"fields": "title,secret"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "secret" in str(response.data["fields"])
+
+
+@pytest.mark.django_db
+def test_project_detail_nested_task_sparse_fields(auth_client, task):
+    response = auth_client.get(
+        reverse("project-detail", args=[task.section.project_id]),
+        {"task_fields": "title"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    tasks = [t for section in response.data["sections"] for t in section["tasks"]]
+    assert tasks == [{"id": task.id, "title": task.title}]
+
+
+@pytest.mark.django_db
+def test_task_list_reads_annotated_values(auth_client, user, section):
+    create_tagged_tasks_with_comments(user, section, 1)
+
+    response = auth_client.get(reverse("task-list"), format="json")
+
+    result = response.data["results"][0]
+    assert result["comments_count"] == 1
+    assert result["tags"] == [f"tag-{section.id}-0"]
+    assert result["project_title"] == section.project.title
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Task, TaskTombstone
+from upoutodo.services.sync import get_task_changes
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def settled_changes(settings):
+    # Most tests read their own writes straight away.
+    settings.TASK_CHANGES_SETTLE_SECONDS = 0
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def project(user):
+    return ProjectFactory(created_by=user, updated_by=user)
+
+
+@pytest.fixture
+def section(project):
+    return project.sections.first()
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def get_changes(client, since=None):
+    params = {"since": since} if since else {}
+    response = client.get(reverse("task-changes"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+@pytest.mark.django_db
+def test_changes_without_cursor_returns_all_tasks(auth_client, section):
+    tasks = [TaskFactory(section=section) for _ in range(3)]
+    TaskFactory(section=ProjectFactory().sections.first())
+
+    data = get_changes(auth_client)
+
+    assert [task["id"] for task in data["tasks"]] == [task.id for task in tasks]
+    assert data["deleted"] == []
+    assert data["has_more"] is False
+    assert data["cursor"]
+
+
+@pytest.mark.django_db
+def test_changes_since_cursor_returns_only_updates_and_deletions(auth_client, section):
+    kept, updated, deleted = (TaskFactory(section=section) for _ in range(3))
+    cursor = get_changes(auth_client)["cursor"]
+
+    auth_client.patch(
+        reverse("task-detail", args=[updated.id]), {"title": "Renamed"}, format="json"
+    )
+    auth_client.delete(reverse("task-detail", args=[deleted.id]))
+    data = get_changes(auth_client, cursor)
+
+    assert [task["id"] for task in data["tasks"]] == [updated.id]
+    assert data["tasks"][0]["title"] == "Renamed"
+    assert data["deleted"] == [deleted.id]
+
+    data = get_changes(auth_client, data["cursor"])
+    assert data["tasks"] == []
+    assert data["deleted"] == []
+
+
+@pytest.mark.django_db
+def test_changes_records_tasks_deleted_with_their_project(
+    auth_client, project, section
+):
+    tasks = [TaskFactory(section=section) for _ in range(2)]
+    cursor = get_changes(auth_client)["cursor"]
+
+    auth_client.delete(reverse("project-detail", args=[project.id]))
+    data = get_changes(auth_client, cursor)
+
+    assert sorted(data["deleted"]) == sorted(task.id for task in tasks)
+
+
+@pytest.mark.django_db
+def test_changes_pages_through_tasks_sharing_a_timestamp(user, section):
+    Task.objects.bulk_create(
+        Task(section=section, owner=user, title=f"Task {i}") for i in range(5)
+    )
+    Task.objects.filter(section=section).update(updated_at=timezone.now())
+    tasks = Task.objects.filter(section=section)
+
+    changes = get_task_changes(user, tasks, limit=2)
+    seen = [task.id for task in changes.tasks]
+    while changes.has_more:
+        changes = get_task_changes(user, tasks, since=changes.cursor, limit=2)
+        seen += [task.id for task in changes.tasks]
+
+    assert len(seen) == 5
+    assert sorted(seen) == sorted(tasks.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_changes_hold_back_writes_that_may_not_have_committed(user, section, settings):
+    settings.TASK_CHANGES_SETTLE_SECONDS = 60
+    settled = TaskFactory(section=section)
+    Task.objects.filter(pk=settled.pk).update(
+        updated_at=timezone.now() - timedelta(minutes=2)
+    )
+    recent = TaskFactory(section=section)
+    tasks = Task.objects.filter(section=section)
+
+    changes = get_task_changes(user, tasks)
+    assert [task.id for task in changes.tasks] == [settled.id]
+
+    settings.TASK_CHANGES_SETTLE_SECONDS = 0
+    changes = get_task_changes(user, tasks, since=changes.cursor)
+    assert [task.id for task in changes.tasks] == [recent.id]
+
+
+@pytest.mark.django_db
+def test_changes_rejects_invalid_cursor(auth_client):
+    response = auth_client.get(reverse("task-changes"), {"since": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "since" in response.data
+
+
+@pytest.mark.django_db
+def test_changes_rejects_cursor_older_than_retention(auth_client, settings):
+    cursor = get_changes(auth_client)["cursor"]
+    settings.TASK_TOMBSTONE_RETENTION_DAYS = 0
+
+    response = auth_client.get(reverse("task-changes"), {"since": cursor})
+
+    assert response.status_code == status.HTTP_410_GONE
+
+
+@pytest.mark.django_db
+def test_prune_task_tombstones(user):
+    old = TaskTombstone.objects.create(task_id=1, owner=user)
+    TaskTombstone.objects.filter(pk=old.pk).update(
+        deleted_at=timezone.now() - timedelta(days=31)
+    )
+    recent = TaskTombstone.objects.create(task_id=2, owner=user)
+
+    call_command("prune_task_tombstones", days=30)
+
+    assert list(TaskTombstone.objects.all()) == [recent]
@@ -422,3 +422,26 @@ class TestTaskDateFiltering:
         assert response.data["count"] == 1
         assert response.data["results"][0]["id"] == user_task.id
         assert response.data["results"][0]["title"] == "User's task"
+
+    def test_today_and_upcoming_split_at_local_midnight(self):
+        """today/upcoming split at midnight in the current time zone, not UTC."""
+        with timezone.override("Asia/Manila"):
+            tomorrow_start = timezone.make_aware(
+                datetime.combine(
+                    timezone.localdate() + timedelta(days=1), datetime.min.time()
+                )
+            )
+            TaskFactory(
+                section=self.section,
+                title="Last minute today",
+                due_date=tomorrow_start - timedelta(minutes=1),
+            )
+            TaskFactory(section=self.section, title="Tomorrow", due_date=tomorrow_start)
+
+            today = self.client.get("/api/tasks/", {"today": "true"})
+            upcoming = self.client.get("/api/tasks/", {"upcoming": "true"})
+
+        assert [task["title"] for task in today.data["results"]] == [
+            "Last minute today"
+        ]
+        assert [task["title"] for task in upcoming.data["results"]] == ["Tomorrow"]
@@ -0,0 +1,125 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Tag, Task
+from upoutodo.services.export import EXPORT_FIELDS, iter_task_export_rows
+from upoutodo.tests.factories import (
+    ProjectFactory,
+    ProjectSectionFactory,
+    TaskFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def project(user):
+    return ProjectFactory(created_by=user, updated_by=user, title="Thesis")
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def export(client, **params):
+    response = client.get(reverse("task-export"), params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return response, b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_ndjson(auth_client, user, project):
+    section = ProjectSectionFactory(project=project, title="Writing")
+    task = TaskFactory(section=section, title="Draft chapter")
+    task.tags.add(
+        Tag.objects.create(name="school", created_by=user),
+        Tag.objects.create(name="focus", created_by=user),
+    )
+    TaskFactory(section=project.default_section, title="Inbox task")
+
+    response, content = export(auth_client)
+
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+    assert response["Content-Disposition"] == 'attachment; filename="tasks.ndjson"'
+    rows = {row["title"]: row for row in map(json.loads, content.splitlines())}
+    assert list(rows["Draft chapter"]) == EXPORT_FIELDS
+    assert rows["Draft chapter"]["tags"] == ["focus", "school"]
+    assert rows["Draft chapter"]["section_title"] == "Writing"
+    assert rows["Draft chapter"]["project"] == project.id
+    assert rows["Draft chapter"]["project_title"] == "Thesis"
+    assert rows["Inbox task"]["section_title"] is None
+    assert rows["Inbox task"]["tags"] == []
+
+
+@pytest.mark.django_db
+def test_export_csv(auth_client, user, project):
+    task = TaskFactory(section=project.default_section, title="Draft, v2")
+    task.tags.add(Tag.objects.create(name="school", created_by=user))
+
+    response, content = export(auth_client, format="csv")
+
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(StringIO(content)))
+    assert list(rows[0]) == EXPORT_FIELDS
+    assert rows[0]["title"] == "Draft, v2"
+    assert rows[0]["tags"] == "school"
+
+
+@pytest.mark.django_db
+def test_export_is_scoped_and_filtered(auth_client, project):
+    other_user = UserFactory()
+    TaskFactory(
+        section=ProjectFactory(
+            created_by=other_user, updated_by=other_user
+        ).default_section,
+        title="Someone else's report",
+    )
+    TaskFactory(section=project.default_section, title="Weekly report")
+    TaskFactory(section=project.default_section, title="Groceries")
+
+    _, content = export(auth_client, search="report")
+
+    assert [json.loads(line)["title"] for line in content.splitlines()] == [
+        "Weekly report"
+    ]
+
+
+@pytest.mark.django_db
+def test_export_requires_authentication(api_client):
+    response = api_client.get(reverse("task-export"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_export_rows_read_tags_once_per_chunk(user, project):
+    for i in range(5):
+        TaskFactory(section=project.default_section, title=f"Task {i}")
+    tasks = Task.objects.filter(owner=user).order_by("pk")
+
+    with CaptureQueriesContext(connection) as queries:
+        rows = list(iter_task_export_rows(tasks, chunk_size=2))
+
+    assert [row["title"] for row in rows] == [f"Task {i}" for i in range(5)]
+    # The task rows, then one tag query for each of the three chunks.
+    assert len(queries) == 4
@@ -0,0 +1,181 @@
+import json
+from functools import partial
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Project, Task
+from upoutodo.services.imports import import_tasks
+from upoutodo.tests.factories import (
+    ProjectFactory,
+    ProjectSectionFactory,
+    TaskFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def upload(client, name, content, **data):
+    response = client.post(
+        reverse("task-import"),
+        {"file": SimpleUploadedFile(name, content.encode()), **data},
+        format="multipart",
+    )
+    if response.status_code != status.HTTP_200_OK:
+        return response, None
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    return response, [json.loads(line) for line in lines]
+
+
+@pytest.mark.django_db
+def test_import_csv_into_the_inbox(auth_client, user):
+    content = (
+        "title,description,priority,due_date,tags\n"
+        'Read paper,"Chapter 1, 2",HIGH,2025-03-01T09:00:00Z,"school,reading"\n'
+        "Call advisor,,,,\n"
+    )
+
+    response, progress = upload(auth_client, "tasks.csv", content)
+
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+    assert progress == [{"processed": 2, "created": 2, "failed": 0, "errors": []}]
+    inbox = Project.get_user_inbox(user)
+    task = Task.objects.get(title="Read paper")
+    assert task.section == inbox.default_section
+    assert task.owner == user
+    assert task.description == "Chapter 1, 2"
+    assert task.priority == Task.Priority.HIGH
+    assert task.rrule == "FREQ=DAILY;COUNT=1"
+    assert task.due_date.isoformat() == "2025-03-01T09:00:00+00:00"
+    assert sorted(task.tags.names()) == ["reading", "school"]
+    assert Task.objects.get(title="Call advisor").due_date is None
+
+
+@pytest.mark.django_db
+def test_import_sends_each_batch_as_it_is_inserted(auth_client, monkeypatch):
+    monkeypatch.setattr(
+        "upoutodo.views.task.import_tasks", partial(import_tasks, batch_size=2)
+    )
+    content = "title\n" + "".join(f"Task {i}\n" for i in range(5))
+
+    response = auth_client.post(
+        reverse("task-import"),
+        {"file": SimpleUploadedFile("tasks.csv", content.encode())},
+        format="multipart",
+    )
+    chunks = iter(response.streaming_content)
+    first = json.loads(next(chunks))
+
+    assert first["processed"] == 2
+    assert Task.objects.count() == 2
+    rest = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+    assert [p["processed"] for p in rest] == [4, 5]
+    assert Task.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_import_reports_row_errors_per_batch(auth_client, user):
+    project = ProjectFactory(created_by=user, updated_by=user)
+    section = ProjectSectionFactory(project=project)
+    other_section = ProjectFactory().default_section
+    rows = [
+        {"title": "Good"},
+        {"title": "Weekly", "rrule": "FREQ=WEEKLY"},
+        {"title": "Not mine", "section": other_section.id},
+        {"title": "Also good", "tags": ["x"]},
+        {"description": "No title"},
+    ]
+    content = "\n".join(json.dumps(row) for row in rows) + "\n{not json\n"
+
+    _, progress = upload(auth_client, "tasks.ndjson", content, section=section.id)
+
+    assert [(p["processed"], p["created"], p["failed"]) for p in progress] == [
+        (6, 2, 4)
+    ]
+    errors = {error["row"]: error["errors"] for error in progress[0]["errors"]}
+    assert list(errors) == [2, 3, 5, 6]
+    assert "dtstart" in errors[2]
+    assert "section" in errors[3]
+    assert "title" in errors[5]
+    assert "Invalid JSON" in errors[6]["non_field_errors"][0]
+    assert sorted(section.tasks.values_list("title", flat=True)) == [
+        "Also good",
+        "Good",
+    ]
+
+
+@pytest.mark.django_db
+def test_import_ics(auth_client, user):
+    content = "\r\n".join(
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "BEGIN:VTODO",
+            "SUMMARY:Submit grades\\, section B",
+            "DESCRIPTION:Upload to the portal\\nbefore noon",
+            "DUE;VALUE=DATE:20250310",
+            "PRIORITY:1",
+            "CATEGORIES:teaching,admin",
+            "END:VTODO",
+            "BEGIN:VTODO",
+            "SUMMARY:Faculty meeting minutes for the weekly department",
+            "  sync",
+            "DTSTART:20250303T010000Z",
+            "RRULE:FREQ=WEEKLY;BYDAY=MO",
+            "END:VTODO",
+            "END:VCALENDAR",
+            "",
+        ]
+    )
+
+    _, progress = upload(auth_client, "calendar.ics", content)
+
+    assert progress[-1]["created"] == 2
+    grades = Task.objects.get(title="Submit grades, section B")
+    assert grades.description == "Upload to the portal\nbefore noon"
+    assert grades.priority == Task.Priority.HIGH
+    assert sorted(grades.tags.names()) == ["admin", "teaching"]
+    minutes = Task.objects.get(
+        title="Faculty meeting minutes for the weekly department sync"
+    )
+    assert minutes.rrule == "FREQ=WEEKLY;BYDAY=MO"
+    assert minutes.dtstart.isoformat() == "2025-03-03T01:00:00+00:00"
+
+
+@pytest.mark.django_db
+def test_import_round_trips_an_export(auth_client, user):
+    section = ProjectFactory(created_by=user, updated_by=user).default_section
+    TaskFactory(section=section, title="Exported", description="Notes", priority="LOW")
+    export = auth_client.get(reverse("task-export"), {"format": "csv"})
+    content = b"".join(export.streaming_content).decode()
+
+    _, progress = upload(auth_client, "tasks.csv", content)
+
+    assert progress[-1]["errors"] == []
+    assert section.tasks.filter(title="Exported", description="Notes").count() == 2
+
+
+@pytest.mark.django_db
+def test_import_rejects_unknown_formats(auth_client):
+    response, _ = upload(auth_client, "tasks.xlsx", "title\nA\n")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Task.objects.exists()
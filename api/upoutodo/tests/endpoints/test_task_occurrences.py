@@ -0,0 +1,200 @@
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Occurrence, OccurrenceHorizon
+from upoutodo.services.occurrences import (
+    extend_occurrence_horizon,
+    occurrence_cache,
+    occurrence_horizon,
+)
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+UTC = dt_timezone.utc
+
+
+@pytest.fixture(autouse=True)
+def empty_occurrence_cache():
+    occurrence_cache.clear()
+    yield
+    occurrence_cache.clear()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def section(user):
+    return ProjectFactory(created_by=user, updated_by=user).default_section
+
+
+def recurring_task(section, rrule, due_date, **kwargs):
+    return TaskFactory(
+        section=section, rrule=rrule, dtstart=due_date, due_date=due_date, **kwargs
+    )
+
+
+def get_occurrences(client, **params):
+    response = client.get(reverse("task-occurrences"), params)
+    if response.status_code != status.HTTP_200_OK:
+        return response, None
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    return response, [json.loads(line) for line in lines]
+
+
+@pytest.mark.django_db
+def test_occurrences_expand_rules_within_the_window(auth_client, section):
+    weekly = recurring_task(
+        section, "FREQ=WEEKLY", datetime(2025, 2, 24, 9, tzinfo=UTC), title="Seminar"
+    )
+    recurring_task(section, "FREQ=DAILY", datetime(2025, 4, 1, 9, tzinfo=UTC))
+    TaskFactory(section=section, due_date=datetime(2025, 3, 5, tzinfo=UTC))
+
+    response, rows = get_occurrences(
+        auth_client, start_date="2025-03-01", end_date="2025-03-17"
+    )
+
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+    assert rows == [
+        {"task": weekly.id, "title": "Seminar", "due_date": f"2025-03-{day}T09:00:00Z"}
+        for day in ("03", "10", "17")
+    ]
+
+
+@pytest.mark.django_db
+def test_occurrences_skip_completed_and_other_users_tasks(auth_client, section):
+    due = datetime(2025, 3, 3, 9, tzinfo=UTC)
+    recurring_task(section, "FREQ=DAILY", due, completion_date=due)
+    recurring_task(ProjectFactory().default_section, "FREQ=DAILY", due)
+
+    _, rows = get_occurrences(
+        auth_client, start_date="2025-03-01", end_date="2025-03-31"
+    )
+
+    assert rows == []
+
+
+@pytest.mark.django_db
+def test_occurrences_are_capped_per_task(auth_client, section):
+    recurring_task(section, "FREQ=DAILY", datetime(2025, 1, 1, tzinfo=UTC))
+    recurring_task(section, "FREQ=WEEKLY", datetime(2025, 1, 1, tzinfo=UTC))
+
+    _, rows = get_occurrences(
+        auth_client, start_date="2025-01-01", end_date="2025-12-31", limit=3
+    )
+
+    assert len(rows) == 6
+
+
+@pytest.mark.django_db
+def test_occurrences_are_cached_until_the_task_changes(auth_client, section):
+    task = recurring_task(section, "FREQ=DAILY", datetime(2025, 3, 1, tzinfo=UTC))
+    params = {"start_date": "2025-03-01", "end_date": "2025-03-03"}
+    get_occurrences(auth_client, **params)
+
+    _, rows = get_occurrences(auth_client, **params)
+    assert len(rows) == 3
+    assert occurrence_cache.stats()["hits"] == 1
+
+    task.rrule = "FREQ=WEEKLY"
+    task.save()
+    _, rows = get_occurrences(auth_client, **params)
+    assert len(rows) == 1
+
+
+@pytest.mark.django_db
+def test_occurrences_within_the_horizon_are_read_from_the_table(auth_client, section):
+    start, _ = occurrence_horizon()
+    task = recurring_task(section, "FREQ=DAILY", start + timedelta(hours=9))
+    recurring_task(section, "FREQ=DAILY", start)
+    extend_occurrence_horizon()
+    params = {
+        "start_date": start.date().isoformat(),
+        "end_date": (start + timedelta(days=6)).date().isoformat(),
+        "limit": 5,
+    }
+
+    _, rows = get_occurrences(auth_client, **params)
+    assert len(rows) == 10
+    assert rows[0] == {
+        "task": task.id,
+        "title": task.title,
+        "due_date": (start + timedelta(hours=9)).isoformat().replace("+00:00", "Z"),
+    }
+
+    Occurrence.objects.filter(task=task).delete()
+    _, rows = get_occurrences(auth_client, **params)
+    assert len(rows) == 5
+    assert task.id not in {row["task"] for row in rows}
+
+
+@pytest.mark.django_db
+def test_occurrences_past_the_recorded_horizon_are_expanded(auth_client, section):
+    start, end = occurrence_horizon()
+    task = recurring_task(section, "FREQ=DAILY", start + timedelta(hours=9))
+    extend_occurrence_horizon()
+    # As if the horizon was last extended yesterday.
+    OccurrenceHorizon.objects.update(end=end - timedelta(days=1))
+    Occurrence.objects.filter(task=task).delete()
+    params = {
+        "start_date": (end - timedelta(days=3)).date().isoformat(),
+        "end_date": (end - timedelta(days=1)).date().isoformat(),
+    }
+
+    _, rows = get_occurrences(auth_client, **params)
+
+    assert [row["task"] for row in rows] == [task.id] * 3
+
+
+@pytest.mark.django_db
+def test_truncated_rules_are_expanded_late_in_the_horizon(auth_client, section):
+    start, end = occurrence_horizon()
+    task = recurring_task(section, "FREQ=HOURLY", start)
+    extend_occurrence_horizon()
+    late = end - timedelta(days=3)
+    params = {
+        "start_date": late.date().isoformat(),
+        "end_date": late.date().isoformat(),
+        "limit": 5,
+    }
+
+    _, rows = get_occurrences(auth_client, **params)
+
+    # The stored rows run out within the first days of the horizon.
+    assert Occurrence.objects.filter(task=task).latest("due_date").due_date < late
+    assert [row["due_date"] for row in rows] == [
+        (late + timedelta(hours=n)).isoformat().replace("+00:00", "Z") for n in range(5)
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, field",
+    [
+        ({"end_date": "2025-03-01"}, "start_date"),
+        ({"start_date": "2025-03-01"}, "end_date"),
+        ({"start_date": "2025-03-02", "end_date": "2025-03-01"}, "end_date"),
+        ({"start_date": "2025-01-01", "end_date": "2026-06-01"}, "end_date"),
+        ({"start_date": "2025-03-01", "end_date": "2025-03-02", "limit": 0}, "limit"),
+        ({"start_date": "March", "end_date": "2025-03-02"}, "start_date"),
+    ],
+)
+def test_occurrences_validate_the_window(auth_client, params, field):
+    response, _ = get_occurrences(auth_client, **params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert field in json.loads(response.content)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Task
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def tasks(user):
+    project = ProjectFactory(created_by=user, updated_by=user)
+    section = project.sections.first()
+    now = timezone.now()
+    tasks = []
+    for i in range(23):
+        # Repeat order values and mix in null due dates to exercise every
+        # tie-breaker of the keyset.
+        due_date = None if i % 4 == 0 else now + timedelta(days=i % 5)
+        tasks.append(TaskFactory(section=section, order=i % 3, due_date=due_date))
+    return tasks
+
+
+def expected_order(tasks):
+    def key(task):
+        due = -task.due_date.timestamp() if task.due_date else float("inf")
+        return (task.order, due, task.id)
+
+    return [task.id for task in sorted(tasks, key=key)]
+
+
+def collect_pages(client, url):
+    ids = []
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data)
+        ids.extend(task["id"] for task in response.data["results"])
+        url = response.data["next"]
+    return ids, pages
+
+
+@pytest.mark.django_db
+def test_cursor_pages_follow_task_ordering(auth_client, tasks):
+    ids, pages = collect_pages(auth_client, "/api/tasks/?pagination=cursor&page_size=5")
+
+    assert ids == expected_order(tasks)
+    assert len(pages) == 5
+    assert "count" not in pages[0]
+    assert pages[0]["previous"] is None
+    assert pages[-1]["next"] is None
+
+
+@pytest.mark.django_db
+def test_previous_cursor_returns_preceding_page(auth_client, tasks):
+    first = auth_client.get("/api/tasks/?pagination=cursor&page_size=5").data
+    second = auth_client.get(first["next"]).data
+
+    previous = auth_client.get(second["previous"]).data
+
+    assert previous["results"] == first["results"]
+    assert previous["previous"] is None
+    assert auth_client.get(previous["next"]).data["results"] == second["results"]
+
+
+@pytest.mark.django_db
+def test_cursor_pages_skip_count_query(auth_client, tasks):
+    first = auth_client.get("/api/tasks/?pagination=cursor&page_size=5").data
+
+    with CaptureQueriesContext(connection) as context:
+        auth_client.get(first["next"])
+
+    task_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if 'FROM "upoutodo_task"' in query["sql"]
+    ]
+    assert not any('COUNT(*) AS "__count"' in sql for sql in task_queries)
+    assert not any("OFFSET" in sql for sql in task_queries)
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_only_returns_own_tasks(auth_client, tasks):
+    other_user = UserFactory()
+    other_project = ProjectFactory(created_by=other_user, updated_by=other_user)
+    TaskFactory(section=other_project.sections.first())
+
+    ids, _ = collect_pages(auth_client, "/api/tasks/?pagination=cursor")
+
+    assert set(ids) == {task.id for task in tasks}
+    assert Task.objects.count() == len(tasks) + 1
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_not_found(auth_client, tasks):
+    response = auth_client.get("/api/tasks/?pagination=cursor&cursor=garbage")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_is_the_default(auth_client, tasks):
+    response = auth_client.get("/api/tasks/")
+
+    assert response.data["count"] == len(tasks)
@@ -0,0 +1,105 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.models import Task
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def section(user):
+    return ProjectFactory(created_by=user, updated_by=user).sections.first()
+
+
+@pytest.fixture
+def auth_client(api_client, user):
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def search(client, text, **params):
+    response = client.get(reverse("task-list"), {"search": text, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return [task["title"] for task in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_matches_word_prefixes(auth_client, section):
+    TaskFactory(section=section, title="Submit thesis proposal", description="")
+    TaskFactory(section=section, title="Groceries", description="Buy thesaurus")
+    TaskFactory(section=section, title="Unrelated", description="")
+
+    assert sorted(search(auth_client, "thes")) == [
+        "Groceries",
+        "Submit thesis proposal",
+    ]
+    assert search(auth_client, "thes prop") == ["Submit thesis proposal"]
+    assert search(auth_client, "nothing") == []
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(auth_client, section):
+    TaskFactory(
+        section=section, title="Read", description="chapter on budgets", order=1
+    )
+    TaskFactory(section=section, title="Budget review", description="", order=2)
+
+    assert search(auth_client, "budget") == ["Budget review", "Read"]
+    assert search(auth_client, "budget", ordering="order") == ["Read", "Budget review"]
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_to_the_user(auth_client, section):
+    other_user = UserFactory()
+    other_section = ProjectFactory(
+        created_by=other_user, updated_by=other_user
+    ).sections.first()
+    TaskFactory(section=other_section, title="Secret plan")
+    TaskFactory(section=section, title="Public plan")
+
+    assert search(auth_client, "plan") == ["Public plan"]
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes(auth_client, section):
+    task = TaskFactory(section=section, title="Draft report")
+    assert search(auth_client, "draft") == ["Draft report"]
+
+    task.title = "Final report"
+    task.save()
+    assert search(auth_client, "draft") == []
+    assert search(auth_client, "final") == ["Final report"]
+
+    Task.objects.filter(pk=task.pk).update(description="with appendix")
+    assert search(auth_client, "appendix") == ["Final report"]
+
+    response = auth_client.post(
+        reverse("task-bulk-create"),
+        [{"title": "Imported draft", "section": section.id}],
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert search(auth_client, "draft") == ["Imported draft"]
+
+    task.delete()
+    assert search(auth_client, "final") == []
+
+
+@pytest.mark.django_db
+def test_search_ignores_query_syntax(auth_client, section):
+    TaskFactory(section=section, title="Plan trip")
+
+    assert search(auth_client, '"plan" OR * NEAR(') == []
+    assert search(auth_client, "plan*") == ["Plan trip"]
+    assert search(auth_client, "!!!") == ["Plan trip"]
@@ -7,10 +7,15 @@ and user options/preferences updates.
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from upoutodo.tests.factories import UserFactory
+from upoutodo.tests.factories import (
+    ProjectFactory,
+    ProjectSectionFactory,
+    UserFactory,
+)
 
 User = get_user_model()
 
@@ -185,3 +190,44 @@ def test_user_viewset_permissions(auth_client):
         assert response.status_code != status.HTTP_401_UNAUTHORIZED, (
             f"{method} {url} should work when authenticated"
         )
+
+
+@pytest.mark.django_db
+def test_user_me_prefetches_projects_and_sections(
+    auth_client, user, django_assert_num_queries
+):
+    for _ in range(3):
+        ProjectFactory(created_by=user, updated_by=user)
+    user.last_login = timezone.now()
+    user.save()
+
+    # Projects and their sections.
+    with django_assert_num_queries(2):
+        response = auth_client.get("/api/users/me/")
+
+    assert len(response.data["projects"]) == 4
+    assert all(project["sections"] for project in response.data["projects"])
+
+
+@pytest.mark.django_db
+def test_user_me_is_cached_until_projects_or_profile_change(
+    auth_client, user, django_assert_num_queries
+):
+    url = "/api/users/me/"
+    auth_client.get(url)
+    with django_assert_num_queries(0):
+        auth_client.get(url)
+
+    project = ProjectFactory(created_by=user, updated_by=user, title="Thesis")
+    assert "Thesis" in [p["title"] for p in auth_client.get(url).data["projects"]]
+
+    ProjectSectionFactory(project=project, title="Chapter 1")
+    projects = {p["id"]: p for p in auth_client.get(url).data["projects"]}
+    assert "Chapter 1" in [s["title"] for s in projects[project.id]["sections"]]
+
+    user.profile.theme = "dark"
+    user.profile.save()
+    assert auth_client.get(url).data["theme"] == "dark"
+
+    project.delete()
+    assert project.id not in [p["id"] for p in auth_client.get(url).data["projects"]]
@@ -0,0 +1,25 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from upoutodo.management.commands.benchmark_productivity_summary import (
+    BENCHMARK_USERNAME,
+)
+from upoutodo.models import Task
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_benchmark_productivity_summary_reports_queries_and_rolls_back():
+    output = StringIO()
+
+    call_command("benchmark_productivity_summary", tasks=50, repeat=1, stdout=output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[lines.index("single aggregate") + 1] == "queries 1"
+    assert lines[lines.index("separate COUNT queries") + 1] == "queries 8"
+    assert not User.objects.filter(username=BENCHMARK_USERNAME).exists()
+    assert not Task.objects.exists()
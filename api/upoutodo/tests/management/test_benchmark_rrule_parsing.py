@@ -0,0 +1,15 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+
+def test_benchmark_rrule_parsing_reports_timings():
+    output = StringIO()
+
+    call_command("benchmark_rrule_parsing", iterations=50, stdout=output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "Computed 50 next due dates"
+    assert lines[1].startswith("rrulestr per call: ")
+    assert lines[2].startswith("cached templates: ")
+    assert lines[3].startswith("Cache hits ")
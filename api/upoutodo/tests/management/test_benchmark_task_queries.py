@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from upoutodo.management.commands.benchmark_task_queries import (
+    BENCHMARK_USERNAME_PREFIX,
+)
+from upoutodo.models import Task
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_benchmark_task_queries_reports_plans_and_rolls_back():
+    output = StringIO()
+
+    call_command(
+        "benchmark_task_queries",
+        tasks=200,
+        users=2,
+        sections=2,
+        repeat=1,
+        stdout=output,
+    )
+
+    assert "section open tasks by due date" in output.getvalue()
+    assert "median" in output.getvalue()
+    assert "task_section_order_idx" in output.getvalue()
+    assert not User.objects.filter(
+        username__startswith=BENCHMARK_USERNAME_PREFIX
+    ).exists()
+    assert not Task.objects.exists()
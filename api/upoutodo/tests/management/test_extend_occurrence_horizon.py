@@ -0,0 +1,53 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from upoutodo.models import Occurrence, OccurrenceHorizon, Task
+from upoutodo.services.occurrences import occurrence_horizon
+from upoutodo.tests.factories import ProjectFactory, UserFactory
+
+
+@pytest.mark.django_db
+def test_extend_occurrence_horizon_rewrites_every_recurring_task():
+    user = UserFactory()
+    section = ProjectFactory(created_by=user, updated_by=user).default_section
+    start, end = occurrence_horizon()
+    due_date = start - timedelta(days=10)
+    tasks = [
+        Task.objects.create(
+            section=section,
+            title=f"Task {n}",
+            rrule="FREQ=DAILY",
+            dtstart=due_date,
+            due_date=due_date,
+        )
+        for n in range(3)
+    ]
+    # Rows left from an earlier day, and a task that stopped recurring
+    # through a queryset update.
+    Occurrence.objects.all().delete()
+    Occurrence.objects.bulk_create(
+        Occurrence(task=task, owner=user, due_date=start - timedelta(days=1))
+        for task in tasks
+    )
+    Task.objects.filter(pk=tasks[0].pk).update(rrule="")
+    stdout = StringIO()
+
+    call_command("extend_occurrence_horizon", batch_size=1, stdout=stdout)
+
+    assert stdout.getvalue().splitlines()[-1] == (
+        "Synced 2 recurring tasks; deleted 1 past occurrences."
+    )
+    assert not Occurrence.objects.filter(due_date__lt=start).exists()
+    assert Occurrence.objects.filter(task=tasks[1]).earliest("due_date").due_date == (
+        start
+    )
+    assert (
+        Occurrence.objects.filter(task=tasks[2]).count()
+        == settings.OCCURRENCE_HORIZON_DAYS
+    )
+    horizon = OccurrenceHorizon.objects.get()
+    assert (horizon.start, horizon.end) == (start, end)
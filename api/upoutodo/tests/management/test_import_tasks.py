@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from upoutodo.models import Task
+from upoutodo.tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+def test_import_tasks_reports_progress_per_batch(tmp_path):
+    user = UserFactory(username="faculty")
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,anchor_mode\nOne,\nTwo,\nThree,COMPLETED\nFour,\nFive,\n")
+    stdout = StringIO()
+    stderr = StringIO()
+
+    call_command(
+        "import_tasks",
+        str(path),
+        username="faculty",
+        batch_size=2,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert stdout.getvalue().splitlines() == [
+        "Processed 2 rows: 2 imported, 0 failed.",
+        "Processed 4 rows: 3 imported, 1 failed.",
+        "Processed 5 rows: 4 imported, 1 failed.",
+        "Imported 4 of 5 tasks.",
+    ]
+    assert stderr.getvalue().startswith('Row 3: {"rrule":')
+    assert list(
+        Task.objects.filter(owner=user)
+        .order_by("order")
+        .values_list("title", flat=True)
+    ) == ["One", "Two", "Four", "Five"]
+
+
+@pytest.mark.django_db
+def test_import_tasks_needs_a_known_format(tmp_path):
+    UserFactory(username="faculty")
+    path = tmp_path / "tasks.txt"
+    path.write_text("title\nOne\n")
+
+    with pytest.raises(CommandError, match="--format"):
+        call_command("import_tasks", str(path), username="faculty")
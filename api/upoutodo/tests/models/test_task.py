@@ -3,10 +3,11 @@ from datetime import timedelta
 import pytest
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from upoutodo.models import Task
+from upoutodo.models import ProjectSection, Task
 from upoutodo.tests.factories import (
     ProjectFactory,
     ProjectSectionFactory,
@@ -695,3 +696,68 @@ def test_recurring_task_completion_without_dtstart(section):
     # Should still have only 1 task (no next occurrence created)
     assert Task.objects.filter(section=section).count() == 1
     assert task.is_completed is True
+
+
+@pytest.mark.django_db
+def test_task_owner_follows_project_owner(user, section):
+    task = Task.objects.create(title="Owned", section=section)
+
+    assert task.owner == user
+
+
+@pytest.mark.django_db
+def test_task_owner_follows_moved_task(task):
+    other_user = UserFactory()
+    other_section = ProjectFactory(
+        created_by=other_user, updated_by=other_user
+    ).sections.first()
+
+    task = Task.objects.get(pk=task.pk)
+    task.section = other_section
+    task.save(update_fields=["section"])
+
+    assert Task.objects.get(pk=task.pk).owner == other_user
+
+
+@pytest.mark.django_db
+def test_task_owner_follows_moved_section(section, task):
+    other_user = UserFactory()
+    section.project = ProjectFactory(created_by=other_user, updated_by=other_user)
+    section.save()
+
+    assert Task.objects.get(pk=task.pk).owner == other_user
+
+
+@pytest.mark.django_db
+def test_renaming_a_section_leaves_its_tasks_alone(section, task):
+    section = ProjectSection.objects.get(pk=section.pk)
+    section.title = "Renamed"
+
+    with CaptureQueriesContext(connection) as context:
+        section.save()
+
+    assert [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("UPDATE")
+        and (
+            '"upoutodo_task"' in query["sql"] or '"upoutodo_occurrence"' in query["sql"]
+        )
+    ] == []
+
+
+@pytest.mark.django_db
+def test_next_occurrence_keeps_owner(user, section):
+    task = Task.objects.create(
+        title="Daily",
+        section=section,
+        rrule="FREQ=DAILY",
+        dtstart=timezone.now(),
+        anchor_mode=Task.AnchorMode.SCHEDULED,
+    )
+
+    task.mark_complete()
+
+    assert set(
+        Task.objects.filter(section=section).values_list("owner", flat=True)
+    ) == {user.pk}
@@ -5,12 +5,16 @@ These tests ensure that bulk operations perform efficiently with large datasets.
 """
 
 import time
+from datetime import timedelta
 
 import pytest
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 
-from upoutodo.models import Task
+from upoutodo.models import Tag, Task
 from upoutodo.tests.factories import (
     ProjectFactory,
     ProjectSectionFactory,
@@ -288,6 +292,166 @@ class TestBulkOperationPerformance:
         )
 
 
+@pytest.mark.django_db
+class TestSetBasedBulkUpdate:
+    """Bulk update cost must not grow with one query per task."""
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+
+        self.project = ProjectFactory(created_by=self.user, updated_by=self.user)
+        self.section = ProjectSectionFactory(project=self.project)
+        self.other_section = ProjectSectionFactory(project=self.project)
+        Tag.objects.create(name="existing", created_by=self.user)
+
+    def create_tasks(self, count):
+        Task.objects.bulk_create(
+            Task(
+                section=self.section,
+                owner=self.user,
+                title=f"Task {i}",
+                order=i,
+                priority="LOW",
+            )
+            for i in range(count)
+        )
+        return list(Task.objects.filter(section=self.section).order_by("id"))
+
+    def build_payload(self, tasks):
+        payload = []
+        for i, task in enumerate(tasks):
+            task_data = {"id": task.id, "priority": "HIGH"}
+            if i % 2:
+                task_data["section"] = self.other_section.id
+            if i % 3 == 0:
+                task_data["tags"] = ["existing", "bulk"]
+            payload.append(task_data)
+        return payload
+
+    def run_bulk_update(self, count):
+        tasks = self.create_tasks(count)
+        payload = self.build_payload(tasks)
+
+        with CaptureQueriesContext(connection) as context:
+            start_time = time.time()
+            response = self.client.put(
+                "/api/tasks/bulk_update/", payload, format="json"
+            )
+            execution_time = time.time() - start_time
+
+        assert response.status_code == 204
+        assert Task.objects.filter(priority="HIGH").count() == count
+        assert Task.objects.filter(section=self.other_section).count() == count // 2
+        assert Task.objects.filter(tags__name="bulk").count() == len(range(0, count, 3))
+        return len(context.captured_queries), execution_time
+
+    def test_bulk_update_1k_tasks(self):
+        query_count, execution_time = self.run_bulk_update(1_000)
+
+        assert query_count < 30, f"Bulk update of 1k tasks ran {query_count} queries"
+        assert execution_time < 5.0, (
+            f"Bulk update of 1k tasks took {execution_time:.2f}s, expected < 5.0s"
+        )
+
+    @pytest.mark.slow
+    def test_bulk_update_10k_tasks(self):
+        query_count, execution_time = self.run_bulk_update(10_000)
+
+        assert query_count < 150, f"Bulk update of 10k tasks ran {query_count} queries"
+        assert execution_time < 30.0, (
+            f"Bulk update of 10k tasks took {execution_time:.2f}s, expected < 30.0s"
+        )
+
+    def test_bulk_update_replaces_tags(self):
+        task = self.create_tasks(1)[0]
+        task.tags.add(Tag.objects.get(name="existing"))
+        updated_at = task.updated_at
+
+        response = self.client.put(
+            "/api/tasks/bulk_update/",
+            [{"id": task.id, "tags": ["fresh"]}],
+            format="json",
+        )
+
+        assert response.status_code == 204
+        assert list(task.tags.names()) == ["fresh"]
+        task.refresh_from_db()
+        assert task.updated_at > updated_at
+
+    def test_bulk_update_rejects_foreign_relative_task(self):
+        task = self.create_tasks(1)[0]
+        other_user = UserFactory()
+        other_project = ProjectFactory(created_by=other_user, updated_by=other_user)
+        foreign_task = TaskFactory(section=other_project.sections.first())
+
+        response = self.client.put(
+            "/api/tasks/bulk_update/",
+            [{"id": task.id, "above_task": foreign_task.id}],
+            format="json",
+        )
+
+        assert response.status_code == 400
+        task.refresh_from_db()
+        assert task.order == 0
+
+
+@pytest.mark.django_db
+class TestBulkCreate:
+    """Bulk create cost must not grow with one query per task."""
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+
+        self.project = ProjectFactory(created_by=self.user, updated_by=self.user)
+        self.section = ProjectSectionFactory(project=self.project)
+        self.other_section = ProjectSectionFactory(project=self.project)
+
+    def run_bulk_create(self, count):
+        payload = [
+            {
+                "title": f"Task {i}",
+                "section": self.other_section.id if i % 2 else self.section.id,
+                "tags": ["bulk"] if i % 3 == 0 else [],
+            }
+            for i in range(count)
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            start_time = time.time()
+            response = self.client.post(
+                "/api/tasks/bulk_create/", payload, format="json"
+            )
+            execution_time = time.time() - start_time
+
+        assert response.status_code == 201
+        assert len(response.data["ids"]) == count
+        assert Task.objects.filter(section__project=self.project).count() == count
+        assert Task.objects.filter(tags__name="bulk").count() == len(range(0, count, 3))
+        return len(context.captured_queries), execution_time
+
+    def test_bulk_create_1k_tasks(self):
+        query_count, execution_time = self.run_bulk_create(1_000)
+
+        # SQLite's bound parameter limit caps inserts at ~70 task rows each.
+        assert query_count < 40, f"Bulk create of 1k tasks ran {query_count} queries"
+        assert execution_time < 5.0, (
+            f"Bulk create of 1k tasks took {execution_time:.2f}s, expected < 5.0s"
+        )
+
+    @pytest.mark.slow
+    def test_bulk_create_10k_tasks(self):
+        query_count, execution_time = self.run_bulk_create(10_000)
+
+        assert query_count < 200, f"Bulk create of 10k tasks ran {query_count} queries"
+        assert execution_time < 30.0, (
+            f"Bulk create of 10k tasks took {execution_time:.2f}s, expected < 30.0s"
+        )
+
+
 @pytest.mark.django_db
 class TestConcurrencyPerformance:
     """Test performance under concurrent access scenarios."""
@@ -343,3 +507,85 @@ class TestConcurrencyPerformance:
             response = client.get("/api/tasks/")
             assert response.status_code == 200
             assert response.data["count"] == 5  # Only their own tasks
+
+
+@pytest.mark.django_db
+class TestBulkComplete:
+    """Completing recurring tasks in bulk must not cost queries per task."""
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+
+        self.project = ProjectFactory(created_by=self.user, updated_by=self.user)
+        self.section = ProjectSectionFactory(project=self.project)
+        self.tags = [
+            Tag.objects.create(name=name, created_by=self.user) for name in "ab"
+        ]
+
+    def create_recurring_tasks(self, count, due_date):
+        tasks = Task.objects.bulk_create(
+            Task(
+                section=self.section,
+                owner=self.user,
+                title=f"Task {i}",
+                rrule="FREQ=WEEKLY",
+                dtstart=due_date,
+                due_date=due_date,
+                anchor_mode="SCHEDULED",
+            )
+            for i in range(count)
+        )
+        for task in tasks:
+            task.tags.add(*self.tags)
+        return tasks
+
+    def test_bulk_complete_creates_successors_with_tags(self):
+        due_date = timezone.now().replace(microsecond=0)
+        tasks = self.create_recurring_tasks(50, due_date)
+        plain = TaskFactory(section=self.section)
+        ids = [task.id for task in tasks] + [plain.id]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/tasks/bulk_complete/", {"ids": ids}, format="json"
+            )
+
+        assert response.status_code == 200
+        assert len(context.captured_queries) < 30, (
+            f"Bulk completion of 50 tasks ran {len(context.captured_queries)} queries"
+        )
+        assert not Task.objects.filter(pk__in=ids, completion_date__isnull=True)
+        successors = Task.objects.filter(pk__in=response.data["created"])
+        assert successors.count() == 50
+        for successor in successors:
+            assert successor.due_date == due_date + timedelta(weeks=1)
+            assert successor.owner == self.user
+            assert sorted(successor.tags.names()) == ["a", "b"]
+
+    def test_bulk_complete_skips_completed_tasks(self):
+        task = self.create_recurring_tasks(1, timezone.now())[0]
+        task.completion_date = timezone.now()
+        task.save()
+        created = Task.objects.count()
+
+        response = self.client.post(
+            "/api/tasks/bulk_complete/", {"ids": [task.id]}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"created": []}
+        assert Task.objects.count() == created
+
+    def test_bulk_complete_rejects_other_users_tasks(self):
+        other_project = ProjectFactory()
+        foreign_task = TaskFactory(section=other_project.sections.first())
+
+        response = self.client.post(
+            "/api/tasks/bulk_complete/", {"ids": [foreign_task.id]}, format="json"
+        )
+
+        assert response.status_code == 400
+        foreign_task.refresh_from_db()
+        assert foreign_task.completion_date is None
@@ -0,0 +1,147 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+
+from upoutodo.models import Occurrence, OccurrenceHorizon, Task
+from upoutodo.services.occurrences import occurrence_horizon, sync_occurrences
+from upoutodo.services.tasks import bulk_create_tasks, bulk_update_tasks
+from upoutodo.tests.factories import ProjectFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+@pytest.fixture
+def section(user):
+    return ProjectFactory(created_by=user, updated_by=user).default_section
+
+
+def today_at(hour):
+    return timezone.make_aware(datetime.combine(timezone.localdate(), time(hour)))
+
+
+def due_dates(task):
+    return list(Occurrence.objects.filter(task=task).values_list("due_date", flat=True))
+
+
+def recurring_task(section, rrule="FREQ=DAILY", due_date=None, **kwargs):
+    due_date = due_date or today_at(9)
+    return Task.objects.create(
+        section=section,
+        title="Recurring",
+        rrule=rrule,
+        dtstart=due_date,
+        due_date=due_date,
+        **kwargs,
+    )
+
+
+def test_creating_a_recurring_task_fills_the_horizon(user, section):
+    task = recurring_task(section)
+
+    dates = due_dates(task)
+    assert len(dates) == settings.OCCURRENCE_HORIZON_DAYS
+    assert dates[0] == today_at(9)
+    assert dates[-1] < occurrence_horizon()[1]
+    assert set(
+        Occurrence.objects.filter(task=task).values_list("owner_id", flat=True)
+    ) == {user.id}
+
+
+def test_non_recurring_tasks_have_no_occurrences(section):
+    Task.objects.create(section=section, title="Once", due_date=today_at(9))
+
+    assert not Occurrence.objects.exists()
+
+
+def test_changing_the_rule_rewrites_occurrences(section):
+    task = recurring_task(section)
+
+    task.rrule = "FREQ=WEEKLY"
+    task.save()
+
+    dates = due_dates(task)
+    assert dates == [today_at(9) + timedelta(weeks=n) for n in range(len(dates))]
+
+    task.rrule = ""
+    task.dtstart = None
+    task.save()
+    assert due_dates(task) == []
+
+
+def test_completing_hands_occurrences_to_the_successor(section):
+    task = recurring_task(section)
+
+    task.mark_complete()
+
+    assert due_dates(task) == []
+    successor = Task.objects.get(completion_date__isnull=True)
+    assert due_dates(successor)[0] == today_at(9) + timedelta(days=1)
+
+
+def test_saving_an_unchanged_task_leaves_occurrences_alone(section):
+    task = recurring_task(section)
+    ids = set(Occurrence.objects.values_list("id", flat=True))
+
+    task = Task.objects.get(pk=task.pk)
+    task.title = "Renamed"
+    task.save()
+
+    assert set(Occurrence.objects.values_list("id", flat=True)) == ids
+
+
+def test_bulk_writes_keep_occurrences_in_step(user, section):
+    created = bulk_create_tasks(
+        user,
+        [
+            {
+                "title": title,
+                "section": section,
+                "rrule": "FREQ=DAILY",
+                "dtstart": today_at(9),
+                "due_date": today_at(9),
+            }
+            for title in ("One", "Two")
+        ],
+    )
+    assert Occurrence.objects.count() == 2 * settings.OCCURRENCE_HORIZON_DAYS
+
+    tasks = list(Task.objects.filter(pk__in=[task.pk for task in created]))
+    bulk_update_tasks(user, [(tasks[0], {"rrule": "FREQ=WEEKLY"})])
+
+    assert len(due_dates(tasks[0])) < len(due_dates(tasks[1]))
+
+
+def test_sync_occurrences_caps_rows_per_task(section, settings):
+    settings.OCCURRENCE_HORIZON_COUNT = 3
+    task = recurring_task(section, rrule="FREQ=HOURLY")
+
+    sync_occurrences([task])
+
+    assert due_dates(task) == [today_at(9) + timedelta(hours=n) for n in range(3)]
+    assert list(
+        Occurrence.objects.filter(task=task).values_list("truncated", flat=True)
+    ) == [False, False, True]
+
+
+def test_saves_fill_from_the_recorded_horizon_start(section):
+    # The horizon was last extended yesterday.
+    start, end = occurrence_horizon()
+    OccurrenceHorizon.objects.update_or_create(
+        pk=1,
+        defaults={"start": start - timedelta(days=1), "end": end - timedelta(days=1)},
+    )
+
+    task = recurring_task(section, due_date=today_at(9) - timedelta(days=1))
+
+    dates = due_dates(task)
+    assert dates[0] == today_at(9) - timedelta(days=1)
+    assert dates[-1] == today_at(9) + timedelta(
+        days=settings.OCCURRENCE_HORIZON_DAYS - 1
+    )
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from upoutodo.models import Task
+from upoutodo.services.ordering import (
+    MAX_ORDER,
+    ORDER_GAP,
+    allocate_order,
+    order_between,
+    rebalance,
+)
+from upoutodo.tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.fixture
+def section():
+    user = UserFactory()
+    project = ProjectFactory(created_by=user, updated_by=user)
+    return project.sections.first()
+
+
+def ordered_titles(section):
+    return list(Task.objects.filter(section=section).values_list("title", flat=True))
+
+
+def test_order_between():
+    assert order_between(None, None) == ORDER_GAP
+    assert order_between(ORDER_GAP, None) == 2 * ORDER_GAP
+    assert order_between(None, ORDER_GAP) == ORDER_GAP // 2
+    assert order_between(10, 20) == 15
+    assert order_between(10, 11) is None
+    assert order_between(10, 10) is None
+    assert order_between(MAX_ORDER - 1, None) is None
+
+
+@pytest.mark.django_db
+def test_allocate_order_uses_gap_between_neighbours(section):
+    TaskFactory(section=section, title="a", order=ORDER_GAP)
+    TaskFactory(section=section, title="b", order=2 * ORDER_GAP)
+    siblings = Task.objects.filter(section=section)
+
+    assert allocate_order(siblings, 2 * ORDER_GAP) == ORDER_GAP + ORDER_GAP // 2
+    assert allocate_order(siblings, ORDER_GAP) == ORDER_GAP // 2
+    assert allocate_order(siblings) == 3 * ORDER_GAP
+
+
+@pytest.mark.django_db
+def test_allocate_order_ignores_excluded_row(section):
+    a = TaskFactory(section=section, title="a", order=ORDER_GAP)
+    TaskFactory(section=section, title="b", order=2 * ORDER_GAP)
+
+    order = allocate_order(Task.objects.filter(section=section), exclude=a.pk)
+
+    assert order == 3 * ORDER_GAP
+
+
+@pytest.mark.django_db
+def test_allocate_order_without_gap_rebalances_now(section):
+    for order, title in enumerate("abc", start=1):
+        TaskFactory(section=section, title=title, order=order)
+
+    order = allocate_order(Task.objects.filter(section=section), 2)
+    TaskFactory(section=section, title="new", order=order)
+
+    assert ordered_titles(section) == ["a", "new", "b", "c"]
+    assert list(
+        Task.objects.filter(section=section).values_list("order", flat=True)
+    ) == [ORDER_GAP, ORDER_GAP + ORDER_GAP // 2, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+
+@pytest.mark.django_db
+def test_allocate_order_at_end_of_range_rebalances_now(section):
+    TaskFactory(section=section, title="a", order=MAX_ORDER - 10)
+    TaskFactory(section=section, title="b", order=MAX_ORDER)
+
+    order = allocate_order(Task.objects.filter(section=section))
+
+    assert order == 3 * ORDER_GAP
+    assert list(
+        Task.objects.filter(section=section).values_list("order", flat=True)
+    ) == [ORDER_GAP, 2 * ORDER_GAP]
+
+
+@pytest.mark.django_db
+def test_rebalance_keeps_ordering_and_skips_spaced_rows(section):
+    TaskFactory(section=section, title="a", order=ORDER_GAP)
+    TaskFactory(section=section, title="b", order=ORDER_GAP + 1)
+    TaskFactory(section=section, title="c", order=ORDER_GAP + 2)
+
+    assert rebalance(Task.objects.filter(section=section)) == 3 * ORDER_GAP
+
+    assert ordered_titles(section) == ["a", "b", "c"]
+    with CaptureQueriesContext(connection) as queries:
+        rebalance(Task.objects.filter(section=section))
+    assert not any(query["sql"].startswith("UPDATE") for query in queries)
@@ -0,0 +1,179 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from upoutodo.authentication import (
+    CachedJSONWebTokenAuthentication,
+    resolved_user_cache,
+)
+from upoutodo.tests.factories import UserFactory
+
+PAYLOAD = {"sub": "auth0|123"}
+
+
+@pytest.fixture(autouse=True)
+def clear_resolved_users():
+    resolved_user_cache.clear()
+    yield
+    resolved_user_cache.clear()
+
+
+@pytest.fixture
+def user():
+    return UserFactory(username="auth0.123")
+
+
+@pytest.fixture
+def jwt_client():
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer token")
+    with patch.object(
+        CachedJSONWebTokenAuthentication, "jwt_decode_token", return_value=PAYLOAD
+    ):
+        yield client
+
+
+def user_table_queries(context):
+    return [
+        query
+        for query in context.captured_queries
+        if 'FROM "auth_user"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_resolved_user_is_cached_between_requests(jwt_client, user):
+    response = jwt_client.get("/api/notifications/unread_count/")
+    assert response.status_code == status.HTTP_200_OK
+
+    with CaptureQueriesContext(connection) as context:
+        response = jwt_client.get("/api/notifications/unread_count/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert user_table_queries(context) == []
+    assert resolved_user_cache.stats()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_unknown_subject_is_provisioned(jwt_client):
+    response = jwt_client.get("/api/notifications/unread_count/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert resolved_user_cache.get("auth0|123").username == "auth0.123"
+
+
+@pytest.mark.django_db
+def test_deactivating_user_invalidates_cache(jwt_client, user):
+    jwt_client.get("/api/notifications/unread_count/")
+
+    user.is_active = False
+    user.save()
+
+    response = jwt_client.get("/api/notifications/unread_count/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_saving_profile_invalidates_cache(jwt_client, user):
+    jwt_client.get("/api/notifications/unread_count/")
+    assert len(resolved_user_cache) == 1
+
+    user.profile.is_admin = True
+    user.profile.save()
+
+    assert len(resolved_user_cache) == 0
+
+
+@pytest.mark.django_db
+def test_cached_user_is_copied_per_request(jwt_client, user):
+    authentication = CachedJSONWebTokenAuthentication()
+
+    first = authentication.authenticate_credentials(PAYLOAD)
+    second = authentication.authenticate_credentials(PAYLOAD)
+
+    assert first == second
+    assert first is not second
+
+
+@pytest.mark.django_db
+def test_changes_to_a_copied_user_stay_out_of_the_cache(jwt_client, user):
+    authentication = CachedJSONWebTokenAuthentication()
+
+    first = authentication.authenticate_credentials(PAYLOAD)
+    first.first_name = "Changed"
+    first.profile.theme = "dark"
+    second = authentication.authenticate_credentials(PAYLOAD)
+
+    assert second.first_name != "Changed"
+    assert second.profile.theme != "dark"
+    assert second.profile.user is second
+
+
+def table_queries(context, table):
+    return [
+        query for query in context.captured_queries if f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_user_me_query_count(jwt_client, user, django_assert_num_queries):
+    user.last_login = timezone.now()
+    user.save()
+    jwt_client.get("/api/users/me/")
+
+    # The payload is cached and last_login is recent enough.
+    with django_assert_num_queries(0):
+        response = jwt_client.get("/api/users/me/")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_first_request_loads_profile_with_user(jwt_client, user):
+    with CaptureQueriesContext(connection) as context:
+        response = jwt_client.get("/api/users/me/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(table_queries(context, "upoutodo_userprofile")) == 0
+
+
+@pytest.mark.django_db
+def test_dashboard_reuses_preloaded_profile(jwt_client, user):
+    user.profile.is_admin = True
+    user.profile.save()
+    jwt_client.get("/api/dashboard")
+
+    with CaptureQueriesContext(connection) as context:
+        response = jwt_client.get("/api/dashboard")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert table_queries(context, "upoutodo_userprofile") == []
+    assert table_queries(context, "upoutodo_project") == []
+    assert user_table_queries(context) == [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith('SELECT COUNT(*) AS "__count" FROM "auth_user"')
+    ]
+
+
+@pytest.mark.django_db
+def test_dashboard_denied_for_non_admin(jwt_client, user):
+    response = jwt_client.get("/api/dashboard")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_preloaded_profile(jwt_client, user):
+    authentication = CachedJSONWebTokenAuthentication()
+
+    loaded = authentication.authenticate_credentials(PAYLOAD)
+
+    with CaptureQueriesContext(connection) as context:
+        assert loaded.profile.user_id == user.pk
+    assert context.captured_queries == []
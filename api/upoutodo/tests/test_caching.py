@@ -0,0 +1,45 @@
+import time
+
+from upoutodo.caching import ExpiringLRUCache
+
+
+def test_get_returns_cached_value_and_counts_hits():
+    cache = ExpiringLRUCache(maxsize=2)
+    cache.set("a", 1, time.time() + 60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ExpiringLRUCache(maxsize=2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at)
+    cache.set("b", 2, expires_at)
+    cache.get("a")
+
+    cache.set("c", 3, expires_at)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_expired_entries_are_dropped():
+    cache = ExpiringLRUCache(maxsize=2)
+    cache.set("a", 1, time.time() + 0.05)
+    cache.set("b", 2, time.time() - 1)
+
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert len(cache) == 0
+
+
+def test_zero_maxsize_disables_cache():
+    cache = ExpiringLRUCache(maxsize=0)
+    cache.set("a", 1, time.time() + 60)
+
+    assert cache.get("a") is None
@@ -0,0 +1,225 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from upoutodo import jwks, utils
+from upoutodo.jwks import JWKSKeyStore, JWKSUnavailableError
+
+
+def make_jwk(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+class StubJWKSServer:
+    """Serves a mutable JWKS document on localhost and counts the fetches."""
+
+    def __init__(self, keys, delay=0):
+        self.keys = keys
+        self.delay = delay
+        self.available = True
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if not stub.available:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps({"keys": stub.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/.well-known/jwks.json"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def signing_key():
+    return make_jwk("key-1")
+
+
+@pytest.fixture
+def stub_server(signing_key):
+    _, jwk = signing_key
+    with StubJWKSServer([jwk]) as server:
+        yield server
+
+
+def test_keys_are_cached_until_ttl(stub_server):
+    store = JWKSKeyStore(stub_server.url, ttl=60)
+
+    for _ in range(5):
+        assert store.get_key("key-1") is not None
+
+    assert stub_server.requests == 1
+
+
+def test_expired_keys_are_refetched(stub_server):
+    store = JWKSKeyStore(stub_server.url, ttl=0, min_refresh_interval=0)
+
+    store.get_key("key-1")
+    store.get_key("key-1")
+
+    assert stub_server.requests == 2
+
+
+def test_unknown_kid_triggers_one_refresh(stub_server):
+    store = JWKSKeyStore(stub_server.url, ttl=60, min_refresh_interval=0)
+    store.get_key("key-1")
+
+    _, rotated_jwk = make_jwk("key-2")
+    stub_server.keys.append(rotated_jwk)
+
+    assert store.get_key("key-2") is not None
+    assert stub_server.requests == 2
+
+
+def test_unknown_kid_refresh_is_rate_limited(stub_server):
+    store = JWKSKeyStore(stub_server.url, ttl=60, min_refresh_interval=60)
+    store.get_key("key-1")
+
+    assert store.get_key("missing") is None
+    assert store.get_key("missing") is None
+    assert stub_server.requests == 1
+
+
+def test_concurrent_kid_misses_fetch_once(signing_key):
+    _, jwk = signing_key
+    with StubJWKSServer([jwk], delay=0.2) as server:
+        store = JWKSKeyStore(server.url, ttl=60)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(store.get_key("key-1")))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(results) == 10
+    assert all(key is not None for key in results)
+    assert server.requests == 1
+
+
+def test_stale_keys_are_served_while_provider_is_down(stub_server):
+    store = JWKSKeyStore(stub_server.url, ttl=0, min_refresh_interval=0)
+    assert store.get_key("key-1") is not None
+
+    stub_server.available = False
+
+    assert store.get_key("key-1") is not None
+    assert stub_server.requests == 2
+
+
+def test_provider_down_without_cached_keys_raises(stub_server):
+    stub_server.available = False
+    store = JWKSKeyStore(stub_server.url, ttl=60)
+
+    with pytest.raises(JWKSUnavailableError):
+        store.get_key("key-1")
+
+
+@pytest.fixture
+def auth0_settings(stub_server, settings, monkeypatch):
+    settings.JWKS_URL = stub_server.url
+    settings.JWKS_CACHE_TTL = 60
+    jwks.reset_key_store()
+    utils.verified_token_cache.clear()
+    monkeypatch.setitem(utils.JWT_AUTH, "JWT_AUDIENCE", "https://api.test")
+    monkeypatch.setitem(utils.JWT_AUTH, "JWT_ISSUER", "issuer.test")
+    yield
+    jwks.reset_key_store()
+    utils.verified_token_cache.clear()
+
+
+def make_token(private_key, expires_in=300, **claims):
+    payload = {
+        "sub": "auth0|123",
+        "aud": "https://api.test",
+        "iss": "https://issuer.test/",
+        "exp": int(time.time()) + expires_in,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "key-1"})
+
+
+def test_jwt_decode_token_uses_key_store(auth0_settings, stub_server, signing_key):
+    private_key, _ = signing_key
+
+    for i in range(3):
+        token = make_token(private_key, jti=str(i))
+        assert utils.jwt_decode_token(token)["sub"] == "auth0|123"
+
+    assert stub_server.requests == 1
+
+
+def test_verified_token_is_decoded_once(auth0_settings, signing_key):
+    private_key, _ = signing_key
+    token = make_token(private_key)
+
+    with patch("upoutodo.utils.jwt.decode", wraps=jwt.decode) as decode:
+        payloads = [utils.jwt_decode_token(token) for _ in range(5)]
+
+    assert decode.call_count == 1
+    assert all(payload["sub"] == "auth0|123" for payload in payloads)
+    assert utils.verified_token_cache.stats()["hits"] == 4
+    assert utils.verified_token_cache.stats()["misses"] == 1
+
+
+def test_cached_payload_is_not_shared(auth0_settings, signing_key):
+    private_key, _ = signing_key
+    token = make_token(private_key)
+
+    utils.jwt_decode_token(token)["sub"] = "tampered"
+
+    assert utils.jwt_decode_token(token)["sub"] == "auth0|123"
+
+
+def test_verified_token_is_evicted_at_expiry(auth0_settings, signing_key):
+    private_key, _ = signing_key
+    token = make_token(private_key, expires_in=1)
+    utils.jwt_decode_token(token)
+
+    time.sleep(1.1)
+
+    with pytest.raises(utils.JWTDecodeError):
+        utils.jwt_decode_token(token)
+    assert len(utils.verified_token_cache) == 0
+
+
+def test_invalid_token_is_not_cached(auth0_settings):
+    other_key, _ = make_jwk("key-1")
+    token = make_token(other_key)
+
+    for _ in range(2):
+        with pytest.raises(utils.JWTDecodeError):
+            utils.jwt_decode_token(token)
+    assert len(utils.verified_token_cache) == 0
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from dateutil.rrule import rrulestr
+
+from upoutodo.utils import _rrule_template, calculate_next_due_date, parse_rrule
+
+UTC = dt_timezone.utc
+
+
+@pytest.fixture(autouse=True)
+def empty_rrule_cache():
+    _rrule_template.cache_clear()
+    yield
+    _rrule_template.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "FREQ=WEEKLY",
+        "FREQ=MONTHLY",
+        "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+        "FREQ=DAILY;INTERVAL=3;COUNT=4",
+        "FREQ=WEEKLY;UNTIL=20300101T000000Z",
+    ],
+)
+def test_parse_rrule_matches_rrulestr_for_each_start(rule):
+    for days in (0, 1, 17, 45):
+        dtstart = datetime(2025, 1, 6, 9, 30, tzinfo=UTC) + timedelta(days=days)
+
+        expected = rrulestr(rule, dtstart=dtstart)
+        actual = parse_rrule(rule, dtstart)
+
+        assert list(actual.xafter(dtstart, count=5)) == list(
+            expected.xafter(dtstart, count=5)
+        )
+
+
+def test_parse_rrule_reuses_the_template_for_equivalent_rules():
+    dtstart = datetime(2025, 1, 6, tzinfo=UTC)
+
+    parse_rrule("FREQ=WEEKLY;BYDAY=MO", dtstart)
+    parse_rrule(" freq=weekly;byday=mo ", dtstart + timedelta(days=1))
+
+    info = _rrule_template.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_parse_rrule_keeps_naive_and_aware_starts_apart():
+    naive = datetime(2025, 1, 6, 9)
+
+    assert parse_rrule("FREQ=DAILY", naive).after(naive) == datetime(2025, 1, 7, 9)
+    assert parse_rrule("FREQ=DAILY", naive.replace(tzinfo=UTC)).after(
+        naive.replace(tzinfo=UTC)
+    ) == datetime(2025, 1, 7, 9, tzinfo=UTC)
+
+
+def test_calculate_next_due_date_rebinds_weekday_defaults():
+    monday = datetime(2025, 1, 6, 8, tzinfo=UTC)
+    wednesday = monday + timedelta(days=2)
+
+    assert calculate_next_due_date("FREQ=WEEKLY", monday) == monday + timedelta(7)
+    assert calculate_next_due_date("FREQ=WEEKLY", wednesday) == wednesday + timedelta(7)
@@ -1,19 +1,29 @@
 # upoutodo/utils.py
 
-import json
+import hashlib
 import logging
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from functools import lru_cache
 from typing import Optional
 
 import jwt
-import requests
+from dateutil.rrule import rrule as RRule
 from dateutil.rrule import rrulestr
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.utils import timezone
 
 from api.settings import JWT_AUTH
+from upoutodo.caching import ExpiringLRUCache
+from upoutodo.jwks import JWKSUnavailableError, get_key_store
 
 logger = logging.getLogger(__name__)
 
+# Decoded payloads of tokens that already passed signature verification,
+# keyed by the SHA-256 of the raw token and kept until the token's ``exp``.
+verified_token_cache = ExpiringLRUCache(maxsize=settings.JWT_TOKEN_CACHE_SIZE)
+
 
 def jwt_get_username_from_payload_handler(payload):
     username = payload.get("sub").replace("|", ".")
@@ -25,6 +35,9 @@ def jwt_decode_token(token):
     """
     Decode and validate a JWT token using Auth0 public keys or test signing key.
 
+    Tokens that were verified before are answered from ``verified_token_cache``
+    until they expire, skipping the signature check.
+
     Args:
         token: JWT token string to decode
 
@@ -35,32 +48,28 @@ def jwt_decode_token(token):
         JWTDecodeError: If token is invalid or cannot be decoded
         JWTPublicKeyError: If public key cannot be found or retrieved
     """
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    payload = verified_token_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
+
+    payload = _verify_token(token)
+    if isinstance(payload.get("exp"), (int, float)):
+        verified_token_cache.set(digest, dict(payload), payload["exp"])
+    return payload
+
+
+def _verify_token(token):
     try:
         jwt_audience = JWT_AUTH["JWT_AUDIENCE"]
         jwt_issuer = JWT_AUTH["JWT_ISSUER"]
 
         header = jwt.get_unverified_header(token)
 
-        # Fetch JWKS from Auth0
-        jwks_url = "https://dev-tbs5lvhtbsscsnn5.us.auth0.com/.well-known/jwks.json"
         try:
-            jwks_response = requests.get(jwks_url, timeout=10)
-            jwks_response.raise_for_status()
-            jwks = jwks_response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch JWKS from {jwks_url}: {e}")
-            raise JWTPublicKeyError(f"Cannot fetch public keys: {e}")
-
-        # Find matching public key
-        public_key = None
-        for jwk in jwks.get("keys", []):
-            if jwk.get("kid") == header.get("kid"):
-                try:
-                    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
-                    break
-                except Exception as e:
-                    logger.error(f"Failed to create public key from JWK: {e}")
-                    continue
+            public_key = get_key_store().get_key(header.get("kid"))
+        except JWKSUnavailableError as e:
+            raise JWTPublicKeyError(str(e))
 
         if public_key is None:
             logger.error(f"Public key not found for kid: {header.get('kid')}")
@@ -83,6 +92,56 @@ def jwt_decode_token(token):
         raise JWTDecodeError(f"Token decode failed: {e}")
 
 
+def day_start(day: date) -> datetime:
+    """Return midnight at the start of ``day`` in the current time zone."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def day_range(day: date) -> tuple[datetime, datetime]:
+    """
+    Return the half-open ``[start, end)`` datetimes covering ``day``.
+
+    Filtering with ``field__gte=start, field__lt=end`` matches what
+    ``field__date=day`` does, but compares the column directly so an index
+    on it can be used.
+    """
+    return day_start(day), day_start(day + timedelta(days=1))
+
+
+# Any fixed start will do: templates are rebound to the real one before use.
+_TEMPLATE_DTSTART = datetime(2000, 1, 1)
+
+
+@lru_cache(maxsize=settings.RRULE_CACHE_SIZE)
+def _rrule_template(normalized_rule: str, aware: bool):
+    """Parse a normalized RRULE once per start-time awareness.
+
+    UNTIL has to match DTSTART in being naive or UTC, so naive and aware
+    starts get templates of their own.
+    """
+    dtstart = _TEMPLATE_DTSTART.replace(tzinfo=dt_timezone.utc if aware else None)
+    return rrulestr(normalized_rule, dtstart=dtstart)
+
+
+def parse_rrule(rrule_str: str, dtstart: datetime):
+    """
+    Return ``rrulestr(rrule_str, dtstart=dtstart)``, reusing parsed rules.
+
+    Rules are parsed once per normalized string and kept in a bounded LRU
+    cache; ``rrule.replace()`` then rebinds the template to ``dtstart``,
+    which also re-derives the defaults ``rrulestr`` would take from it
+    (e.g. the weekday of a bare ``FREQ=WEEKLY``). Strings that parse to an
+    ``rruleset`` or carry their own DTSTART are parsed without the cache.
+    """
+    normalized = rrule_str.strip().upper()
+    if "DTSTART" in normalized:
+        return rrulestr(rrule_str, dtstart=dtstart)
+    template = _rrule_template(normalized, dtstart.tzinfo is not None)
+    if not isinstance(template, RRule):
+        return rrulestr(rrule_str, dtstart=dtstart)
+    return template.replace(dtstart=dtstart)
+
+
 def calculate_next_due_date(rrule_str: str, dtstart: datetime) -> Optional[datetime]:
     """
     Calculate the next due date based on an RRULE string and start datetime.
@@ -104,7 +163,7 @@ def calculate_next_due_date(rrule_str: str, dtstart: datetime) -> Optional[datet
 
     try:
         # Parse the RRULE string
-        rrule = rrulestr(rrule_str, dtstart=dtstart)
+        rrule = parse_rrule(rrule_str, dtstart)
 
         # Check if this is a one-time task (COUNT=1)
         if "COUNT=1" in rrule_str.upper():
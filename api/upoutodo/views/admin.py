@@ -11,6 +11,7 @@ from rest_framework.views import APIView
 
 from upoutodo.models import Task
 from upoutodo.permissions import IsAdmin
+from upoutodo.utils import day_range
 
 User = get_user_model()
 
@@ -117,14 +118,19 @@ class AdminDashboardView(APIView):
         return priority_data
 
     def weekly_trends(self):
-        today = timezone.now().date()
+        today = timezone.localdate()
         start_of_week = today - timedelta(days=today.weekday())
 
         trends = []
         for i in range(7):
             day = start_of_week + timedelta(days=i)
-            created_count = Task.objects.filter(created_at__date=day).count()
-            completed_count = Task.objects.filter(completion_date__date=day).count()
+            start, end = day_range(day)
+            created_count = Task.objects.filter(
+                created_at__gte=start, created_at__lt=end
+            ).count()
+            completed_count = Task.objects.filter(
+                completion_date__gte=start, completion_date__lt=end
+            ).count()
             trends.append(
                 {
                     "day": day.strftime("%a"),
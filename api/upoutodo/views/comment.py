@@ -25,7 +25,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         current_site = Site.objects.get_current()
         task_content_type = ContentType.objects.get_for_model(Task)
         owned_task_ids = (
-            Task.objects.filter(section__project__created_by=self.request.user)
+            Task.objects.filter(owner=self.request.user)
             .annotate(object_pk=Cast("pk", output_field=CharField()))
             .values("object_pk")
         )
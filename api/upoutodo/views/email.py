@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from upoutodo.email.send_email import send_email
 from upoutodo.models import Notification
 from upoutodo.models.task import Task
+from upoutodo.utils import day_range
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -35,9 +36,11 @@ def _request_has_daily_digest_access(request):
 
 def _create_due_notifications(user, today):
     """Create in-app notifications for tasks due today and overdue tasks."""
+    today_start, tomorrow_start = day_range(today)
     tasks_due_today = Task.objects.filter(
-        section__project__created_by=user,
-        due_date__date=today,
+        owner=user,
+        due_date__gte=today_start,
+        due_date__lt=tomorrow_start,
         completion_date__isnull=True,
     )
     for task in tasks_due_today:
@@ -45,7 +48,7 @@ def _create_due_notifications(user, today):
             user=user,
             type=Notification.Type.TASK_DUE,
             task=task,
-            created_at__date=today,
+            created_at__gte=today_start,
         ).exists()
         if not already_notified:
             Notification.objects.create(
@@ -56,8 +59,8 @@ def _create_due_notifications(user, today):
             )
 
     overdue_tasks = Task.objects.filter(
-        section__project__created_by=user,
-        due_date__date__lt=today,
+        owner=user,
+        due_date__lt=today_start,
         completion_date__isnull=True,
     )
     for task in overdue_tasks:
@@ -65,7 +68,7 @@ def _create_due_notifications(user, today):
             user=user,
             type=Notification.Type.TASK_OVERDUE,
             task=task,
-            created_at__date=today,
+            created_at__gte=today_start,
         ).exists()
         if not already_notified:
             Notification.objects.create(
@@ -97,7 +100,8 @@ def daily_digest(request):
         return Response(status=status.HTTP_403_FORBIDDEN)
 
     try:
-        today = timezone.now().date()
+        today = timezone.localdate()
+        today_start, tomorrow_start = day_range(today)
         active_users = User.objects.filter(is_active=True)
 
         for user in active_users:
@@ -113,14 +117,15 @@ def daily_digest(request):
 
             try:
                 tasks_today = Task.objects.filter(
-                    section__project__created_by=user,
-                    due_date__date=today,
+                    owner=user,
+                    due_date__gte=today_start,
+                    due_date__lt=tomorrow_start,
                     completion_date__isnull=True,
                 ).select_related("section__project")
 
                 overdue_tasks = Task.objects.filter(
-                    section__project__created_by=user,
-                    due_date__date__lt=today,
+                    owner=user,
+                    due_date__lt=today_start,
                     completion_date__isnull=True,
                 ).select_related("section__project")
 
@@ -0,0 +1,81 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class NotModified(Exception):
+    """Raised from ``initial`` to answer a read with 304 Not Modified."""
+
+
+class ConditionalGetMixin:
+    """Serve weak ETags on reads and answer a matching If-None-Match with 304.
+
+    The ETag is computed in ``initial``, after authentication and before the
+    handler runs, so a client holding the current payload costs one cheap
+    query and no serialization. ``get_etag_parts`` returns values that change
+    whenever the response would; by default the ``max(updated_at)`` and row
+    count of the filtered queryset, or of the requested object.
+    """
+
+    etag_actions = ("list", "retrieve")
+
+    def get_etag_aggregates(self):
+        return {"updated_at": Max("updated_at"), "count": Count("pk")}
+
+    def get_etag_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_etag_parts(self):
+        aggregates = (
+            self.get_etag_queryset().order_by().aggregate(**self.get_etag_aggregates())
+        )
+        return list(aggregates.values())
+
+    def get_etag(self, request):
+        parts = (request.user.pk, request.get_full_path(), *self.get_etag_parts())
+        return f'W/"{hashlib.md5(repr(parts).encode()).hexdigest()}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD") or self.action not in (
+            self.etag_actions
+        ):
+            return
+
+        self.etag = self.get_etag(request)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and etag_matches(self.etag, parse_etags(if_none_match)):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "etag", None) and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = self.etag
+            patch_vary_headers(response, ["Authorization"])
+        return response
+
+
+def etag_matches(etag, etags):
+    """Weak comparison, as If-None-Match requires."""
+    if "*" in etags:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in etags}
@@ -1,3 +1,4 @@
+from django.db.models import Count, Max
 from django.http import Http404
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework import permissions, status, viewsets
@@ -27,10 +28,13 @@ from upoutodo.services.planner_tools import (
     PlannerToolValidationError,
 )
 
+from .mixins import ConditionalGetMixin
 
-class PlannerViewSet(viewsets.ViewSet):
+
+class PlannerViewSet(ConditionalGetMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TodayPlanSerializer
+    etag_actions = ("today",)
 
     def get_permissions(self):
         permission_classes = [permissions.IsAuthenticated]
@@ -38,14 +42,28 @@ class PlannerViewSet(viewsets.ViewSet):
             permission_classes.append(IsAdmin)
         return [permission() for permission in permission_classes]
 
+    def get_etag_parts(self):
+        # Loaded here so a matching If-None-Match skips serialization; the
+        # handler reuses it.
+        self.today_plan = planner_tools.get_today_plan(self.request.user)
+        items = self.today_plan.items.order_by().aggregate(
+            updated_at=Max("updated_at"),
+            count=Count("pk"),
+            task_updated_at=Max("task__updated_at"),
+            section_updated_at=Max("task__section__updated_at"),
+            project_updated_at=Max("task__section__project__updated_at"),
+        )
+        return [self.today_plan.pk, self.today_plan.updated_at, *items.values()]
+
     def get_serializer_context(self):
         return {"request": self.request}
 
     @extend_schema(responses=TodayPlanSerializer)
     @action(detail=False, methods=["get"], url_path="today")
     def today(self, request):
-        plan = planner_tools.get_today_plan(request.user)
-        serializer = TodayPlanSerializer(plan, context=self.get_serializer_context())
+        serializer = TodayPlanSerializer(
+            self.today_plan, context=self.get_serializer_context()
+        )
         return Response(serializer.data)
 
     @extend_schema(
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.db.models import Avg, DurationField, ExpressionWrapper, F
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 from rest_framework import serializers
@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from upoutodo.models import Task
+from upoutodo.utils import day_range
 
 
 class ProductivitySummarySerializer(serializers.Serializer):
@@ -53,7 +54,7 @@ class UserProductivityView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_user_tasks(self, request):
-        return Task.objects.filter(section__project__created_by=request.user)
+        return Task.objects.filter(owner=request.user)
 
     @extend_schema(responses=UserProductivitySerializer)
     def get(self, request):
@@ -67,33 +68,40 @@ class UserProductivityView(APIView):
         )
 
     def summary(self, request):
-        qs = self.get_user_tasks(request)
+        """Headline counts for the user's tasks, computed in a single query."""
         now = timezone.now()
-        today = now.date()
-        total = qs.count()
-        completed = qs.filter(completion_date__isnull=False).count()
-        pending = qs.filter(completion_date__isnull=True).count()
-        overdue = qs.filter(due_date__lt=now, completion_date__isnull=True).count()
-        due_today = qs.filter(
-            due_date__date=today, completion_date__isnull=True
-        ).count()
-
+        today_start, tomorrow_start = day_range(timezone.localdate())
         seven_days_ago = now - timedelta(days=7)
-        completed_this_week = qs.filter(completion_date__gte=seven_days_ago).count()
-        created_this_week = qs.filter(created_at__gte=seven_days_ago).count()
-
-        completion_rate = round((completed / total) * 100, 1) if total > 0 else 0
-
-        avg_completion_time = (
-            qs.filter(completion_date__isnull=False)
-            .annotate(
-                duration=ExpressionWrapper(
+        is_completed = Q(completion_date__isnull=False)
+        is_pending = Q(completion_date__isnull=True)
+
+        stats = self.get_user_tasks(request).aggregate(
+            total=Count("pk"),
+            completed=Count("pk", filter=is_completed),
+            pending=Count("pk", filter=is_pending),
+            overdue=Count("pk", filter=is_pending & Q(due_date__lt=now)),
+            due_today=Count(
+                "pk",
+                filter=is_pending
+                & Q(due_date__gte=today_start, due_date__lt=tomorrow_start),
+            ),
+            completed_this_week=Count(
+                "pk", filter=Q(completion_date__gte=seven_days_ago)
+            ),
+            created_this_week=Count("pk", filter=Q(created_at__gte=seven_days_ago)),
+            avg_completion_time=Avg(
+                ExpressionWrapper(
                     F("completion_date") - F("created_at"),
                     output_field=DurationField(),
-                )
-            )
-            .aggregate(avg=Avg("duration"))["avg"]
+                ),
+                filter=is_completed,
+            ),
         )
+
+        total = stats["total"]
+        completed = stats["completed"]
+        completion_rate = round((completed / total) * 100, 1) if total > 0 else 0
+        avg_completion_time = stats.pop("avg_completion_time")
         avg_days = (
             round(avg_completion_time.total_seconds() / 86400, 1)
             if avg_completion_time
@@ -101,25 +109,22 @@ class UserProductivityView(APIView):
         )
 
         return {
-            "total": total,
-            "completed": completed,
-            "pending": pending,
-            "overdue": overdue,
-            "due_today": due_today,
-            "completed_this_week": completed_this_week,
-            "created_this_week": created_this_week,
+            **stats,
             "completion_rate": completion_rate,
             "avg_completion_days": avg_days,
         }
 
     def weekly_trends(self, request):
         qs = self.get_user_tasks(request)
-        today = timezone.now().date()
+        today = timezone.localdate()
         trends = []
         for i in range(27, -1, -1):
             day = today - timedelta(days=i)
-            created = qs.filter(created_at__date=day).count()
-            completed = qs.filter(completion_date__date=day).count()
+            start, end = day_range(day)
+            created = qs.filter(created_at__gte=start, created_at__lt=end).count()
+            completed = qs.filter(
+                completion_date__gte=start, completion_date__lt=end
+            ).count()
             trends.append(
                 {
                     "date": day.isoformat(),
@@ -154,11 +159,11 @@ class UserProductivityView(APIView):
     def completion_streak(self, request):
         """Count consecutive days (ending today) with at least one task completed."""
         qs = self.get_user_tasks(request).filter(completion_date__isnull=False)
-        today = timezone.now().date()
+        today = timezone.localdate()
         streak = 0
         for i in range(365):
-            day = today - timedelta(days=i)
-            if qs.filter(completion_date__date=day).exists():
+            start, end = day_range(today - timedelta(days=i))
+            if qs.filter(completion_date__gte=start, completion_date__lt=end).exists():
                 streak += 1
             else:
                 break
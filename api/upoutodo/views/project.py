@@ -1,13 +1,25 @@
+from functools import cached_property
+
 from django.db import models, transaction
+from django.db.models import Prefetch
 from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from upoutodo.models import Project
-from upoutodo.serializers import ProjectDetailSerializer, ProjectSerializer
+from upoutodo.models import Project, ProjectSection, Task
+from upoutodo.serializers import (
+    ProjectDetailSerializer,
+    ProjectSerializer,
+    TaskSerializer,
+)
+from upoutodo.serializers.task import parse_sparse_fields
+from upoutodo.services.ordering import allocate_order, reorder, touched_fields
+from upoutodo.services.users import invalidate_me_payload
+
+from .mixins import ConditionalGetMixin
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -17,9 +29,49 @@ class ProjectViewSet(viewsets.ModelViewSet):
         queryset = self.queryset.filter(created_by=user)
         pk = self.kwargs.get("pk")
         if pk:
+            if self.action == "retrieve":
+                queryset = queryset.prefetch_related(
+                    Prefetch("sections", queryset=ProjectSection.objects.all()),
+                    Prefetch(
+                        "sections__tasks",
+                        queryset=Task.objects.with_list_data(self.task_sparse_fields),
+                    ),
+                )
             return queryset
         return queryset.filter(is_default=False)
 
+    @cached_property
+    def task_sparse_fields(self):
+        """Task fields picked with ``?task_fields=``/``?task_omit=``."""
+        return parse_sparse_fields(
+            self.request.query_params,
+            TaskSerializer.sparse_field_names(),
+            fields_param="task_fields",
+            omit_param="task_omit",
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "retrieve":
+            # Shared by the nested tasks of every section.
+            context["task_context"] = {
+                "request": self.request,
+                "sparse_fields": self.task_sparse_fields,
+            }
+        return context
+
+    def get_etag_aggregates(self):
+        aggregates = super().get_etag_aggregates()
+        if self.action == "retrieve":
+            # The detail payload nests every section and task of the project.
+            aggregates.update(
+                sections_updated_at=models.Max("sections__updated_at"),
+                section_count=models.Count("sections", distinct=True),
+                tasks_updated_at=models.Max("sections__tasks__updated_at"),
+                task_count=models.Count("sections__tasks"),
+            )
+        return aggregates
+
     def get_serializer_class(self):
         if self.action == "list":
             return super().get_serializer_class()
@@ -32,16 +84,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         # Fetch the corresponding objects from the database
         projects = self.get_queryset().filter(id__in=ids)
 
-        # Create a mapping of id -> order from the request data
+        # Create a mapping of id -> position after a drag and drop
         id_to_order_map = {item["id"]: item["order"] for item in request.data}
 
-        # Update the order field for each section
-        for project in projects:
-            project.order = id_to_order_map.get(project.id)
-
-        # Use bulk_update for efficient database updates
+        # Let the projects trade their order values to match
         with transaction.atomic():
-            Project.objects.bulk_update(projects, ["order"])
+            changed = reorder(list(projects.select_for_update()), id_to_order_map)
+            Project.objects.bulk_update(changed, ["order", *touched_fields(Project)])
+        # bulk_update() sends no signals; project order is part of /users/me/.
+        invalidate_me_payload(request.user.pk)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -67,44 +118,30 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return
 
         # Otherwise add to the end
-        max_order = (
-            Project.objects.filter(
-                is_default=False, created_by=self.request.user
-            ).aggregate(max_order=models.Max("order"))["max_order"]
-            or 0
-        )
         serializer.save(
             created_by=self.request.user,
             updated_by=self.request.user,
-            order=max_order + 1,
+            order=allocate_order(
+                Project.objects.filter(is_default=False, created_by=self.request.user)
+            ),
         )
 
     def _create_project_above(self, serializer, above_project_id):
         above_project = Project.objects.get(id=above_project_id)
-        order = above_project.order
-        with transaction.atomic():
-            # Shift existing items down
-            Project.objects.filter(
-                order__gte=order, created_by=self.request.user
-            ).update(order=models.F("order") + 1)
-            serializer.save(
-                created_by=self.request.user,
-                updated_by=self.request.user,
-                order=order,
-            )
+        self._create_project_at(serializer, above_project.order)
 
     def _create_project_below(self, serializer, below_project_id):
         below_project = Project.objects.get(id=below_project_id)
-        order = below_project.order
+        self._create_project_at(serializer, below_project.order + 1)
+
+    def _create_project_at(self, serializer, order):
         with transaction.atomic():
-            # Shift existing items down
-            Project.objects.filter(
-                order__gt=order, created_by=self.request.user
-            ).update(order=models.F("order") + 1)
             serializer.save(
                 created_by=self.request.user,
                 updated_by=self.request.user,
-                order=order + 1,
+                order=allocate_order(
+                    Project.objects.filter(created_by=self.request.user), order
+                ),
             )
 
     def perform_update(self, serializer):
@@ -119,9 +156,4 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         if instance.is_default:
             raise serializers.ValidationError("The default project cannot be deleted.")
-        order = instance.order
-        with transaction.atomic():
-            instance.delete()
-            Project.objects.filter(
-                order__gt=order, created_by=self.request.user
-            ).update(order=models.F("order") - 1)
+        instance.delete()
@@ -1,10 +1,12 @@
-from django.db import models, transaction
+from django.db import transaction
 from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from upoutodo.models import ProjectSection
 from upoutodo.serializers import ProjectSectionSerializer
+from upoutodo.services.ordering import allocate_order, reorder, touched_fields
+from upoutodo.services.users import invalidate_me_payload
 
 
 class ProjectSectionViewSet(viewsets.ModelViewSet):
@@ -22,12 +24,16 @@ class ProjectSectionViewSet(viewsets.ModelViewSet):
 
         sections = self.get_queryset().filter(id__in=ids)
 
+        # Each order is the section's position after a drag and drop.
         id_to_order_map = {item["id"]: item["order"] for item in request.data}
 
-        for section in sections:
-            section.order = id_to_order_map.get(section.id)
-
-        ProjectSection.objects.bulk_update(sections, ["order"])
+        with transaction.atomic():
+            changed = reorder(list(sections.select_for_update()), id_to_order_map)
+            ProjectSection.objects.bulk_update(
+                changed, ["order", *touched_fields(ProjectSection)]
+            )
+        # bulk_update() sends no signals; section order is part of /users/me/.
+        invalidate_me_payload(request.user.pk)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -50,47 +56,29 @@ class ProjectSectionViewSet(viewsets.ModelViewSet):
             # see ProjectSectionSerializer.validate
             requested_order = serializer.validated_data["order"]
             project = serializer.validated_data["project"]
-
-            # Shift existing items down
-            ProjectSection.objects.filter(
-                order__gte=requested_order, project=project
-            ).update(order=models.F("order") + 1)
-            serializer.save(order=requested_order)
+            serializer.save(
+                order=allocate_order(
+                    ProjectSection.objects.filter(project=project), requested_order
+                )
+            )
 
     def perform_update(self, serializer):
         instance = serializer.instance
         if instance.is_default:
             raise serializers.ValidationError("Cannot update default section.")
-        super().perform_update(serializer)
-
-        source_project = serializer.validated_data.get("source_project")
-        destination_project = serializer.validated_data.get("project")
-
-        if destination_project != source_project:
-            source_project_sections = ProjectSection.objects.filter(
-                is_default=False, project=source_project
-            ).order_by("order")
-            for order, section in enumerate(source_project_sections, start=1):
-                section.order = order
-            ProjectSection.objects.bulk_update(source_project_sections, ["order"])
-            max_order = (
-                destination_project.sections.aggregate(max_order=models.Max("order"))[
-                    "max_order"
-                ]
-                # The default section is always 0 but just in case
-                or 0
-            )
-            serializer.save(
-                order=max_order + 1,
-            )
+
+        destination_project = serializer.validated_data.get("project", instance.project)
+        siblings = ProjectSection.objects.filter(project=destination_project)
+        order = serializer.validated_data.get("order", instance.order)
+
+        with transaction.atomic():
+            if destination_project != instance.project:
+                order = allocate_order(siblings, exclude=instance.pk)
+            elif order != instance.order:
+                order = allocate_order(siblings, order, exclude=instance.pk)
+            serializer.save(order=order)
 
     def perform_destroy(self, instance):
         if instance.is_default:
             raise serializers.ValidationError("Default section cannot be deleted.")
-        order = instance.order
-        project = instance.project
-        with transaction.atomic():
-            instance.delete()
-            ProjectSection.objects.filter(order__gt=order, project=project).update(
-                order=models.F("order") - 1
-            )
+        instance.delete()
@@ -1,81 +1,218 @@
+from dataclasses import asdict
+from datetime import timedelta
+from functools import cached_property
+from itertools import chain
+
 from django.db import models, transaction
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiTypes,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
 from upoutodo.filters import TaskFilter
-from upoutodo.models import Task
-from upoutodo.serializers import TaskSerializer
+from upoutodo.models import Occurrence, ProjectSection, Task, TaskTombstone
+from upoutodo.pagination import TaskKeysetPagination
+from upoutodo.renderers import CSVRenderer, NDJSONRenderer
+from upoutodo.serializers import TaskChangesSerializer, TaskSerializer
+from upoutodo.serializers.task import parse_sparse_fields
+from upoutodo.services.export import EXPORT_FIELDS, iter_task_export_rows
+from upoutodo.services.imports import ImportProgress, detect_format, import_tasks
+from upoutodo.services.occurrences import (
+    DEFAULT_OCCURRENCE_LIMIT,
+    MAX_OCCURRENCE_LIMIT,
+    MAX_WINDOW_DAYS,
+    OCCURRENCE_FIELDS,
+    is_materialized,
+    iter_materialized_occurrence_rows,
+    iter_occurrence_rows,
+    truncated_task_ids,
+)
+from upoutodo.services.ordering import allocate_order, order_at_position
+from upoutodo.services.sync import (
+    ExpiredSyncCursor,
+    InvalidSyncCursor,
+    get_task_changes,
+)
+from upoutodo.services.tasks import (
+    bulk_create_tasks,
+    bulk_update_tasks,
+    complete_tasks,
+)
+from upoutodo.utils import day_start
+
+from .mixins import ConditionalGetMixin
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        required=False,
+        description="Comma-separated task fields to return; id is always included.",
+    ),
+    OpenApiParameter(
+        name="omit",
+        type=OpenApiTypes.STR,
+        required=False,
+        description="Comma-separated task fields to leave out.",
+    ),
+]
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+    retrieve=extend_schema(parameters=SPARSE_FIELDS_PARAMETERS),
+)
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_class = TaskFilter
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    ordering = ["order", "-due_date", "completion_date"]
+    default_ordering = ["order", "-due_date", "completion_date"]
+
+    @property
+    def ordering(self):
+        """Best matches first when searching; ``?ordering=`` still wins."""
+        if self.request.query_params.get("search"):
+            return ["-search_rank", *self.default_ordering]
+        return self.default_ordering
+
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client asks for ``?pagination=cursor``."""
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = TaskKeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def get_etag_aggregates(self):
+        aggregates = super().get_etag_aggregates()
+        # Task payloads also carry their section's project and titles.
+        if self.sparse_fields is None or not self.sparse_fields.isdisjoint(
+            ("project", "section_title", "project_title")
+        ):
+            aggregates.update(
+                section_updated_at=models.Max("section__updated_at"),
+                project_updated_at=models.Max("section__project__updated_at"),
+            )
+        return aggregates
+
+    @cached_property
+    def sparse_fields(self):
+        """Fields picked with ``?fields=``/``?omit=`` on reads; ``None`` for all."""
+        if self.action not in ("list", "retrieve"):
+            return None
+        return parse_sparse_fields(
+            self.request.query_params, TaskSerializer.sparse_field_names()
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fields"] = self.sparse_fields
+        return context
 
     def get_queryset(self):
         user = self.request.user
-        return super().get_queryset().filter(section__project__created_by=user)
+        queryset = super().get_queryset().filter(owner=user)
+        if self.action in ("list", "retrieve", "changes"):
+            queryset = queryset.with_list_data(self.sparse_fields)
+        return queryset
 
     def perform_update(self, serializer):
-        new_order = serializer.validated_data.get("order", serializer.instance.order)
-        current_order = serializer.instance.order
-        destination_section = serializer.validated_data.get(
-            "section", serializer.instance.section
+        instance = serializer.instance
+        new_order = serializer.validated_data.get("order", instance.order)
+        destination_section = serializer.validated_data.get("section", instance.section)
+        # A drag and drop sends ``order`` as the position the task was dropped
+        # at, not an order value like above_task/below_task give.
+        is_dropped = "order" in self.request.data and not serializer.context.get(
+            "relative_to_task"
         )
-        source_section = serializer.context.get(
-            "source_section", serializer.instance.section
+        is_sorting = (
+            destination_section != instance.section
+            or is_dropped
+            or new_order != instance.order
         )
-        is_sorting = destination_section != source_section or new_order != current_order
+
+        siblings = Task.objects.filter(section=destination_section)
 
         with transaction.atomic():
-            serializer.save()
             if is_sorting:
-                destination_section = (
-                    source_section
-                    if source_section == destination_section
-                    else destination_section
-                )
-                Task.objects.filter(
-                    section=source_section, order__gt=current_order
-                ).exclude(id=serializer.instance.id).update(order=models.F("order") - 1)
-                Task.objects.filter(
-                    section=destination_section,
-                    order__gte=new_order,
-                ).exclude(id=serializer.instance.id).update(order=models.F("order") + 1)
-
-    def perform_destroy(self, instance):
-        section = instance.section
-        order = instance.order
-
-        Task.objects.filter(section=section, order__gt=order).update(
-            order=models.F("order") - 1
-        )
-
-        instance.delete()
+                if is_dropped:
+                    new_order = order_at_position(
+                        siblings, new_order, exclude=instance.pk
+                    )
+                new_order = allocate_order(siblings, new_order, exclude=instance.pk)
+            serializer.save(order=new_order)
 
     def perform_create(self, serializer):
         relative_to_task = serializer.context.get("relative_to_task")
         section = serializer.validated_data.get("section")
-        order = serializer.validated_data.get("order")
-        if relative_to_task:
-            Task.objects.filter(section=section, order__gte=order).update(
-                order=models.F("order") + 1
+        with transaction.atomic():
+            if relative_to_task:
+                order = allocate_order(
+                    Task.objects.filter(section=section),
+                    serializer.validated_data.get("order"),
+                )
+            else:
+                order = allocate_order(
+                    Task.objects.filter(section__project=section.project)
+                )
+            serializer.save(order=order)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            TaskTombstone.objects.create(task_id=instance.pk, owner=self.request.user)
+            instance.delete()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Cursor returned by the previous call.",
             )
-            serializer.save()
-        else:
-            max_order = Task.objects.filter(section__project=section.project).aggregate(
-                models.Max("order")
-            )["order__max"]
-            serializer.save(
-                order=max_order + 1 if max_order else 1,
+        ],
+        responses=TaskChangesSerializer,
+    )
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Tasks changed and task ids deleted since the ``since`` cursor."""
+        try:
+            changes = get_task_changes(
+                request.user,
+                self.get_queryset(),
+                since=request.query_params.get("since"),
+            )
+        except InvalidSyncCursor as exc:
+            raise ValidationError({"since": "Invalid cursor."}) from exc
+        except ExpiredSyncCursor:
+            return Response(
+                {"error": "Cursor has expired. Fetch all tasks again."},
+                status=status.HTTP_410_GONE,
             )
 
+        return Response(
+            {
+                "tasks": self.get_serializer(changes.tasks, many=True).data,
+                "deleted": changes.deleted_ids,
+                "cursor": changes.cursor,
+                "has_more": changes.has_more,
+            }
+        )
+
     @action(detail=True, methods=["post"], url_path="duplicate")
     def duplicate(self, request, pk=None):
         task = self.get_object()
@@ -88,6 +225,248 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return Response(status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="format",
+                type=OpenApiTypes.STR,
+                enum=["ndjson", "csv"],
+                required=False,
+                description="Export format; defaults to ndjson. "
+                "An Accept header works too.",
+            )
+        ],
+        responses={
+            (200, NDJSONRenderer.media_type): OpenApiTypes.STR,
+            (200, CSVRenderer.media_type): OpenApiTypes.STR,
+        },
+    )
+    @action(
+        detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request):
+        """Stream the user's tasks, filtered like the list, as NDJSON or CSV."""
+        renderer = request.accepted_renderer
+        rows = iter_task_export_rows(self.filter_queryset(self.get_queryset()))
+        response = StreamingHttpResponse(
+            renderer.stream(rows, EXPORT_FIELDS),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{renderer.format}"'
+        )
+        return response
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="start_date",
+                type=OpenApiTypes.DATE,
+                required=True,
+                description="First day of the window.",
+            ),
+            OpenApiParameter(
+                name="end_date",
+                type=OpenApiTypes.DATE,
+                required=True,
+                description=f"Last day of the window, at most {MAX_WINDOW_DAYS} "
+                "days after start_date.",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Most occurrences returned per task; defaults to "
+                f"{DEFAULT_OCCURRENCE_LIMIT}, at most {MAX_OCCURRENCE_LIMIT}.",
+            ),
+        ],
+        responses={(200, NDJSONRenderer.media_type): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer])
+    def occurrences(self, request):
+        """Stream every due date of the open recurring tasks in a date window.
+
+        The window and the other list filters mean what they do for the task
+        list, except that a task due before ``start_date`` still contributes
+        the occurrences that fall inside the window. Windows within the
+        materialized horizon are read from ``Occurrence``; others are
+        expanded from the rules.
+        """
+        filterset = TaskFilter(
+            request.query_params, queryset=Task.objects.none(), request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        start_date = filterset.form.cleaned_data.get("start_date")
+        end_date = filterset.form.cleaned_data.get("end_date")
+        errors = {}
+        for name, value in (("start_date", start_date), ("end_date", end_date)):
+            if value is None:
+                errors[name] = "This parameter is required."
+        if not errors and not 0 <= (end_date - start_date).days < MAX_WINDOW_DAYS:
+            errors["end_date"] = (
+                f"Must be on or after start_date and within {MAX_WINDOW_DAYS} days."
+            )
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_OCCURRENCE_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_OCCURRENCE_LIMIT:
+            errors["limit"] = f"Must be between 1 and {MAX_OCCURRENCE_LIMIT}."
+        if errors:
+            raise ValidationError(errors)
+
+        # Keep end_date, which drops tasks due after the window, but not
+        # start_date: earlier tasks can still recur into it.
+        params = request.query_params.copy()
+        params.pop("start_date")
+        queryset = TaskFilter(
+            params,
+            queryset=self.get_queryset().filter(completion_date__isnull=True),
+            request=request,
+        ).qs
+
+        start = day_start(start_date)
+        end = day_start(end_date + timedelta(days=1))
+        if is_materialized(start, end, limit):
+            # Tasks whose stored dates run out early are expanded instead.
+            truncated = truncated_task_ids(request.user, end)
+            occurrences = Occurrence.objects.filter(
+                owner=request.user, due_date__gte=start, due_date__lt=end
+            ).exclude(task_id__in=truncated)
+            if not params.keys() <= {"end_date", "limit"}:
+                occurrences = occurrences.filter(task__in=queryset)
+            rows = chain(
+                iter_materialized_occurrence_rows(occurrences, limit),
+                iter_occurrence_rows(
+                    queryset.filter(pk__in=truncated), start, end, limit
+                ),
+            )
+        else:
+            rows = iter_occurrence_rows(queryset, start, end, limit)
+
+        renderer = request.accepted_renderer
+        return StreamingHttpResponse(
+            renderer.stream(rows, OCCURRENCE_FIELDS),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+
+    @extend_schema(
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "file": {"type": "string", "format": "binary"},
+                    "section": {"type": "integer"},
+                },
+                "required": ["file"],
+            }
+        },
+        responses={(200, NDJSONRenderer.media_type): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[MultiPartParser],
+        renderer_classes=[NDJSONRenderer],
+    )
+    def import_tasks(self, request):
+        """Import a CSV, NDJSON or ICS file, streaming progress as NDJSON.
+
+        Each line reports the running totals and the errors of one batch and
+        is sent as soon as that batch is inserted. Rows without a section go
+        to ``section`` or the Inbox.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "No file was submitted."})
+        import_format = detect_format(upload.name, upload.content_type or "")
+        if import_format is None:
+            raise ValidationError({"file": "Expected a .csv, .ndjson or .ics file."})
+
+        section = None
+        if request.data.get("section"):
+            field = self.get_serializer().fields["section"]
+            try:
+                section = field.run_validation(request.data["section"])
+            except ValidationError as e:
+                raise ValidationError({"section": e.detail}) from e
+
+        progress = import_tasks(request.user, upload, import_format, section=section)
+        renderer = request.accepted_renderer
+        return StreamingHttpResponse(
+            renderer.stream(
+                map(asdict, progress),
+                list(ImportProgress.__annotations__),
+                rows_per_chunk=1,
+            ),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk_create")
+    def bulk_create(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {"error": "Expected a list of task objects."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if any(
+            isinstance(task_data, dict)
+            and (task_data.get("above_task") or task_data.get("below_task"))
+            for task_data in request.data
+        ):
+            return Response(
+                {"error": "'above_task' and 'below_task' are not supported here."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = self.get_serializer_context()
+        context["preloaded_sections"] = ProjectSection.objects.filter(
+            project__created_by=request.user
+        ).in_bulk()
+        context["preloaded_tasks"] = {}
+        serializer = self.get_serializer(data=request.data, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            tasks = bulk_create_tasks(request.user, serializer.validated_data)
+
+        return Response(
+            {"ids": [task.id for task in tasks]}, status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk_complete")
+    def bulk_complete(self, request):
+        """Complete many tasks at once; recurring ones get their next occurrence."""
+        task_ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(task_ids, list) or not all(
+            isinstance(task_id, int) for task_id in task_ids
+        ):
+            return Response(
+                {"error": "Expected 'ids', a list of task ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        tasks_by_id = self.get_queryset().in_bulk(task_ids)
+        missing_task_ids = [
+            task_id for task_id in task_ids if task_id not in tasks_by_id
+        ]
+        if missing_task_ids:
+            return Response(
+                {"error": f"Task with id {missing_task_ids[0]} does not exist."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            successors = complete_tasks(request.user, tasks_by_id.values())
+
+        return Response(
+            {"created": [task.id for task in successors]}, status=status.HTTP_200_OK
+        )
+
     @action(detail=False, methods=["put", "patch"], url_path="bulk_update")
     def bulk_update(self, request):
         if not isinstance(request.data, list):
@@ -109,24 +488,51 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializers = []
-
-        for task_data in request.data:
-            task_id = task_data.get("id")
-            if not task_id:
-                return Response(
-                    {"error": "'id' field is required."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        if any(not task_data.get("id") for task_data in request.data):
+            return Response(
+                {"error": "'id' field is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            task = tasks_by_id[task_id]
-            serializer = self.get_serializer(task, data=task_data, partial=partial)
-            serializer.is_valid(raise_exception=True)
+        # Validate every payload against one preloaded map of the user's
+        # sections and tasks instead of a query per related field.
+        relative_task_ids = {
+            task_data[key]
+            for task_data in request.data
+            for key in ("above_task", "below_task")
+            if task_data.get(key)
+        } - tasks_by_id.keys()
+        preloaded_tasks = dict(tasks_by_id)
+        preloaded_tasks.update(
+            Task.objects.filter(owner=request.user).in_bulk(relative_task_ids)
+        )
+        context = self.get_serializer_context()
+        context["preloaded_sections"] = ProjectSection.objects.filter(
+            project__created_by=request.user
+        ).in_bulk()
+        context["preloaded_tasks"] = preloaded_tasks
 
-            serializers.append(serializer)
+        serializer = self.get_serializer(
+            list(tasks_by_id.values()),
+            data=request.data,
+            many=True,
+            partial=partial,
+            context=context,
+        )
+        if not serializer.is_valid():
+            # Report the first invalid item the way single-task updates do.
+            errors = serializer.errors
+            if isinstance(errors, dict):
+                errors = errors.values()
+            raise ValidationError(next(error for error in errors if error))
+        changes = [
+            (tasks_by_id[task_data["id"]], validated_data)
+            for task_data, validated_data in zip(
+                request.data, serializer.validated_data
+            )
+        ]
 
         with transaction.atomic():
-            for serializer in serializers:
-                serializer.save()
+            bulk_update_tasks(request.user, changes)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -8,6 +8,7 @@ from rest_framework.exceptions import MethodNotAllowed
 from rest_framework.response import Response
 
 from upoutodo.serializers import UserSerializer
+from upoutodo.services.users import get_me_payload
 
 User = get_user_model()
 
@@ -38,7 +39,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     @action(methods=["GET"], detail=False)
     def me(self, request):
-        serializer = UserSerializer(request.user)
+        payload = get_me_payload(request.user)
         if request.user.is_authenticated:
             now = timezone.now()
             last_seen = request.user.last_login
@@ -47,4 +48,4 @@ class UserViewSet(viewsets.ModelViewSet):
             ):
                 request.user.last_login = now
                 request.user.save(update_fields=["last_login"])
-        return Response(serializer.data)
+        return Response(payload)